@@ -267,22 +267,37 @@ def bulk_create_allowed_emails(request, payload: list[AllowedEmailCreateSchema])
     if len(payload) > 200:
         return 400, {"detail": "Máximo 200 entradas por importación."}
 
-    created = []
+    from django.db.models import Q
+
+    # One lookup for every entry already listed; duplicates inside the payload
+    # are skipped as they are seen
+    existing = AllowedEmail.objects.filter(
+        Q(email__in=[i.email for i in payload if i.email])
+        | Q(domain__in=[i.domain for i in payload if i.domain])
+    ).values_list("email", "domain")
+    taken_emails, taken_domains = set(), set()
+    for email, domain in existing:
+        taken_emails.add(email)
+        taken_domains.add(domain)
+
+    entries = []
     for item in payload:
         if not item.email and not item.domain:
             continue
-        if item.email and AllowedEmail.objects.filter(email=item.email).exists():
+        if item.email and item.email in taken_emails:
             continue
-        if item.domain and AllowedEmail.objects.filter(domain=item.domain).exists():
+        if item.domain and item.domain in taken_domains:
             continue
-        entry = AllowedEmail.objects.create(
+        taken_emails.add(item.email)
+        taken_domains.add(item.domain)
+        entries.append(AllowedEmail(
             email=item.email or None,
             domain=item.domain or None,
             role=item.role,
             name=item.name or None,
             invited_by=request.auth,
-        )
-        created.append(entry)
+        ))
+    created = AllowedEmail.objects.bulk_create(entries)
 
     logger.info("Bulk import by %s: %d entries created", request.auth.email, len(created))
     return 200, created
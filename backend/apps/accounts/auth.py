@@ -72,6 +72,18 @@ class JWTAuth(HttpBearer):
     """
 
     def authenticate(self, request, token: str) -> User | None:
+        user_id = self._user_id(token)
+        if user_id is None:
+            return None
+        try:
+            return User.objects.get(id=user_id, is_active=True)
+        except User.DoesNotExist:
+            logger.warning("JWT token references non-existent user")
+            return None
+
+    @staticmethod
+    def _user_id(token: str) -> UUID | None:
+        """The user id of a valid access token, or None."""
         try:
             payload = decode_token(token)
 
@@ -79,9 +91,7 @@ class JWTAuth(HttpBearer):
                 logger.warning("Non-access token used for authentication")
                 return None
 
-            user_id = UUID(payload["sub"])
-            user = User.objects.get(id=user_id, is_active=True)
-            return user
+            return UUID(payload["sub"])
 
         except jwt.ExpiredSignatureError:
             logger.debug("Expired JWT token")
@@ -89,16 +99,28 @@ class JWTAuth(HttpBearer):
         except jwt.InvalidTokenError as e:
             logger.warning("Invalid JWT token: %s", e)
             return None
-        except User.DoesNotExist:
-            logger.warning("JWT token references non-existent user")
-            return None
         except (KeyError, ValueError) as e:
             logger.warning("Malformed JWT payload: %s", e)
             return None
 
 
-# Singleton instance for use in API decorators
+class AsyncJWTAuth(JWTAuth):
+    """``JWTAuth`` for async views: the user is loaded with the async ORM."""
+
+    async def authenticate(self, request, token: str) -> User | None:
+        user_id = self._user_id(token)
+        if user_id is None:
+            return None
+        try:
+            return await User.objects.aget(id=user_id, is_active=True)
+        except User.DoesNotExist:
+            logger.warning("JWT token references non-existent user")
+            return None
+
+
+# Singleton instances for use in API decorators
 jwt_auth = JWTAuth()
+async_jwt_auth = AsyncJWTAuth()
 
 
 def verify_google_token(token: str) -> dict | None:
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Must match UserDirectoryService.SEARCH_EXPR so the planner can use the index
+SEARCH_EXPR = "lower(first_name || ' ' || last_name || ' ' || email)"
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    pg_trgm ships with the standard Postgres images and is a trusted extension,
+    so the database owner can enable it. Where it is unavailable the index is
+    skipped and the user picker falls back to a plain ILIKE scan.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS users_search_trgm_idx "
+            f"ON users USING gin (({SEARCH_EXPR}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS users_search_trgm_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_allowedemail_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
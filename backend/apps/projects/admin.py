@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Board, Column, Task, Workspace
+from .models import Board, Column, InboundEmail, Task, Workspace
 
 
 # ─────────────────────────────────────────────────
@@ -65,3 +65,11 @@ class TaskAdmin(SoftDeleteAuditAdmin):
     list_display = ("title", "column", "priority", "assignee", "progress", "order", "is_deleted")
     list_filter = ["priority", "column__board"]
     search_fields = ("title",)
+
+
+@admin.register(InboundEmail)
+class InboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("idempotency_key", "status", "detail", "created_at", "processed_at")
+    list_filter = ["status"]
+    search_fields = ("idempotency_key",)
+    readonly_fields = ("comment", "created_at", "updated_at", "processed_at")
@@ -3,14 +3,19 @@ API Endpoints — thin controllers that delegate to Service Layer.
 All endpoints require JWT authentication.
 """
 
+from datetime import date
 from uuid import UUID
 
-from ninja import File, Form, Router
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import quote_etag
+from django.utils.http import parse_etags
+from ninja import File, Form, Query, Router
 from ninja.files import UploadedFile
 from ninja.pagination import PageNumberPagination, paginate
 
-from apps.accounts.auth import jwt_auth
+from apps.accounts.auth import async_jwt_auth, jwt_auth
 
+from . import storage
 from .schemas import (
     BoardCreateSchema,
     BoardDetailSchema,
@@ -19,14 +24,22 @@ from .schemas import (
     ColumnCreateSchema,
     ColumnSchema,
     ColumnUpdateSchema,
+    CriticalPathSchema,
+    MyTasksPageSchema,
     NotificationCountSchema,
     NotificationSchema,
+    SearchPageSchema,
+    TaskBlockerSchema,
     TaskCommentCreateSchema,
     TaskCommentSchema,
     TaskCreateSchema,
     TaskMoveSchema,
+    TaskPageSchema,
+    TaskQuerySchema,
     TaskSchema,
+    TaskUpdateResultSchema,
     TaskUpdateSchema,
+    TimelineSchema,
     WorkspaceCreateSchema,
     WorkspaceSchema,
     WorkspaceUpdateSchema,
@@ -38,20 +51,41 @@ from .services import (
     ColumnService,
     CommentService,
     NotificationService,
+    SearchService,
+    TaskQueryService,
     TaskService,
+    TimelineService,
+    UserDirectoryService,
     WorkspaceService,
 )
+from .storage import AttachmentLinkAuth
 
 router = Router(auth=jwt_auth)
 
 
+class AsyncPageNumberPagination(PageNumberPagination):
+    """Ninja's page-number pagination with the page fetched through the async ORM."""
+
+    async def apaginate_queryset(self, queryset, pagination, **params):
+        offset = (pagination.page - 1) * self.page_size
+        return {
+            "items": [item async for item in queryset[offset : offset + self.page_size]],
+            "count": await self._aitems_count(queryset),
+        }
+
+
 # ─────────────────────────────────────────────────
 # Workspaces
 # ─────────────────────────────────────────────────
-@router.get("/workspaces", response=list[WorkspaceWithBoardsSchema], tags=["workspaces"])
-@paginate(PageNumberPagination, page_size=20)
-def list_workspaces(request):
-    return WorkspaceService.list_for_user(request.auth)
+@router.get(
+    "/workspaces",
+    response=list[WorkspaceWithBoardsSchema],
+    auth=async_jwt_auth,
+    tags=["workspaces"],
+)
+@paginate(AsyncPageNumberPagination, page_size=20)
+async def list_workspaces(request):
+    return await WorkspaceService.alist_for_user(request.auth)
 
 
 @router.post("/workspaces", response={201: WorkspaceSchema}, tags=["workspaces"])
@@ -79,19 +113,50 @@ def delete_workspace(request, workspace_id: UUID):
 
 
 @router.get("/workspaces/{workspace_id}/members", response=list[UserMinimalSchema], tags=["workspaces"])
-def list_workspace_members(request, workspace_id: UUID):
+def list_workspace_members(
+    request,
+    workspace_id: UUID,
+    q: str | None = Query(None, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+):
     ws = WorkspaceService.get_or_404(workspace_id, request.auth)
+    if q:
+        return UserDirectoryService.search(ws.members.all(), q, limit=limit)
     return ws.members.all()
 
 
+@router.get("/workspaces/{workspace_id}/timeline", response=TimelineSchema, tags=["workspaces"])
+def get_workspace_timeline(
+    request,
+    workspace_id: UUID,
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+):
+    return TimelineService.for_workspace(workspace_id, request.auth, start=start, end=end)
+
+
 # ─────────────────────────────────────────────────
 # Users (global list for task assignment)
 # ─────────────────────────────────────────────────
 @router.get("/users", response=list[UserMinimalSchema], tags=["users"])
-def list_all_users(request):
-    """Returns all active users available for task assignment."""
-    from apps.accounts.models import User as UserModel
-    return UserModel.objects.filter(is_active=True, email__endswith="@stwards.com").order_by("first_name", "last_name")
+def list_all_users(
+    request,
+    response: HttpResponse,
+    q: str | None = Query(None, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """Active users available for task assignment; ``?q=`` for picker search."""
+    if q:
+        return UserDirectoryService.search(UserDirectoryService.directory(), q, limit=limit)
+
+    # The full directory is revalidated by ETag instead of re-downloaded
+    etag = quote_etag(UserDirectoryService.directory_etag())
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        not_modified = HttpResponseNotModified()
+        not_modified["ETag"] = etag
+        return not_modified
+    response["ETag"] = etag
+    return UserDirectoryService.directory().order_by("first_name", "last_name")
 
 
 # ─────────────────────────────────────────────────
@@ -114,9 +179,42 @@ def create_board(request, payload: BoardCreateSchema):
     return 201, board
 
 
-@router.get("/boards/{board_id}", response=BoardDetailSchema, tags=["boards"])
-def get_board(request, board_id: UUID):
-    return BoardService.get_detail(board_id, request.auth)
+@router.get(
+    "/boards/{board_id}", response=BoardDetailSchema, auth=async_jwt_auth, tags=["boards"]
+)
+async def get_board(request, board_id: UUID):
+    return await BoardService.aget_detail(board_id, request.auth)
+
+
+@router.get("/boards/{board_id}/critical-path", response=CriticalPathSchema, tags=["boards"])
+def get_board_critical_path(request, board_id: UUID):
+    return BoardService.critical_path(board_id, request.auth)
+
+
+@router.get("/boards/{board_id}/timeline", response=TimelineSchema, tags=["boards"])
+def get_board_timeline(
+    request,
+    board_id: UUID,
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+):
+    """Gantt window: only tasks overlapping ``from``–``to``, with minimal fields."""
+    return TimelineService.for_board(board_id, request.auth, start=start, end=end)
+
+
+@router.get("/boards/{board_id}/tasks", response=TaskPageSchema, tags=["boards"])
+def query_board_tasks(request, board_id: UUID, params: TaskQuerySchema = Query(...)):
+    """Table view: filtered, grouped and sorted tasks, one keyset page at a time."""
+    filters = params.dict(exclude={"sort", "group_by", "cursor", "limit"})
+    return TaskQueryService.for_board(
+        board_id,
+        request.auth,
+        sort=params.sort,
+        group_by=params.group_by,
+        cursor=params.cursor,
+        limit=params.limit,
+        **filters,
+    )
 
 
 @router.put("/boards/{board_id}", response=BoardSchema, tags=["boards"])
@@ -130,7 +228,7 @@ def update_board(request, board_id: UUID, payload: BoardUpdateSchema):
 def delete_board(request, board_id: UUID):
     from apps.accounts.models import User as UserModel
     from ninja.errors import HttpError
-    if request.auth.role == UserModel.UserRole.STAFF:
+    if request.auth.role == UserModel.UserRole.DEVELOPER:
         raise HttpError(403, "Los desarrolladores no pueden eliminar tableros.")
     board = BoardService.get_or_404(board_id, request.auth)
     BoardService.delete(board, user=request.auth)
@@ -181,7 +279,7 @@ def create_task(request, payload: TaskCreateSchema):
     return 201, task
 
 
-@router.put("/tasks/{task_id}", response=TaskSchema, tags=["tasks"])
+@router.put("/tasks/{task_id}", response=TaskUpdateResultSchema, tags=["tasks"])
 def update_task(request, task_id: UUID, payload: TaskUpdateSchema):
     task = TaskService.get_or_404(task_id, request.auth)
     fields = payload.dict(exclude_unset=True)
@@ -192,13 +290,19 @@ def update_task(request, task_id: UUID, payload: TaskUpdateSchema):
 def delete_task(request, task_id: UUID):
     from apps.accounts.models import User as UserModel
     from ninja.errors import HttpError
-    if request.auth.role == UserModel.UserRole.STAFF:
+    if request.auth.role == UserModel.UserRole.DEVELOPER:
         raise HttpError(403, "Los desarrolladores no pueden eliminar tareas.")
     task = TaskService.get_or_404(task_id, request.auth)
     TaskService.delete(task, user=request.auth)
     return 204, None
 
 
+@router.get("/tasks/{task_id}/blockers", response=list[TaskBlockerSchema], tags=["tasks"])
+def list_task_blockers(request, task_id: UUID):
+    task = TaskService.get_or_404(task_id, request.auth)
+    return TaskService.blockers(task)
+
+
 @router.post("/tasks/{task_id}/move", response=TaskSchema, tags=["tasks"])
 def move_task(request, task_id: UUID, payload: TaskMoveSchema):
     task = TaskService.get_or_404(task_id, request.auth)
@@ -210,6 +314,20 @@ def move_task(request, task_id: UUID, payload: TaskMoveSchema):
     )
 
 
+@router.get("/me/tasks", response=MyTasksPageSchema, tags=["tasks"])
+def my_tasks(
+    request,
+    due: str | None = Query(None, pattern=r"^(overdue|today|week)$"),
+    include_completed: bool = False,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """The caller's tasks across all workspaces, soonest due first."""
+    return TaskQueryService.for_user(
+        request.auth, due=due, include_completed=include_completed, cursor=cursor, limit=limit
+    )
+
+
 # ─────────────────────────────────────────────────
 # Comments
 # ─────────────────────────────────────────────────
@@ -254,17 +372,63 @@ def create_comment_with_file(
     return 201, CommentService.create_with_file(request.auth, task, content, file=file)
 
 
+@router.get(
+    "/comments/{comment_id}/attachment",
+    auth=[jwt_auth, AttachmentLinkAuth()],
+    tags=["comments"],
+)
+def download_comment_attachment(request, comment_id: UUID):
+    """Authenticated download; the bytes are served by nginx via X-Accel-Redirect."""
+    from ninja.errors import HttpError
+
+    if isinstance(request.auth, str):  # signed link — scoped to a single comment
+        if request.auth != str(comment_id):
+            raise HttpError(403, "Enlace de descarga no válido.")
+        comment = CommentService.get_attachment_or_404(comment_id)
+    else:
+        comment = CommentService.get_attachment_or_404(comment_id, request.auth)
+    return storage.download_response(
+        comment.attachment.sha256,
+        comment.attachment_filename or comment.attachment.sha256,
+        comment.attachment.content_type,
+    )
+
+
+# ─────────────────────────────────────────────────
+# Search
+# ─────────────────────────────────────────────────
+@router.get("/search", response=SearchPageSchema, tags=["search"])
+def search(
+    request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = None,
+):
+    """Full-text search over tasks and comments the user can see."""
+    return SearchService.search(request.auth, q, limit=limit, cursor=cursor)
+
+
 # ─────────────────────────────────────────────────
 # Notifications
 # ─────────────────────────────────────────────────
-@router.get("/notifications", response=list[NotificationSchema], tags=["notifications"])
-def list_notifications(request):
-    return NotificationService.list_for_user(request.auth)
+@router.get(
+    "/notifications",
+    response=list[NotificationSchema],
+    auth=async_jwt_auth,
+    tags=["notifications"],
+)
+async def list_notifications(request):
+    return await NotificationService.alist_for_user(request.auth)
 
 
-@router.get("/notifications/count", response=NotificationCountSchema, tags=["notifications"])
-def notification_count(request):
-    return {"unread": NotificationService.unread_count(request.auth)}
+@router.get(
+    "/notifications/count",
+    response=NotificationCountSchema,
+    auth=async_jwt_auth,
+    tags=["notifications"],
+)
+async def notification_count(request):
+    return {"unread": await NotificationService.aunread_count(request.auth)}
 
 
 @router.post(
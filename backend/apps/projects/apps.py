@@ -7,4 +7,12 @@ class ProjectsConfig(AppConfig):
     verbose_name = "Proyectos"
 
     def ready(self):
+        from django.db.backends.signals import connection_created
+
         import apps.projects.signals
+        from config import instrumentation, slowqueries
+
+        # Per-request query counts, and the slow-query log on every connection
+        # (web and Celery alike)
+        connection_created.connect(instrumentation.install, dispatch_uid="request_metrics")
+        connection_created.connect(slowqueries.install, dispatch_uid="slow_query_log")
@@ -0,0 +1,164 @@
+"""
+Versioned-key cache layer over the shared (Redis) Django cache.
+
+Cached values hang off a *scope* — a board, a workspace or a user. Each scope
+has a version token stored under its own key; every value key embeds the
+current token, so invalidating everything cached for a scope is one write
+(``bump``) and stale entries simply age out. Misses are recomputed by a single
+caller at a time (a short ``add``-based lock); the rest wait briefly for the
+value instead of stampeding the database.
+
+The cache is an optimisation, never a dependency: if the backend fails, the
+error is logged and the value computed from the database. Without a shared
+cache (``SHARED_CACHE`` off — no ``REDIS_CACHE_URL``, each process has its own
+memory cache) a bump would only reach the process that made it, so values are
+not cached at all.
+
+Hit/miss counters are kept per process, per value name, and mirrored to the
+``cache_lookups_total`` Prometheus metric.
+"""
+
+import logging
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("board", "workspace", "user")
+
+DEFAULT_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 30  # seconds a recompute may hold the lock before it expires
+LOCK_WAIT = 2.0  # seconds a waiter polls for the value before computing itself
+LOCK_POLL = 0.05
+
+_MISSING = object()
+_stats: Counter = Counter()
+
+
+# ─────────────────────────────────────────────────
+# Versions
+# ─────────────────────────────────────────────────
+def _version_key(scope: str, obj_id) -> str:
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown cache scope: {scope}")
+    return f"v:{scope}:{obj_id}"
+
+
+def version(scope: str, obj_id) -> str:
+    """Current version token of a scope; created on first use, never expires."""
+    key = _version_key(scope, obj_id)
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        token = cache.get(key)
+    return token
+
+
+def bump(scope: str, obj_id) -> None:
+    """Invalidate everything cached under a scope."""
+    key = _version_key(scope, obj_id)
+    if not _enabled():
+        return
+    try:
+        cache.set(key, uuid.uuid4().hex, None)
+    except Exception as exc:
+        logger.error("Cache unavailable, could not bump %s: %s", key, exc)
+
+
+def make_key(scope: str, obj_id, name: str, *parts) -> str:
+    """Versioned key for one value: ``{scope}:{id}:{name}[:parts]:{version}``."""
+    suffix = "".join(f":{p}" for p in parts)
+    return f"{scope}:{obj_id}:{name}{suffix}:{version(scope, obj_id)}"
+
+
+# ─────────────────────────────────────────────────
+# Read-through with stampede protection
+# ─────────────────────────────────────────────────
+def get_or_compute(
+    scope: str,
+    obj_id,
+    name: str,
+    compute: Callable[[], Any],
+    *parts,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> Any:
+    """
+    Return the cached value for ``name`` under a scope, computing and storing
+    it on a miss. Only one caller recomputes a given key at a time; others wait
+    up to ``LOCK_WAIT`` for it and then fall back to computing themselves.
+    ``None`` is a valid cached value. If the cache fails, the value is computed.
+    """
+    if not _enabled():
+        return compute()
+    try:
+        key = make_key(scope, obj_id, name, *parts)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            _count(name, "hit")
+            return value
+        _count(name, "miss")
+
+        lock = f"{key}:lock"
+        owner = cache.add(lock, 1, LOCK_TIMEOUT)
+        if not owner:
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    _count(name, "wait")
+                    return value
+            logger.warning(
+                "Cache lock on %s not released in %.1fs; computing anyway", key, LOCK_WAIT
+            )
+    except Exception as exc:
+        logger.error("Cache unavailable, computing %s without it: %s", name, exc)
+        return compute()
+
+    try:
+        value = compute()
+        _quietly(cache.set, key, value, timeout)
+    finally:
+        if owner:
+            _quietly(cache.delete, lock)
+    return value
+
+
+def _enabled() -> bool:
+    return getattr(settings, "SHARED_CACHE", True)
+
+
+def _quietly(operation, *args) -> None:
+    """Run a cache write whose failure only costs a later recompute."""
+    try:
+        operation(*args)
+    except Exception as exc:
+        logger.error("Cache unavailable, %s skipped: %s", operation.__name__, exc)
+
+
+# ─────────────────────────────────────────────────
+# Counters
+# ─────────────────────────────────────────────────
+def _count(name: str, outcome: str) -> None:
+    _stats[name, outcome] += 1
+    CACHE_LOOKUPS.labels(name, outcome).inc()
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """Per-name hit/miss/wait counts for this process."""
+    result: dict[str, dict[str, int]] = {}
+    for (name, outcome), count in _stats.items():
+        result.setdefault(name, {"hit": 0, "miss": 0, "wait": 0})[outcome] = count
+    return result
+
+
+def reset_stats() -> None:
+    _stats.clear()
@@ -0,0 +1,92 @@
+"""
+Outbound email fan-out — render once per event, send to N recipients.
+
+Every notification event (task moved, new comment, new assignment) renders its
+subject, plain body and HTML exactly once. The rendered strings are shared by
+all per-recipient messages, which are then sent over a single SMTP connection.
+Attachments are never embedded — emails link to the stored file instead.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+# Templates compiled into the cached loader when a worker process boots
+EMAIL_TEMPLATES = (
+    "projects/email/assignment_notification.html",
+    "projects/email/task_moved.html",
+)
+
+# Placeholder substituted per recipient in otherwise identical HTML bodies
+RECIPIENT_NAME_PLACEHOLDER = "__RECIPIENT_NAME__"
+
+
+def warm_template_cache() -> None:
+    """Load and compile every email template so the first send pays no I/O."""
+    for name in EMAIL_TEMPLATES:
+        get_template(name)
+    logger.debug("Email template cache warmed: %d templates", len(EMAIL_TEMPLATES))
+
+
+def render(template_name: str, context: dict) -> str:
+    """Render an email template through the (warm) cached loader."""
+    return get_template(template_name).render(context)
+
+
+def reply_to_for(task_id) -> list[str]:
+    """Build the Cloudmailin plus-addressed Reply-To for a task, if configured."""
+    inbound_addr = getattr(settings, "INBOUND_EMAIL_ADDRESS", "")
+    if not inbound_addr or "@" not in inbound_addr:
+        return []
+    local, domain = inbound_addr.split("@", 1)
+    return [f"{local}+task-{task_id}@{domain}"]
+
+
+def fan_out(
+    recipients,
+    *,
+    subject: str,
+    body: str,
+    html_body: str | None = None,
+    reply_to: list[str] | None = None,
+    personalize: dict[str, str] | None = None,
+) -> int:
+    """
+    Send one pre-rendered email to every recipient over a single connection.
+
+    ``personalize`` maps recipient → display name; it replaces
+    ``RECIPIENT_NAME_PLACEHOLDER`` in the bodies so the template is still rendered once.
+    Returns the number of messages handed to the backend.
+    """
+    recipients = sorted(set(recipients))
+    if not recipients:
+        return 0
+
+    messages = []
+    for recipient in recipients:
+        text, html = body, html_body
+        if personalize is not None:
+            name = personalize.get(recipient, recipient)
+            text = text.replace(RECIPIENT_NAME_PLACEHOLDER, name)
+            if html is not None:
+                html = html.replace(RECIPIENT_NAME_PLACEHOLDER, escape(name))
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=text,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[recipient],
+            reply_to=reply_to or [],
+        )
+        if html is not None:
+            msg.attach_alternative(html, "text/html")
+        messages.append(msg)
+
+    connection = get_connection(fail_silently=True)
+    sent = connection.send_messages(messages) or 0
+    logger.debug("Email fan-out: %d/%d messages sent (%s)", sent, len(messages), subject)
+    return sent
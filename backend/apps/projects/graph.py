@@ -0,0 +1,326 @@
+"""
+Dependency graph engine — cycle detection and critical path (CPM).
+
+Edges come from the self-referential ``Task.dependencies`` M2M: a row
+(from_task → to_task) means *from_task depends on to_task*, i.e. to_task is a
+predecessor. A board's (or workspace's) graph is loaded with one query for
+nodes and one for edges; the schedule is computed in pure Python in O(V + E)
+and cached per board version (see ``caching``).
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import timedelta
+from uuid import UUID
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connection
+from django.utils import timezone
+
+from . import caching
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+class CycleError(ValueError):
+    """The dependency graph contains (or would contain) a cycle."""
+
+    def __init__(self, task_ids):
+        self.task_ids = list(task_ids)
+        super().__init__(f"Dependency cycle through {len(self.task_ids)} task(s)")
+
+
+@dataclass
+class Graph:
+    durations: dict[UUID, int]  # task id → duration in days (>= 1)
+    edges: list[tuple[UUID, UUID]]  # (predecessor, successor)
+
+
+@dataclass
+class NodeSchedule:
+    task_id: UUID
+    duration: int
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+
+    @property
+    def slack(self) -> int:
+        return self.latest_start - self.earliest_start
+
+    @property
+    def critical(self) -> bool:
+        return self.slack == 0
+
+
+@dataclass
+class Schedule:
+    project_duration: int
+    nodes: list[NodeSchedule]  # topological order
+    critical_path: list[UUID] = field(default_factory=list)
+
+
+# ─────────────────────────────────────────────────
+# Loading
+# ─────────────────────────────────────────────────
+def task_duration(start_date, end_date) -> int:
+    """Duration in whole days, inclusive; tasks without both dates count as 1 day."""
+    if start_date and end_date and end_date >= start_date:
+        return (end_date - start_date).days + 1
+    return 1
+
+
+def load_graph(*, board_id: UUID | None = None, workspace_id: UUID | None = None) -> Graph:
+    """Live tasks of a board or workspace and the dependency edges between them."""
+    tasks = Task.objects.all()
+    if board_id is not None:
+        tasks = tasks.filter(column__board_id=board_id)
+    elif workspace_id is not None:
+        tasks = tasks.filter(column__board__workspace_id=workspace_id)
+    else:
+        raise ValueError("board_id or workspace_id is required")
+
+    # One round trip: each task with the ids of its predecessors
+    rows = (
+        tasks.order_by()
+        .annotate(predecessors=ArrayAgg("dependencies__id"))
+        .values_list("id", "start_date", "end_date", "predecessors")
+    )
+    durations = {}
+    predecessors = {}
+    for task_id, start, end, pred_ids in rows:
+        durations[task_id] = task_duration(start, end)
+        predecessors[task_id] = pred_ids
+    edges = [
+        (pred, succ)
+        for succ, pred_ids in predecessors.items()
+        for pred in pred_ids
+        if pred in durations  # None without dependencies; else deleted or out of scope
+    ]
+    return Graph(durations=durations, edges=edges)
+
+
+# ─────────────────────────────────────────────────
+# Algorithms
+# ─────────────────────────────────────────────────
+def _kahn(n: int, successors: list[list[int]], indegree: list[int]) -> list[int]:
+    """Kahn's algorithm over dense integer ids; consumes ``indegree``."""
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ in successors[node]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+    return order
+
+
+def _index(nodes, edges) -> tuple[list[UUID], list[list[int]], list[list[int]]]:
+    """Map task ids to dense ints (UUID hashing dominates otherwise)."""
+    ids = list(nodes)
+    position = {task_id: i for i, task_id in enumerate(ids)}
+    successors: list[list[int]] = [[] for _ in ids]
+    predecessors: list[list[int]] = [[] for _ in ids]
+    for pred, succ in edges:
+        p, s = position[pred], position[succ]
+        successors[p].append(s)
+        predecessors[s].append(p)
+    return ids, successors, predecessors
+
+
+def topological_order(nodes, edges) -> list[UUID]:
+    """Kahn's algorithm; raises CycleError listing the tasks left on a cycle."""
+    ids, successors, predecessors = _index(nodes, edges)
+    indegree = [len(p) for p in predecessors]
+    order = _kahn(len(ids), successors, indegree)
+    if len(order) != len(ids):
+        raise CycleError(ids[i] for i, d in enumerate(indegree) if d > 0)
+    return [ids[i] for i in order]
+
+
+def compute_schedule(graph: Graph) -> Schedule:
+    """Forward/backward pass: earliest/latest start, slack and critical path."""
+    ids, successors, predecessors = _index(graph.durations, graph.edges)
+    indegree = [len(p) for p in predecessors]
+    order = _kahn(len(ids), successors, indegree)
+    if len(order) != len(ids):
+        raise CycleError(ids[i] for i, d in enumerate(indegree) if d > 0)
+
+    dur = list(graph.durations.values())
+    es = [0] * len(ids)
+    for node in order:
+        for p in predecessors[node]:
+            finish = es[p] + dur[p]
+            if finish > es[node]:
+                es[node] = finish
+    project_duration = max((es[i] + dur[i] for i in order), default=0)
+
+    lf = [project_duration] * len(ids)
+    for node in reversed(order):
+        for s in successors[node]:
+            start = lf[s] - dur[s]
+            if start < lf[node]:
+                lf[node] = start
+
+    nodes = [
+        NodeSchedule(
+            task_id=ids[i],
+            duration=dur[i],
+            earliest_start=es[i],
+            earliest_finish=es[i] + dur[i],
+            latest_start=lf[i] - dur[i],
+            latest_finish=lf[i],
+        )
+        for i in order
+    ]
+
+    # Walk one zero-slack chain from a critical start to the project end
+    def critical(i):
+        return lf[i] - dur[i] == es[i]
+
+    path = []
+    current = next((i for i in order if es[i] == 0 and critical(i)), None)
+    while current is not None:
+        path.append(ids[current])
+        finish = es[current] + dur[current]
+        current = next(
+            (s for s in successors[current] if es[s] == finish and critical(s)),
+            None,
+        )
+
+    return Schedule(project_duration=project_duration, nodes=nodes, critical_path=path)
+
+
+# ─────────────────────────────────────────────────
+# Write-time cycle check
+# ─────────────────────────────────────────────────
+# All tasks upstream of the given dependencies (following "depends on" edges)
+_UPSTREAM_SQL = """
+    WITH RECURSIVE upstream(id) AS (
+        SELECT unnest(%(start)s::uuid[])
+        UNION
+        SELECT d.to_task_id
+        FROM tasks_dependencies d
+        JOIN upstream u ON d.from_task_id = u.id
+    )
+    SELECT 1 FROM upstream WHERE id = %(task_id)s LIMIT 1
+"""
+
+
+def assert_acyclic(task_id: UUID, dependency_ids) -> None:
+    """
+    Raise CycleError if making ``task_id`` depend on ``dependency_ids`` would
+    close a cycle — i.e. the task is already upstream of one of them.
+    Single recursive query, independent of graph size.
+    """
+    dependency_ids = [UUID(str(d)) for d in dependency_ids]
+    if not dependency_ids:
+        return
+    if task_id in dependency_ids:
+        raise CycleError([task_id])
+    with connection.cursor() as cursor:
+        cursor.execute(_UPSTREAM_SQL, {"start": dependency_ids, "task_id": task_id})
+        if cursor.fetchone():
+            raise CycleError([task_id, *dependency_ids])
+
+
+# ─────────────────────────────────────────────────
+# Auto-scheduling (finish-to-start propagation)
+# ─────────────────────────────────────────────────
+# Every task downstream of a task (following "is depended on by" edges);
+# UNION deduplicates, so the walk terminates even on a corrupt cyclic graph.
+_DOWNSTREAM_SQL = """
+    WITH RECURSIVE downstream(id) AS (
+        SELECT d.from_task_id
+        FROM tasks_dependencies d
+        WHERE d.to_task_id = %(task_id)s
+        UNION
+        SELECT d.from_task_id
+        FROM tasks_dependencies d
+        JOIN downstream ds ON d.to_task_id = ds.id
+    )
+    SELECT id FROM downstream
+"""
+
+
+def reschedule_dependents(task: Task) -> list[Task]:
+    """
+    Shift the dates of tasks downstream of ``task`` so that each one starts no
+    earlier than the day after every predecessor ends (finish-to-start),
+    keeping its duration. Only tasks reachable through ``dependent_tasks`` are
+    visited, and only those whose predecessors actually moved are recomputed.
+
+    Runs a constant number of queries (subgraph, tasks, edges, one
+    ``bulk_update``) and returns the tasks whose dates changed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_DOWNSTREAM_SQL, {"task_id": task.id})
+        downstream_ids = [row[0] for row in cursor.fetchall() if row[0] != task.id]
+    if not downstream_ids:
+        return []
+
+    tasks = {t.id: t for t in Task.objects.filter(id__in=downstream_ids).select_related("column")}
+    end_dates = {task.id: task.end_date}
+    predecessors: dict[UUID, list[UUID]] = {tid: [] for tid in tasks}
+    edges = []
+    for succ, pred, pred_end in (
+        Task.dependencies.through.objects.filter(from_task_id__in=tasks, to_task__is_deleted=False)
+        .order_by()
+        .values_list("from_task_id", "to_task_id", "to_task__end_date")
+    ):
+        predecessors[succ].append(pred)
+        end_dates.setdefault(pred, pred_end)
+        if pred in tasks:
+            edges.append((pred, succ))
+    end_dates.update((tid, t.end_date) for tid, t in tasks.items())
+
+    try:
+        order = topological_order(tasks, edges)
+    except CycleError:
+        logger.warning("Skipping auto-schedule for task %s: dependency cycle", task.id)
+        return []
+
+    moved = {task.id}
+    changed = []
+    for tid in order:
+        preds = predecessors[tid]
+        current = tasks[tid]
+        if current.start_date is None or not moved.intersection(preds):
+            continue
+        finishes = [end_dates[p] for p in preds if end_dates[p] is not None]
+        if not finishes:
+            continue
+        delta = (max(finishes) + timedelta(days=1) - current.start_date).days
+        if delta <= 0:
+            continue
+        current.start_date += timedelta(days=delta)
+        if current.end_date is not None:
+            current.end_date += timedelta(days=delta)
+        end_dates[tid] = current.end_date
+        moved.add(tid)
+        changed.append(current)
+
+    if changed:
+        now = timezone.now()
+        for t in changed:
+            t.updated_at = now
+        Task.objects.bulk_update(changed, ["start_date", "end_date", "updated_at"])
+        for board_id in {t.column.board_id for t in changed}:
+            caching.bump("board", board_id)
+        logger.info("Auto-schedule from task %s shifted %d task(s)", task.id, len(changed))
+    return changed
+
+
+# ─────────────────────────────────────────────────
+# Cached board schedule
+# ─────────────────────────────────────────────────
+def board_schedule(board_id: UUID) -> Schedule:
+    """Critical-path schedule for a board, cached until the board version is bumped."""
+    return caching.get_or_compute(
+        "board", board_id, "schedule", lambda: compute_schedule(load_graph(board_id=board_id))
+    )
@@ -0,0 +1,173 @@
+"""
+Benchmark a new worker's cold start: time from process spawn to its first response.
+
+Each run spawns a fresh interpreter that imports ``config.wsgi``, optionally
+runs the boot-time warmup (config/warmup.py), and serves ``--path`` twice
+through the WSGI app — the first request is the cold one, the second shows the
+steady state. Two modes, ``--runs`` times each:
+
+- ``cold``: no warmup, the first request pays for everything left lazy.
+- ``warm``: ``warm_up()`` first, as gunicorn.conf.py does before the worker
+  accepts connections.
+
+``ready_ms`` is spawn until the process could accept (after the warmup in
+``warm`` mode); ``first_response_ms`` is what the first client waits once it
+does. ``--imports N`` adds an ``-X importtime`` profile of ``import config.wsgi``
+with the N slowest modules by cumulative time.
+
+    python manage.py bench_cold_start --runs 5 --imports 15 --output cold-start.json
+"""
+
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+BASE_DIR = Path(__file__).resolve().parents[4]
+MODES = ("cold", "warm")
+METRICS = ("import_ms", "warmup_ms", "ready_ms", "first_response_ms", "second_response_ms")
+
+# Runs in the child interpreter: argv[1] is the mode, argv[2] the path
+_CHILD = """
+import io, json, os, sys, time
+
+spawned = float(os.environ["COLD_START_SPAWNED"])
+started = time.perf_counter()
+import config.wsgi
+imported = time.perf_counter()
+if sys.argv[1] == "warm":
+    from config.warmup import warm_up
+    warm_up()
+ready = time.perf_counter()
+ready_at = time.time()
+
+def request():
+    status = []
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[2], "QUERY_STRING": "",
+        "SERVER_NAME": os.environ["COLD_START_HOST"], "SERVER_PORT": "80",
+        "HTTP_HOST": os.environ["COLD_START_HOST"], "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False, "wsgi.multiprocess": True, "wsgi.run_once": False,
+    }
+    began = time.perf_counter()
+    body = config.wsgi.application(environ, lambda s, h, e=None: status.append(s))
+    b"".join(body)
+    getattr(body, "close", lambda: None)()
+    return int(status[0].split()[0]), (time.perf_counter() - began) * 1000
+
+status, first = request()
+_, second = request()
+print(json.dumps({
+    "status": status,
+    "import_ms": (imported - started) * 1000,
+    "warmup_ms": (ready - imported) * 1000,
+    "ready_ms": (ready_at - spawned) * 1000,
+    "first_response_ms": first,
+    "second_response_ms": second,
+}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Command(BaseCommand):
+    help = "Mide el arranque en frío de un worker: del proceso nuevo a la primera respuesta"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--path", default="/api/v1/health")
+        parser.add_argument("--imports", type=int, default=0, help="Módulos más lentos a listar")
+        parser.add_argument("--output", help="Escribir los resultados en este JSON")
+
+    def handle(self, *args, **opts):
+        results = {}
+        for mode in MODES:
+            runs = [self._spawn(mode, opts["path"]) for _ in range(opts["runs"])]
+            statuses = {run["status"] for run in runs}
+            results[mode] = {
+                "runs": len(runs),
+                "status": sorted(statuses),
+                **{m: round(statistics.median(r[m] for r in runs), 1) for m in METRICS},
+            }
+            summary = results[mode]
+            self.stdout.write(
+                f"{mode:<6}import {summary['import_ms']:>7.1f} ms  "
+                f"warmup {summary['warmup_ms']:>6.1f} ms  "
+                f"ready {summary['ready_ms']:>7.1f} ms  "
+                f"1st {summary['first_response_ms']:>7.1f} ms  "
+                f"2nd {summary['second_response_ms']:>5.1f} ms  "
+                f"HTTP {', '.join(map(str, summary['status']))}"
+            )
+
+        report = {"meta": self._meta(opts), "results": results}
+        if opts["imports"]:
+            report["imports"] = self._profile_imports(opts["imports"])
+            self.stdout.write("Importaciones más lentas (acumulado / propio):")
+            for row in report["imports"]:
+                self.stdout.write(
+                    f"  {row['cumulative_ms']:>7.1f} ms {row['self_ms']:>6.1f} ms  {row['module']}"
+                )
+
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Resultados en {opts['output']}"))
+
+    # ─────────────────────────────────────────────
+    def _run_child(self, args: list[str]) -> subprocess.CompletedProcess:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"),
+            # The database this process uses (under the tests, the test database)
+            "POSTGRES_DB": connections["default"].settings_dict["NAME"],
+            "COLD_START_HOST": self._host(),
+            "COLD_START_SPAWNED": repr(time.time()),
+        }
+        result = subprocess.run(  # noqa: S603 — our own interpreter and script
+            [sys.executable, *args], cwd=BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if result.returncode:
+            raise CommandError(f"El proceso hijo falló:\n{result.stderr[-2000:]}")
+        return result
+
+    def _spawn(self, mode: str, path: str) -> dict:
+        result = self._run_child(["-c", _CHILD, mode, path])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def _profile_imports(self, top: int) -> list[dict]:
+        result = self._run_child(["-X", "importtime", "-c", "import config.wsgi"])
+        rows = [
+            {
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+                "depth": len(match.group(3)) // 2,
+            }
+            for match in map(_IMPORTTIME.match, result.stderr.splitlines())
+            if match
+        ]
+        return sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top]
+
+    @staticmethod
+    def _host() -> str:
+        host = next((h for h in settings.ALLOWED_HOSTS if h != "*"), "localhost")
+        return host.lstrip(".")
+
+    @staticmethod
+    def _meta(opts) -> dict:
+        return {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "path": opts["path"],
+            "runs": opts["runs"],
+        }
@@ -0,0 +1,72 @@
+"""
+Compare two ``run_benchmarks`` result files and fail on regressions.
+
+A scenario regresses when its median time grows by more than ``--threshold``
+(relative, default 20%) or when it runs more SQL queries than in the baseline.
+
+    python manage.py compare_benchmarks baseline.json results.json
+"""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def compare(baseline: dict, current: dict, *, threshold: float = 0.2) -> list[dict]:
+    """One row per scenario present in both runs, flagged if it regressed."""
+    rows = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = now["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        rows.append(
+            {
+                "name": name,
+                "before_ms": before["median_ms"],
+                "after_ms": now["median_ms"],
+                "ratio": ratio,
+                "before_queries": before["queries"],
+                "after_queries": now["queries"],
+                "regressed": ratio > 1 + threshold or now["queries"] > before["queries"],
+            }
+        )
+    return rows
+
+
+def format_rows(rows: list[dict]) -> list[str]:
+    lines = [f"{'escenario':<28}{'base ms':>10}{'actual ms':>11}{'Δ':>8}{'queries':>12}"]
+    for r in rows:
+        mark = "  ← REGRESIÓN" if r["regressed"] else ""
+        lines.append(
+            f"{r['name']:<28}{r['before_ms']:>10.1f}{r['after_ms']:>11.1f}"
+            f"{(r['ratio'] - 1) * 100:>+7.0f}%"
+            f"{r['before_queries']:>6} → {r['after_queries']:<4}{mark}"
+        )
+    return lines
+
+
+def load(path: str) -> dict:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError) as exc:
+        raise CommandError(f"No se pudo leer {path}: {exc}") from exc
+
+
+class Command(BaseCommand):
+    help = "Compara resultados de run_benchmarks contra una línea base"
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline")
+        parser.add_argument("current")
+        parser.add_argument("--threshold", type=float, default=0.2)
+
+    def handle(self, *args, **opts):
+        rows = compare(load(opts["baseline"]), load(opts["current"]), threshold=opts["threshold"])
+        for line in format_rows(rows):
+            self.stdout.write(line)
+        regressed = [r["name"] for r in rows if r["regressed"]]
+        if regressed:
+            raise CommandError(f"Regresiones: {', '.join(regressed)}")
+        self.stdout.write(self.style.SUCCESS("Sin regresiones."))
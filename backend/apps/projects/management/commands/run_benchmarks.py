@@ -0,0 +1,182 @@
+"""
+Benchmark the hot API endpoints against the ``seed_bench_data`` dataset.
+
+Each scenario is requested through the full Django stack (middleware, auth,
+serialization) with the test client: a few warm-up calls, then ``--repeat``
+timed calls. Query counts come from the ``Server-Timing`` header. Writes run
+inside a transaction that is rolled back at the end, so the dataset — and
+therefore the next run — is unchanged (``on_commit`` hooks never fire).
+
+    python manage.py seed_bench_data --reset
+    python manage.py run_benchmarks --output bench.json --baseline baseline.json
+"""
+
+import json
+import logging
+import platform
+import re
+import statistics
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import User
+from apps.projects.models import Board, Task
+
+from .compare_benchmarks import compare, format_rows, load
+from .seed_bench_data import BENCH_ADMIN_EMAIL, BENCH_MEMBER_EMAIL, BENCH_WORKSPACE_PREFIX
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+class Command(BaseCommand):
+    help = "Ejecuta los benchmarks de la API sobre el dataset de seed_bench_data"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--output", default="bench-results.json")
+        parser.add_argument("--baseline", help="Resultados previos con los que comparar")
+        parser.add_argument("--threshold", type=float, default=0.2)
+        parser.add_argument("--only", nargs="*", help="Ejecutar solo estos escenarios")
+
+    def handle(self, *args, **opts):
+        scenarios = self._scenarios()
+        if opts["only"]:
+            scenarios = {k: v for k, v in scenarios.items() if k in opts["only"]}
+
+        client = Client()
+        results = {}
+        access_log = logging.getLogger("access")
+        access_log.disabled = True  # one line per request would drown the report
+        try:
+            with (
+                override_settings(
+                    RATE_LIMIT_ENABLED=False,
+                    ALLOWED_HOSTS=["testserver"],
+                    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                ),
+                transaction.atomic(),
+            ):
+                for name, request in scenarios.items():
+                    results[name] = self._measure(
+                        client, name, request, opts["warmup"], opts["repeat"]
+                    )
+                    self.stdout.write(
+                        f"{name:<28}{results[name]['median_ms']:>9.1f} ms  "
+                        f"p95 {results[name]['p95_ms']:.1f} ms  "
+                        f"{results[name]['queries']} queries"
+                    )
+                transaction.set_rollback(True)
+        finally:
+            access_log.disabled = False
+
+        report = {"meta": self._meta(opts), "results": results}
+        Path(opts["output"]).write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Resultados en {opts['output']}"))
+
+        if opts["baseline"]:
+            rows = compare(load(opts["baseline"]), report, threshold=opts["threshold"])
+            for line in format_rows(rows):
+                self.stdout.write(line)
+            regressed = [r["name"] for r in rows if r["regressed"]]
+            if regressed:
+                raise CommandError(f"Regresiones: {', '.join(regressed)}")
+
+    # ─────────────────────────────────────────────
+    def _scenarios(self) -> dict:
+        admin = User.objects.filter(email=BENCH_ADMIN_EMAIL).first()
+        member = User.objects.filter(email=BENCH_MEMBER_EMAIL).first()
+        board = (
+            Board.objects.filter(workspace__name__startswith=BENCH_WORKSPACE_PREFIX)
+            .annotate(n=Count("columns__tasks"))
+            .order_by("-n")
+            .first()
+        )
+        if not (admin and member and board):
+            raise CommandError("No hay dataset de benchmark: ejecute seed_bench_data primero.")
+
+        columns = list(board.columns.order_by("order")[:2])
+        # A top-level task with no dependencies, so moves are never blocked
+        movable = Task.objects.filter(
+            column=columns[0], parent__isnull=True, dependencies__isnull=True
+        ).first()
+        task = Task.objects.filter(column__board=board, parent__isnull=True).first()
+        if movable is None or task is None:
+            raise CommandError("El tablero de benchmark no tiene tareas suficientes.")
+
+        as_admin = {"HTTP_AUTHORIZATION": f"Bearer {create_access_token(admin)}"}
+        as_member = {"HTTP_AUTHORIZATION": f"Bearer {create_access_token(member)}"}
+        api = "/api/v1"
+
+        def move(client, i):
+            target = columns[(i + 1) % 2]
+            return client.post(
+                f"{api}/tasks/{movable.id}/move",
+                {"column_id": str(target.id), "new_order": 0},
+                content_type="application/json",
+                **as_admin,
+            )
+
+        return {
+            "board_detail_admin": lambda c, i: c.get(f"{api}/boards/{board.id}", **as_admin),
+            "board_detail_member": lambda c, i: c.get(f"{api}/boards/{board.id}", **as_member),
+            "task_move": move,
+            "comment_create": lambda c, i: c.post(
+                f"{api}/tasks/{task.id}/comments",
+                {"content": f"Comentario de benchmark {i}"},
+                content_type="application/json",
+                **as_admin,
+            ),
+            "notifications_count": lambda c, i: c.get(f"{api}/notifications/count", **as_member),
+            "workspace_list": lambda c, i: c.get(f"{api}/workspaces", **as_member),
+        }
+
+    def _measure(self, client, name, request, warmup: int, repeat: int) -> dict:
+        timings, queries = [], []
+        for i in range(warmup + repeat):
+            started = time.perf_counter()
+            response = request(client, i)
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                detail = response.content[:200]
+                raise CommandError(f"{name}: HTTP {response.status_code} {detail!r}")
+            if i < warmup:
+                continue
+            timings.append(elapsed)
+            match = _QUERIES.search(response.get("Server-Timing", ""))
+            queries.append(int(match.group(1)) if match else 0)
+
+        return {
+            "runs": repeat,
+            "min_ms": round(min(timings), 2),
+            "median_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(
+                statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0], 2
+            ),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "queries": max(queries),
+        }
+
+    @staticmethod
+    def _meta(opts) -> dict:
+        boards = Board.objects.filter(workspace__name__startswith=BENCH_WORKSPACE_PREFIX)
+        return {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": opts["repeat"],
+            "dataset": {
+                "boards": boards.count(),
+                "tasks": Task.objects.filter(
+                    column__board__workspace__name__startswith=BENCH_WORKSPACE_PREFIX
+                ).count(),
+            },
+        }
@@ -0,0 +1,231 @@
+"""
+Bulk synthetic dataset for performance work.
+
+Generates N workspaces × M boards × K tasks (plus users, memberships,
+assignments, subtasks, dependencies, comments and notifications) with
+``bulk_create`` in large batches — tens of thousands of rows per second
+instead of one INSERT per factory call. Output is deterministic for a given
+``--seed``; everything created is tagged so ``--reset`` can remove it.
+
+    python manage.py seed_bench_data --workspaces 2 --boards 5 --tasks 500
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.accounts.models import User
+from apps.projects.models import (
+    Board,
+    Column,
+    CommentSource,
+    Notification,
+    NotificationType,
+    Priority,
+    Task,
+    TaskAssignment,
+    TaskComment,
+    Workspace,
+)
+from apps.projects.services import DEFAULT_COLUMNS
+
+BENCH_EMAIL_DOMAIN = "bench.stward.local"
+BENCH_WORKSPACE_PREFIX = "Bench "
+BENCH_ADMIN_EMAIL = f"admin@{BENCH_EMAIL_DOMAIN}"
+BENCH_MEMBER_EMAIL = f"member@{BENCH_EMAIL_DOMAIN}"
+BENCH_PASSWORD = "benchpass123"  # noqa: S105 — synthetic local data
+
+BATCH_SIZE = 5000
+WORDS = (
+    "informe revisión cliente diseño api migración pruebas despliegue factura "
+    "contrato reunión soporte integración backlog sprint métricas auditoría"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Genera un dataset sintético masivo para benchmarks (bulk_create)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workspaces", type=int, default=2)
+        parser.add_argument("--boards", type=int, default=5, help="Tableros por workspace")
+        parser.add_argument("--tasks", type=int, default=500, help="Tareas por tablero")
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--comments", type=int, default=2, help="Comentarios por tarea")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--reset", action="store_true", help="Borra el dataset anterior")
+
+    def handle(self, *args, **opts):
+        started = time.perf_counter()
+        rng = random.Random(opts["seed"])  # noqa: S311 — reproducible, not secret
+
+        with transaction.atomic():
+            if opts["reset"]:
+                self._reset()
+            counts = self._generate(
+                rng, **{k: opts[k] for k in ("workspaces", "boards", "tasks", "users", "comments")}
+            )
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Dataset generado en {elapsed:.1f}s: {summary}"))
+
+    # ─────────────────────────────────────────────
+    def _reset(self):
+        Workspace.all_objects.filter(name__startswith=BENCH_WORKSPACE_PREFIX).delete()
+        User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").delete()
+        self.stdout.write("Dataset anterior eliminado.")
+
+    def _generate(self, rng, *, workspaces, boards, tasks, users, comments) -> dict:
+        password = make_password(BENCH_PASSWORD)
+        roles = [User.UserRole.MANAGER, User.UserRole.DEVELOPER, User.UserRole.VIEWER]
+
+        admin = User(
+            email=BENCH_ADMIN_EMAIL,
+            username=BENCH_ADMIN_EMAIL,
+            password=password,
+            first_name="Bench",
+            last_name="Admin",
+            role=User.UserRole.ADMIN,
+        )
+        member = User(
+            email=BENCH_MEMBER_EMAIL,
+            username=BENCH_MEMBER_EMAIL,
+            password=password,
+            first_name="Bench",
+            last_name="Member",
+            role=User.UserRole.DEVELOPER,
+        )
+        people = [admin, member] + [
+            User(
+                email=f"user{i}@{BENCH_EMAIL_DOMAIN}",
+                username=f"user{i}@{BENCH_EMAIL_DOMAIN}",
+                password=password,
+                first_name=f"Usuario{i}",
+                last_name=rng.choice(WORDS).title(),
+                role=rng.choice(roles),
+            )
+            for i in range(users)
+        ]
+        User.objects.bulk_create(people, batch_size=BATCH_SIZE)
+
+        ws_rows = [
+            Workspace(name=f"{BENCH_WORKSPACE_PREFIX}{w}", owner=admin, created_by=admin)
+            for w in range(workspaces)
+        ]
+        Workspace.objects.bulk_create(ws_rows)
+        Membership = Workspace.members.through
+        Membership.objects.bulk_create(
+            [Membership(workspace_id=ws.id, user_id=u.id) for ws in ws_rows for u in people[1:]],
+            batch_size=BATCH_SIZE,
+        )
+
+        board_rows = [
+            Board(name=f"Tablero {w}.{b}", workspace=ws, created_by=admin)
+            for w, ws in enumerate(ws_rows)
+            for b in range(boards)
+        ]
+        Board.objects.bulk_create(board_rows)
+        column_rows = [
+            Column(board=board, created_by=admin, **spec)
+            for board in board_rows
+            for spec in DEFAULT_COLUMNS
+        ]
+        Column.objects.bulk_create(column_rows)
+        columns_by_board: dict = {}
+        for col in column_rows:
+            columns_by_board.setdefault(col.board_id, []).append(col)
+
+        priorities = [p.value for p in Priority]
+        today = date.today()
+        task_rows, subtask_rows, edges = [], [], []
+        for board in board_rows:
+            board_columns = columns_by_board[board.id]
+            top_level = []
+            for i in range(tasks):
+                # ~20% subtasks of an earlier top-level task; ~30% depend on earlier tasks
+                parent = rng.choice(top_level) if top_level and rng.random() < 0.2 else None
+                column = parent.column if parent else rng.choice(board_columns)
+                start = today + timedelta(days=rng.randint(-90, 90))
+                task = Task(
+                    title=" ".join(rng.choices(WORDS, k=4)).capitalize(),
+                    description=" ".join(rng.choices(WORDS, k=20)),
+                    order=i,
+                    priority=rng.choice(priorities),
+                    column=column,
+                    parent=parent,
+                    assignee=rng.choice(people) if rng.random() < 0.8 else None,
+                    start_date=start,
+                    end_date=start + timedelta(days=rng.randint(0, 20)),
+                    progress=100 if column.order == 3 else rng.choice((0, 25, 50, 75)),
+                    created_by=rng.choice(people),
+                )
+                if parent:
+                    subtask_rows.append(task)
+                    continue
+                if top_level and rng.random() < 0.3:
+                    for pred in rng.sample(top_level, k=min(len(top_level), rng.randint(1, 2))):
+                        edges.append((task, pred))
+                top_level.append(task)
+                task_rows.append(task)
+        Task.objects.bulk_create(task_rows, batch_size=BATCH_SIZE)
+        Task.objects.bulk_create(subtask_rows, batch_size=BATCH_SIZE)
+        all_tasks = task_rows + subtask_rows
+
+        Dependency = Task.dependencies.through
+        Dependency.objects.bulk_create(
+            [Dependency(from_task_id=t.id, to_task_id=p.id) for t, p in edges],
+            batch_size=BATCH_SIZE,
+        )
+
+        assignments = {}
+        for task in all_tasks:
+            for user in rng.sample(people, k=rng.randint(0, 3)):
+                assignments[task.id, user.id] = TaskAssignment(
+                    task=task, user=user, individual_progress=rng.choice((0, 50, 100))
+                )
+        # The member collaborates on every tenth task, so non-admin views are non-empty
+        for task in task_rows[::10]:
+            assignments.setdefault((task.id, member.id), TaskAssignment(task=task, user=member))
+        TaskAssignment.objects.bulk_create(assignments.values(), batch_size=BATCH_SIZE)
+
+        comment_rows = [
+            TaskComment(
+                task=task,
+                author=author,
+                author_email=author.email,
+                content=" ".join(rng.choices(WORDS, k=15)),
+                source=CommentSource.APP,
+            )
+            for task in all_tasks
+            for author in rng.choices(people, k=comments)
+        ]
+        TaskComment.objects.bulk_create(comment_rows, batch_size=BATCH_SIZE)
+
+        notification_rows = [
+            Notification(
+                user=user,
+                task=task,
+                type=rng.choice([t.value for t in NotificationType]),
+                message=f"Actividad en «{task.title}»",
+                read=rng.random() < 0.6,
+            )
+            for task in rng.sample(all_tasks, k=min(len(all_tasks), len(all_tasks) // 2))
+            for user in rng.sample(people, k=2)
+        ]
+        Notification.objects.bulk_create(notification_rows, batch_size=BATCH_SIZE)
+
+        return {
+            "usuarios": len(people),
+            "workspaces": len(ws_rows),
+            "tableros": len(board_rows),
+            "tareas": len(task_rows),
+            "subtareas": len(subtask_rows),
+            "dependencias": len(edges),
+            "asignaciones": len(assignments),
+            "comentarios": len(comment_rows),
+            "notificaciones": len(notification_rows),
+        }
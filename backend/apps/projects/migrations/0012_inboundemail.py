@@ -0,0 +1,69 @@
+# Generated by Django 5.1.4 on 2026-10-19 17:44
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0011_attachment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InboundEmail",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        help_text="Message-ID del correo o hash SHA-256 del payload.",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendiente"),
+                            ("processed", "Procesado"),
+                            ("ignored", "Ignorado"),
+                            ("failed", "Fallido"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("detail", models.CharField(blank=True, default="", max_length=255)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "comment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="projects.taskcomment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "correo entrante",
+                "verbose_name_plural": "correos entrantes",
+                "db_table": "inbound_emails",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
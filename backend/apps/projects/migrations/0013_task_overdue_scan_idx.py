@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-19 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0012_inboundemail"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("end_date__isnull", False), ("is_deleted", False)),
+                fields=["end_date"],
+                name="task_overdue_scan_idx",
+            ),
+        ),
+    ]
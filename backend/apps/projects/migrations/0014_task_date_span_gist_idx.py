@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:00
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0013_task_overdue_scan_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.Func(
+                    models.F("start_date"),
+                    models.Func(models.F("start_date"), models.F("end_date"), function="GREATEST"),
+                    models.Value("[]"),
+                    function="daterange",
+                    output_field=django.contrib.postgres.fields.ranges.DateRangeField(),
+                ),
+                condition=models.Q(("is_deleted", False), ("start_date__isnull", False)),
+                name="task_date_span_gist_idx",
+            ),
+        ),
+    ]
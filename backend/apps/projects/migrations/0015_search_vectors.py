@@ -0,0 +1,81 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Vectors are maintained by BEFORE triggers so every write path (ORM save,
+# bulk_update, raw SQL, admin) stays indexed without application code.
+TRIGGERS_SQL = """
+CREATE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('spanish', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update();
+
+CREATE FUNCTION task_comments_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := setweight(to_tsvector('spanish', coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER task_comments_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF content ON task_comments
+    FOR EACH ROW EXECUTE FUNCTION task_comments_search_vector_update();
+
+UPDATE tasks SET search_vector =
+    setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('spanish', coalesce(description, '')), 'B');
+
+UPDATE task_comments SET search_vector =
+    setweight(to_tsvector('spanish', coalesce(content, '')), 'B');
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS task_comments_search_vector_trigger ON task_comments;
+DROP FUNCTION IF EXISTS task_comments_search_vector_update();
+DROP TRIGGER IF EXISTS tasks_search_vector_trigger ON tasks;
+DROP FUNCTION IF EXISTS tasks_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0014_task_date_span_gist_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="taskcomment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="task_search_gin_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskcomment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="comment_search_gin_idx"
+            ),
+        ),
+    ]
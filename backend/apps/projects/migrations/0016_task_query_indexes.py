@@ -0,0 +1,61 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0015_search_vectors"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(priority="low", then=1),
+                    models.When(priority="medium", then=2),
+                    models.When(priority="high", then=3),
+                    models.When(priority="urgent", then=4),
+                    default=0,
+                ),
+                output_field=models.SmallIntegerField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["column", "priority_rank", "id"],
+                name="task_col_priority_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["column", "start_date", "id"],
+                name="task_col_start_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["column", "end_date", "id"],
+                name="task_col_end_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["column", "progress", "id"],
+                name="task_col_progress_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0016_task_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="tasks_assigne_462a05_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["assignee", "end_date", "id"], name="task_assignee_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="taskassignment",
+            index=models.Index(fields=["user", "task"], name="task_assignment_user_task_idx"),
+        ),
+    ]
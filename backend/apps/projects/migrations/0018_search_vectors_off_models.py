@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Drop the search_vector columns and their GIN indexes from the model state
+    only: the columns, indexes and triggers stay in the database (0015), read
+    by the search's SQL, while ORM loads of tasks and comments stop fetching them.
+    """
+
+    dependencies = [
+        ("projects", "0017_my_tasks_indexes"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name="task", name="task_search_gin_idx"),
+                migrations.RemoveIndex(model_name="taskcomment", name="comment_search_gin_idx"),
+                migrations.RemoveField(model_name="task", name="search_vector"),
+                migrations.RemoveField(model_name="taskcomment", name="search_vector"),
+            ],
+        ),
+    ]
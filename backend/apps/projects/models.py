@@ -1,11 +1,28 @@
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
 
+def task_date_span():
+    """
+    Inclusive ``daterange`` covered by a task. A missing or earlier end date
+    collapses to the start day. Shared by the GiST index and timeline queries
+    so the planner can match them.
+    """
+    return models.Func(
+        models.F("start_date"),
+        models.Func(models.F("start_date"), models.F("end_date"), function="GREATEST"),
+        models.Value("[]"),
+        function="daterange",
+        output_field=DateRangeField(),
+    )
+
+
 # ─────────────────────────────────────────────────
 # Base mixin
 # ─────────────────────────────────────────────────
@@ -57,6 +74,15 @@ class SoftDeleteModel(models.Model):
             update_fields.append("updated_by_id")
         self.save(update_fields=update_fields)
 
+    @staticmethod
+    def soft_delete_rows(rows, deleted_by=None) -> int:
+        """Queryset counterpart of ``soft_delete``: one UPDATE for all live rows."""
+        now = timezone.now()
+        fields = {"is_deleted": True, "deleted_at": now, "updated_at": now}
+        if deleted_by and hasattr(rows.model, "updated_by_id"):
+            fields["updated_by"] = deleted_by
+        return rows.filter(is_deleted=False).update(**fields)
+
 
 # ─────────────────────────────────────────────────
 # Audit mixin
@@ -111,9 +137,15 @@ class Workspace(TimeStampedModel, SoftDeleteModel, AuditMixin):
         return self.name
 
     def soft_delete(self, deleted_by=None):
-        # Cascade: soft-delete all boards (which cascades to columns/tasks)
-        for board in Board.all_objects.filter(workspace_id=self.id, is_deleted=False):
-            board.soft_delete(deleted_by=deleted_by)
+        # Cascade to boards, columns and tasks: one UPDATE per table, not per row
+        boards = Board.all_objects.filter(workspace_id=self.id, is_deleted=False)
+        columns = Column.all_objects.filter(board__in=boards, is_deleted=False)
+        Task.all_objects.filter(column__in=columns, is_deleted=False).update(
+            is_deleted=True,
+            deleted_at=timezone.now(),
+        )
+        self.soft_delete_rows(columns, deleted_by)
+        self.soft_delete_rows(boards, deleted_by)
         super().soft_delete(deleted_by=deleted_by)
 
 
@@ -140,9 +172,13 @@ class Board(TimeStampedModel, SoftDeleteModel, AuditMixin):
         return self.name
 
     def soft_delete(self, deleted_by=None):
-        # Cascade: soft-delete all columns (which cascades to tasks)
-        for column in Column.all_objects.filter(board_id=self.id, is_deleted=False):
-            column.soft_delete(deleted_by=deleted_by)
+        # Cascade to columns and tasks: one UPDATE per table, not per row
+        columns = Column.all_objects.filter(board_id=self.id, is_deleted=False)
+        Task.all_objects.filter(column__in=columns, is_deleted=False).update(
+            is_deleted=True,
+            deleted_at=timezone.now(),
+        )
+        self.soft_delete_rows(columns, deleted_by)
         super().soft_delete(deleted_by=deleted_by)
 
 
@@ -220,6 +256,18 @@ class Task(TimeStampedModel, SoftDeleteModel, AuditMixin):
         choices=Priority.choices,
         default=Priority.NONE,
     )
+    # Sortable severity (none=0 … urgent=4), computed by the database
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            models.When(priority=Priority.LOW, then=1),
+            models.When(priority=Priority.MEDIUM, then=2),
+            models.When(priority=Priority.HIGH, then=3),
+            models.When(priority=Priority.URGENT, then=4),
+            default=0,
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
 
     column = models.ForeignKey(
         Column,
@@ -274,6 +322,9 @@ class Task(TimeStampedModel, SoftDeleteModel, AuditMixin):
         verbose_name="dependencias",
         help_text="Tareas que deben completarse antes que esta",
     )
+    # tasks.search_vector (tsvector, GIN-indexed) is filled by a trigger from title (A)
+    # and description (B) and only read by the search's SQL: kept off the model so
+    # loading a task never fetches it (migrations 0015, 0018)
 
     class Meta:
         db_table = "tasks"
@@ -283,7 +334,30 @@ class Task(TimeStampedModel, SoftDeleteModel, AuditMixin):
         indexes = [
             models.Index(fields=["column", "order"]),
             models.Index(fields=["priority"]),
-            models.Index(fields=["assignee"]),
+            # "My work": a user's tasks by due date (GET /me/tasks)
+            models.Index(fields=["assignee", "end_date", "id"], name="task_assignee_due_idx"),
+            # check_overdue_tasks: live tasks with a due date, range-scanned by end_date.
+            # Completion lives on the column, so the predicate can't exclude it here.
+            models.Index(
+                fields=["end_date"],
+                name="task_overdue_scan_idx",
+                condition=models.Q(is_deleted=False, end_date__isnull=False),
+            ),
+            # Timeline/Gantt windows: range-overlap (&&) on the task's date span
+            GistIndex(
+                task_date_span(),
+                name="task_date_span_gist_idx",
+                condition=models.Q(is_deleted=False, start_date__isnull=False),
+            ),
+            # Board task query: keyset scans per column for each sort key
+            *(
+                models.Index(
+                    fields=["column", key, "id"],
+                    name=f"task_col_{key}_idx",
+                    condition=models.Q(is_deleted=False),
+                )
+                for key in ("priority_rank", "start_date", "end_date", "progress")
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -303,12 +377,10 @@ class Task(TimeStampedModel, SoftDeleteModel, AuditMixin):
 
     @property
     def total_progress(self):
-        """Calculates average progress of all assignments."""
-        assignments = self.assignments.all()
-        if not assignments.exists():
+        """Calculates average progress of all assignments (uses the prefetch if any)."""
+        progresses = [a.individual_progress for a in self.assignments.all()]
+        if not progresses:
             return self.progress
-        
-        progresses = [a.individual_progress for a in assignments]
         return round(sum(progresses) / len(progresses))
 
     def __str__(self):
@@ -345,11 +417,32 @@ class TaskAssignment(TimeStampedModel):
         verbose_name = "asignación de tarea"
         verbose_name_plural = "asignaciones de tareas"
         unique_together = ("task", "user")
+        indexes = [
+            # The unique index leads with task; "my tasks" lookups lead with user
+            models.Index(fields=["user", "task"], name="task_assignment_user_task_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} en {self.task.title}"
 
 
+# ─────────────────────────────────────────────────
+# Attachment (content-addressed blob on local storage)
+# ─────────────────────────────────────────────────
+class Attachment(TimeStampedModel):
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=255, default="application/octet-stream")
+
+    class Meta:
+        db_table = "attachments"
+        verbose_name = "adjunto"
+        verbose_name_plural = "adjuntos"
+
+    def __str__(self):
+        return self.sha256
+
+
 # ─────────────────────────────────────────────────
 # Task Comment
 # ─────────────────────────────────────────────────
@@ -375,11 +468,19 @@ class TaskComment(TimeStampedModel):
     content = models.TextField(max_length=10000)
     attachment_filename = models.CharField(max_length=255, null=True, blank=True)
     attachment_size = models.PositiveIntegerField(null=True, blank=True)
+    attachment = models.ForeignKey(
+        Attachment,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="comments",
+    )
     source = models.CharField(
         max_length=10,
         choices=CommentSource.choices,
         default=CommentSource.APP,
     )
+    # task_comments.search_vector: like tasks.search_vector, from content
 
     class Meta:
         db_table = "task_comments"
@@ -431,3 +532,46 @@ class Notification(TimeStampedModel):
 
     def __str__(self):
         return f"Notificación para {self.user.email}: {self.message[:50]}"
+
+
+# ─────────────────────────────────────────────────
+# Inbound Email (raw webhook payloads, processed asynchronously)
+# ─────────────────────────────────────────────────
+class InboundEmailStatus(models.TextChoices):
+    PENDING = "pending", "Pendiente"
+    PROCESSED = "processed", "Procesado"
+    IGNORED = "ignored", "Ignorado"
+    FAILED = "failed", "Fallido"
+
+
+class InboundEmail(TimeStampedModel):
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Message-ID del correo o hash SHA-256 del payload.",
+    )
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10,
+        choices=InboundEmailStatus.choices,
+        default=InboundEmailStatus.PENDING,
+        db_index=True,
+    )
+    detail = models.CharField(max_length=255, blank=True, default="")
+    comment = models.ForeignKey(
+        TaskComment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "inbound_emails"
+        verbose_name = "correo entrante"
+        verbose_name_plural = "correos entrantes"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.idempotency_key} ({self.status})"
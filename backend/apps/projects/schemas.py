@@ -124,6 +124,79 @@ class TaskUpdateSchema(Schema):
     parent_id: UUID | None = None
     dependency_ids: list[UUID] | None = None
     assignment_progress: list[AssignmentProgressItemSchema] | None = None
+    # Shift dependent tasks (finish-to-start) when start/end dates change
+    auto_schedule: bool = False
+
+
+class TaskDatesSchema(Schema):
+    id: UUID
+    title: str
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class TaskUpdateResultSchema(TaskSchema):
+    """The updated task plus any dependents shifted by auto-scheduling."""
+    rescheduled: list[TaskDatesSchema] = []
+
+
+class TaskQuerySchema(Schema):
+    """Query string of ``GET /boards/{id}/tasks`` (repeat ``priority``/``status`` for several)."""
+
+    assignee_id: UUID | None = None
+    priority: list[PriorityEnum] | None = None
+    status: list[ColumnStatusEnum] | None = None
+    column_id: UUID | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    overdue: bool | None = None
+    parent_id: UUID | None = None
+    sort: str = Field("order", pattern=r"^-?(order|priority|start_date|end_date|progress)$")
+    group_by: str = Field("column", pattern=r"^(column|priority|assignee)?$")  # "" = ungrouped
+    cursor: str | None = None
+    limit: int = Field(50, ge=1, le=200)
+
+
+class TaskQueryItemSchema(TaskSchema):
+    # Group key of the row (column id, priority or assignee id) when grouped
+    group: str | None = None
+
+
+class TaskGroupSchema(Schema):
+    key: str | None = None
+    label: str
+    count: int
+
+
+class TaskPageSchema(Schema):
+    items: list[TaskQueryItemSchema]
+    next_cursor: str | None = None
+    groups: list[TaskGroupSchema] | None = None  # first page only
+
+
+class MyTaskSchema(TaskSchema):
+    board_id: UUID
+    board_name: str
+
+    @staticmethod
+    def resolve_board_id(obj):
+        return obj.column.board_id
+
+    @staticmethod
+    def resolve_board_name(obj):
+        return obj.column.board.name
+
+
+class DueCountsSchema(Schema):
+    overdue: int
+    today: int
+    week: int  # after today, up to Sunday
+
+
+class MyTasksPageSchema(Schema):
+    items: list[MyTaskSchema]
+    next_cursor: str | None = None
+    counts: DueCountsSchema | None = None  # first page only
 
 
 class TaskMoveSchema(Schema):
@@ -178,6 +251,59 @@ class BoardDetailSchema(Schema):
     updated_at: datetime
 
 
+class TaskScheduleSchema(Schema):
+    task_id: UUID
+    duration: int
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+    slack: int
+    critical: bool
+
+
+class CriticalPathSchema(Schema):
+    """Offsets are in days from the start of the board's schedule."""
+    board_id: UUID
+    project_duration: int
+    critical_path: list[UUID]
+    tasks: list[TaskScheduleSchema]
+
+
+class TaskBlockerSchema(Schema):
+    """An incomplete upstream task; ``via`` is the edge that reached it."""
+    id: UUID
+    title: str
+    progress: int
+    depth: int
+    via: str  # "dependency" | "parent"
+
+
+class TimelineTaskSchema(Schema):
+    id: UUID
+    title: str
+    board_id: UUID
+    column_id: UUID
+    parent_id: UUID | None = None
+    priority: PriorityEnum
+    progress: int
+    start_date: date
+    end_date: date | None = None
+
+
+class TimelineDependencySchema(Schema):
+    task_id: UUID
+    depends_on_id: UUID
+
+
+class TimelineSchema(Schema):
+    """Tasks overlapping [start, end] and the dependency edges between them."""
+    start: date
+    end: date
+    tasks: list[TimelineTaskSchema]
+    dependencies: list[TimelineDependencySchema]
+
+
 class BoardCreateSchema(Schema):
     name: str = Field(..., min_length=1, max_length=255)
     description: str = Field("", max_length=2000)
@@ -232,8 +358,17 @@ class TaskCommentSchema(Schema):
     source: str
     attachment_filename: str | None = None
     attachment_size: int | None = None
+    attachment_url: str | None = None
     created_at: datetime
 
+    @staticmethod
+    def resolve_attachment_url(obj):
+        if not obj.attachment_id:
+            return None
+        from .storage import download_url
+
+        return download_url(obj.id)
+
 
 class TaskCommentCreateSchema(Schema):
     content: str = Field(..., min_length=1, max_length=10000)
@@ -258,3 +393,22 @@ class NotificationSchema(Schema):
 
 class NotificationCountSchema(Schema):
     unread: int
+
+
+# ─────────────────────────────────────────────────
+# Search
+# ─────────────────────────────────────────────────
+class SearchResultSchema(Schema):
+    type: str  # "task" | "comment"
+    id: UUID
+    task_id: UUID
+    task_title: str
+    board_id: UUID
+    board_name: str
+    rank: float
+    headline: str  # HTML-escaped text; matches wrapped in <mark>
+
+
+class SearchPageSchema(Schema):
+    items: list[SearchResultSchema]
+    next_cursor: str | None = None
@@ -3,6 +3,7 @@ Service Layer — encapsulates all business logic.
 API endpoints delegate here; no ORM queries in api.py.
 """
 
+import functools
 import logging
 from datetime import date
 from uuid import UUID
@@ -13,18 +14,24 @@ from django.shortcuts import get_object_or_404
 from ninja.errors import HttpError
 
 from apps.accounts.models import User
+from config import dbrouting
 
+from . import caching, graph
 from .models import (
+    Attachment,
     Board,
     Column,
     ColumnStatus,
     CommentSource,
+    InboundEmail,
+    InboundEmailStatus,
     Notification,
     NotificationType,
     Task,
     TaskAssignment,
     TaskComment,
     Workspace,
+    task_date_span,
 )
 
 logger = logging.getLogger(__name__)
@@ -37,21 +44,48 @@ DEFAULT_COLUMNS = [
     {"name": "Completado", "status": ColumnStatus.COMPLETED, "order": 3, "color": "#22C55E"},
 ]
 
+# Renumber the live rows of one container 0..n-1, keeping their sequence
+_COMPACT_ORDER_SQL = """
+    UPDATE {table} x
+    SET "order" = r.position
+    FROM (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY "order", id) - 1 AS position
+        FROM {table}
+        WHERE {parent} = %(parent_id)s AND NOT is_deleted
+    ) r
+    WHERE x.id = r.id AND x."order" <> r.position
+"""
+
+
+def _compact_order(model, parent: str, parent_id: UUID) -> None:
+    """Close the gaps left in ``order`` after a removal, in one UPDATE."""
+    from django.db import connection
+
+    sql = _COMPACT_ORDER_SQL.format(table=model._meta.db_table, parent=f"{parent}_id")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"parent_id": parent_id})
+
 
 # ─────────────────────────────────────────────────
 # Workspace Service
 # ─────────────────────────────────────────────────
 class WorkspaceService:
     @staticmethod
-    def list_for_user(user: User):
+    def list_for_user(user: User, using: str = dbrouting.PRIMARY):
         """Return all workspaces the user owns or is a member of."""
         from django.db.models import Q
         return (
-            Workspace.objects.filter(Q(owner=user) | Q(members=user))
+            Workspace.objects.using(using)
+            .filter(Q(owner=user) | Q(members=user))
             .prefetch_related("boards")
             .distinct()
         )
 
+    @staticmethod
+    async def alist_for_user(user: User):
+        """``list_for_user`` on the read replica when it is safe to (still lazy)."""
+        return WorkspaceService.list_for_user(user, await dbrouting.aread_alias(user))
+
     @staticmethod
     def create(user: User, *, name: str, description: str = "") -> Workspace:
         ws = Workspace.objects.create(
@@ -89,6 +123,76 @@ class WorkspaceService:
         workspace.soft_delete(deleted_by=user)
 
 
+# ─────────────────────────────────────────────────
+# User Directory Service (assignee / member pickers)
+# ─────────────────────────────────────────────────
+class UserDirectoryService:
+    # Must match the expression of users_search_trgm_idx (accounts 0006)
+    SEARCH_EXPR = "lower(first_name || ' ' || last_name || ' ' || email)"
+    MAX_LIMIT = 50
+
+    @staticmethod
+    def directory():
+        """Active company accounts available for task assignment."""
+        return User.objects.filter(is_active=True, email__endswith="@stwards.com")
+
+    @staticmethod
+    def directory_etag() -> str:
+        """Validator for the unfiltered directory; changes when any listed user does."""
+        import hashlib
+
+        from django.db.models import Count, Max
+
+        stats = UserDirectoryService.directory().aggregate(n=Count("id"), latest=Max("updated_at"))
+        return hashlib.md5(
+            f"{stats['n']}:{stats['latest']}".encode(), usedforsecurity=False
+        ).hexdigest()
+
+    @staticmethod
+    def search(users, q: str, *, limit: int = 20) -> list[User]:
+        """
+        Prefix and fuzzy match on name and email. Prefix hits on first name,
+        last name or email come first, then pg_trgm word similarity (trigram
+        GIN index); without pg_trgm only substring matches are returned.
+        """
+        from django.db.models import BooleanField, FloatField, Value
+        from django.db.models.expressions import RawSQL
+
+        q = q.strip().lower()
+        limit = max(1, min(limit, UserDirectoryService.MAX_LIMIT))
+        like = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        expr = UserDirectoryService.SEARCH_EXPR
+
+        users = users.annotate(
+            prefix=RawSQL(  # noqa: S611 — constant SQL, user input only as params
+                "(lower(first_name) LIKE %s OR lower(last_name) LIKE %s OR lower(email) LIKE %s)",
+                [f"{like}%"] * 3,
+                output_field=BooleanField(),
+            )
+        )
+        if UserDirectoryService._trigram_available():
+            users = users.annotate(
+                score=RawSQL(f"word_similarity(%s, {expr})", [q], output_field=FloatField())  # noqa: S611
+            ).filter(
+                RawSQL(f"({expr} LIKE %s OR %s <%% {expr})", [f"%{like}%", q], BooleanField())  # noqa: S611
+            )
+        else:
+            users = users.annotate(score=Value(0.0)).filter(
+                RawSQL(f"{expr} LIKE %s", [f"%{like}%"], BooleanField())  # noqa: S611
+            )
+        return list(users.order_by("-prefix", "-score", "first_name", "last_name")[:limit])
+
+    @staticmethod
+    @functools.cache
+    def _trigram_available() -> bool:
+        """Whether pg_trgm is installed (checked once per process)."""
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+
+
 # ─────────────────────────────────────────────────
 # Board Service
 # ─────────────────────────────────────────────────
@@ -108,36 +212,49 @@ class BoardService:
         - Admins see all tasks.
         - Managers and other roles see only tasks where they are assignee, collaborator, or creator.
         """
-        from django.db.models import Prefetch, Q
-        from apps.accounts.models import User as UserModel
+        using = dbrouting.read_alias(user)
+        return get_object_or_404(BoardService._detail_queryset(user, using), id=board_id)
 
-        is_privileged = (
-            user.is_staff
-            or user.is_superuser
-            or user.role == UserModel.UserRole.ADMIN
-        )
+    @staticmethod
+    async def aget_detail(board_id: UUID, user: User) -> Board:
+        """``get_detail`` for async views; the prefetches run before it returns."""
+        from django.shortcuts import aget_object_or_404
+
+        using = await dbrouting.aread_alias(user)
+        return await aget_object_or_404(BoardService._detail_queryset(user, using), id=board_id)
+
+    @staticmethod
+    def _detail_queryset(user: User, using: str):
+        from django.db.models import Prefetch, Q
 
-        tasks_qs = Task.objects.filter(
+        tasks_qs = TaskService.with_relations(TaskService.visible_to(user, Task.objects.filter(
             parent_id__isnull=True,         # subtareas no aparecen en el tablero
-        ).select_related("assignee").prefetch_related(
-            "assignments__user",
-            "dependencies",
-            "subtasks__assignee",
-        )
-        if not is_privileged:
-            tasks_qs = tasks_qs.filter(
-                Q(assignee=user) | Q(assignments__user=user) | Q(created_by=user)
-            ).distinct()
+        )))
 
-        return get_object_or_404(
-            Board.objects.filter(
-                Q(workspace__owner=user) | Q(workspace__members=user)
-            ).prefetch_related(
-                "columns",
-                Prefetch("columns__tasks", queryset=tasks_qs),
-            ).distinct(),
-            id=board_id,
-        )
+        # The prefetches follow the boards to the same database (ReplicaRouter)
+        return Board.objects.using(using).filter(
+            Q(workspace__owner=user) | Q(workspace__members=user)
+        ).prefetch_related(
+            "columns",
+            Prefetch("columns__tasks", queryset=tasks_qs),
+        ).distinct()
+
+    @staticmethod
+    def critical_path(board_id: UUID, user: User) -> dict:
+        """Dependency schedule (CPM) for a board the user can access."""
+        board = BoardService.get_or_404(board_id, user)
+        try:
+            schedule = graph.board_schedule(board.id)
+        except graph.CycleError as exc:
+            raise HttpError(
+                400, "El tablero contiene dependencias circulares entre tareas."
+            ) from exc
+        return {
+            "board_id": board.id,
+            "project_duration": schedule.project_duration,
+            "critical_path": schedule.critical_path,
+            "tasks": schedule.nodes,
+        }
 
     @staticmethod
     def create(user: User, *, name: str, description: str = "", workspace_id: UUID) -> Board:
@@ -229,8 +346,11 @@ class ColumnService:
             column.updated_by = user
             update_fields.append("updated_by_id")
         column.save(update_fields=update_fields)
-        column.refresh_from_db()
-        return column
+        from django.db.models import Prefetch
+
+        return Column.objects.prefetch_related(
+            Prefetch("tasks", queryset=TaskService.with_relations(Task.objects))
+        ).get(id=column.id)
 
     @staticmethod
     def delete(column: Column, user: User = None) -> None:
@@ -239,16 +359,45 @@ class ColumnService:
         with transaction.atomic():
             column.soft_delete(deleted_by=user)
             # Recompact order for remaining columns in the board
-            for idx, cid in enumerate(
-                board.columns.order_by("order").values_list("id", flat=True)
-            ):
-                Column.objects.filter(id=cid).update(order=idx)
+            _compact_order(Column, "board", board.id)
+        caching.bump("board", board.id)
 
 
 # ─────────────────────────────────────────────────
 # Task Service
 # ─────────────────────────────────────────────────
 class TaskService:
+    @staticmethod
+    def is_privileged(user: User) -> bool:
+        """Admins and Django staff see every task on the boards they can access."""
+        return user.is_staff or user.is_superuser or user.role == User.UserRole.ADMIN
+
+    @staticmethod
+    def visible_to(user: User, tasks):
+        """
+        Restrict a task queryset to what ``user`` may see: everything for
+        privileged users, otherwise tasks they are assignee, collaborator or
+        creator of. Uses EXISTS, so no DISTINCT is needed.
+        """
+        from django.db.models import Exists, OuterRef, Q
+
+        if TaskService.is_privileged(user):
+            return tasks
+        return tasks.filter(
+            Q(assignee=user)
+            | Q(created_by=user)
+            | Exists(TaskAssignment.objects.filter(task=OuterRef("pk"), user=user))
+        )
+
+    @staticmethod
+    def with_relations(tasks):
+        """Load everything ``TaskSchema`` serializes in a fixed number of queries."""
+        return tasks.select_related("assignee").prefetch_related(
+            "assignments__user",
+            "dependencies",
+            "subtasks__assignee",
+        )
+
     @staticmethod
     def create(user: User, *, column_id: UUID, **task_data) -> Task:
         """Create a task, ensuring user owns the parent board."""
@@ -269,8 +418,9 @@ class TaskService:
             if dependency_ids:
                 task.dependencies.set(dependency_ids)
         
+        caching.bump("board", column.board_id)
         logger.info("Task created: %s in column %s", task.id, column.id)
-        return task
+        return TaskService.with_relations(Task.objects).get(id=task.id)
 
     @staticmethod
     def get_or_404(task_id: UUID, user: User) -> Task:
@@ -291,6 +441,8 @@ class TaskService:
         assignee_ids = fields.pop("assignee_ids", None)
         dependency_ids = fields.pop("dependency_ids", None)
         assignment_progress = fields.pop("assignment_progress", None)
+        auto_schedule = fields.pop("auto_schedule", False)
+        rescheduled = []
         
         if user:
             task.updated_by = user
@@ -307,19 +459,36 @@ class TaskService:
                 setattr(task, key, value)
                 update_fields.append(key)
         
+        if dependency_ids:
+            try:
+                graph.assert_acyclic(task.id, dependency_ids)
+            except graph.CycleError:
+                raise HttpError(
+                    400, "Las dependencias indicadas crearían un ciclo entre tareas."
+                ) from None
+
         with transaction.atomic():
             task.save(update_fields=update_fields)
             if assignee_ids is not None:
                 TaskService.sync_assignments(task, assignee_ids)
             if dependency_ids is not None:
                 task.dependencies.set(dependency_ids)
-            if assignment_progress is not None:
-                for item in assignment_progress:
-                    TaskAssignment.objects.filter(
-                        task=task, user_id=item["user_id"]
-                    ).update(individual_progress=item["progress"])
+            if assignment_progress:
+                from django.db.models import Case, Value, When
+
+                progress = {item["user_id"]: item["progress"] for item in assignment_progress}
+                TaskAssignment.objects.filter(task=task, user_id__in=progress).update(
+                    individual_progress=Case(
+                        *(When(user_id=uid, then=Value(p)) for uid, p in progress.items())
+                    )
+                )
+            # Finish-to-start cascade: shift dependents after a date change
+            if auto_schedule and ({"start_date", "end_date"} & fields.keys()):
+                rescheduled = graph.reschedule_dependents(task)
 
-        task.refresh_from_db()
+        task = TaskService.with_relations(Task.objects.select_related("column")).get(id=task.id)
+        task.rescheduled = rescheduled
+        caching.bump("board", task.column.board_id)
 
         # If this is a subtask, recalculate parent's per-user progress
         if task.parent_id:
@@ -340,51 +509,188 @@ class TaskService:
 
             # Add new assignments
             existing_uids = set(task.assignments.values_list("user_id", flat=True))
-            for uid in assignee_ids:
-                if uid not in existing_uids:
-                    TaskAssignment.objects.create(
-                        task=task,
-                        user_id=uid,
-                        user_color=random.choice(COLORS)
-                    )
+            new_uids = [uid for uid in dict.fromkeys(assignee_ids) if uid not in existing_uids]
+            if new_uids:
+                TaskAssignment.objects.bulk_create([
+                    TaskAssignment(task=task, user_id=uid, user_color=random.choice(COLORS))
+                    for uid in new_uids
+                ])
+                # One email fan-out for all new assignees (bulk_create skips post_save)
+                transaction.on_commit(
+                    lambda: TaskService._notify_new_assignees(task.id, new_uids)
+                )
 
             # Auto-add all assignees to workspace members so they can see the board
             if assignee_ids:
                 workspace = task.column.board.workspace
                 workspace.members.add(*assignee_ids)
 
+    @staticmethod
+    def _notify_new_assignees(task_id: UUID, user_ids: list[UUID]) -> None:
+        try:
+            from apps.projects.tasks import send_assignment_notifications
+            send_assignment_notifications(str(task_id), [str(uid) for uid in user_ids])
+        except Exception as exc:
+            logger.warning("Could not send assignment notifications: %s", exc)
+
+    # Ancestor chain of a task, nearest parent first (depth-capped against cycles)
+    _ANCESTORS_SQL = """
+        WITH RECURSIVE chain(id, depth) AS (
+            SELECT t.parent_id, 1
+            FROM tasks t
+            WHERE t.id = %(task_id)s AND t.parent_id IS NOT NULL
+            UNION ALL
+            SELECT t.parent_id, c.depth + 1
+            FROM chain c
+            JOIN tasks t ON t.id = c.id
+            WHERE t.parent_id IS NOT NULL AND c.depth < %(max_depth)s
+        )
+        SELECT id FROM chain ORDER BY depth
+    """
+    MAX_HIERARCHY_DEPTH = 32
+
     @staticmethod
     def recalculate_parent_progress(subtask: Task) -> None:
         """
-        When a subtask changes column, recalculate individual_progress for the
-        assigned user on the parent task (binary: COMPLETED = 100%, else 0%).
-        Only updates assignments where the user has at least one subtask assigned.
+        When a subtask changes, recalculate individual_progress on every ancestor
+        (parent, grandparent, … up the whole chain). For each ancestor, a user's
+        assignment becomes the average progress of the child tasks assigned to
+        that user; users with no such children keep their manual progress.
+
+        A child's progress is the average of its assignments when it has any,
+        otherwise its own ``progress`` — so milestones → groups → tasks stay
+        consistent. Runs a constant number of queries regardless of depth.
         """
-        if not subtask.parent_id or not subtask.assignee_id:
+        from django.db import connection
+        from django.db.models import Count, Sum
+        from django.utils import timezone
+
+        if not subtask.parent_id:
             return
 
-        parent_assignments = TaskAssignment.objects.filter(
-            task_id=subtask.parent_id
-        )
-        if not parent_assignments.exists():
+        with connection.cursor() as cursor:
+            cursor.execute(TaskService._ANCESTORS_SQL, {
+                "task_id": subtask.id,
+                "max_depth": TaskService.MAX_HIERARCHY_DEPTH,
+            })
+            chain = list(dict.fromkeys(row[0] for row in cursor.fetchall()))
+
+        assignments_by_task: dict[UUID, list[TaskAssignment]] = {}
+        for assignment in TaskAssignment.objects.filter(task_id__in=chain):
+            assignments_by_task.setdefault(assignment.task_id, []).append(assignment)
+        if not assignments_by_task:
             return
 
-        all_subtasks = list(
-            Task.objects.filter(
-                parent_id=subtask.parent_id,
-                deleted_at__isnull=True,
-            ).select_related("assignee")
+        # One GROUP BY over every child of every ancestor: own progress plus the
+        # sum/count of its assignments (its effective progress when it has any)
+        children_by_parent: dict[UUID, list[dict]] = {}
+        for row in (
+            Task.objects.filter(parent_id__in=chain)
+            .values("id", "parent_id", "assignee_id", "progress")
+            .annotate(
+                assignment_sum=Sum("assignments__individual_progress"),
+                assignment_count=Count("assignments"),
+            )
+            .order_by()
+        ):
+            children_by_parent.setdefault(row["parent_id"], []).append(row)
+
+        recomputed: dict[UUID, int] = {}  # ancestors whose effective progress changed
+        changed = []
+        now = timezone.now()
+        for ancestor_id in chain:  # bottom-up
+            per_user: dict[UUID, list[int]] = {}
+            for child in children_by_parent.get(ancestor_id, []):
+                if not child["assignee_id"]:
+                    continue
+                if child["id"] in recomputed:
+                    value = recomputed[child["id"]]
+                elif child["assignment_count"]:
+                    value = round(child["assignment_sum"] / child["assignment_count"])
+                else:
+                    value = child["progress"]
+                per_user.setdefault(child["assignee_id"], []).append(value)
+
+            assignments = assignments_by_task.get(ancestor_id, [])
+            for assignment in assignments:
+                values = per_user.get(assignment.user_id)
+                if not values:
+                    continue  # no subtasks for this user → leave manual progress intact
+                new_progress = round(sum(values) / len(values))
+                if new_progress != assignment.individual_progress:
+                    assignment.individual_progress = new_progress
+                    assignment.updated_at = now
+                    changed.append(assignment)
+            if assignments:
+                recomputed[ancestor_id] = round(
+                    sum(a.individual_progress for a in assignments) / len(assignments)
+                )
+
+        if changed:
+            TaskAssignment.objects.bulk_update(changed, ["individual_progress", "updated_at"])
+
+    # One statement for every board: join each overdue task to its board's
+    # DELAYED column, append it at the end of that column and report the move.
+    _MOVE_OVERDUE_SQL = """
+        WITH delayed AS (
+            SELECT DISTINCT ON (c.board_id) c.id, c.board_id
+            FROM columns c
+            JOIN boards b ON b.id = c.board_id AND NOT b.is_deleted
+            WHERE c.status = %(delayed)s AND NOT c.is_deleted
+            ORDER BY c.board_id, c."order", c.id
+        ),
+        overdue AS (
+            SELECT t.id, d.id AS delayed_id, d.board_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY d.id ORDER BY t.end_date, t."order", t.id
+                   ) AS rn
+            FROM tasks t
+            JOIN columns c ON c.id = t.column_id
+            JOIN delayed d ON d.board_id = c.board_id
+            WHERE NOT t.is_deleted
+              AND t.end_date IS NOT NULL
+              AND t.end_date < %(today)s
+              AND c.status NOT IN (%(delayed)s, %(completed)s)
+        ),
+        tail AS (
+            SELECT t.column_id, MAX(t."order") AS max_order
+            FROM tasks t
+            WHERE NOT t.is_deleted AND t.column_id IN (SELECT id FROM delayed)
+            GROUP BY t.column_id
         )
+        UPDATE tasks t
+        SET column_id = o.delayed_id,
+            "order" = COALESCE(tl.max_order + 1, 0) + o.rn - 1,
+            updated_at = NOW()
+        FROM overdue o
+        LEFT JOIN tail tl ON tl.column_id = o.delayed_id
+        WHERE t.id = o.id
+        RETURNING t.id, o.board_id
+    """
 
-        for assignment in parent_assignments:
-            user_subtasks = [st for st in all_subtasks if st.assignee_id == assignment.user_id]
-            if not user_subtasks:
-                continue  # no subtasks for this user → leave manual progress intact
-            # Proportional: average the progress values of each user's subtasks
-            new_progress = round(sum(st.progress for st in user_subtasks) / len(user_subtasks))
-            if new_progress != assignment.individual_progress:
-                assignment.individual_progress = new_progress
-                assignment.save(update_fields=["individual_progress", "updated_at"])
+    @staticmethod
+    def move_overdue_to_delayed(today: date) -> dict[UUID, list[UUID]]:
+        """
+        Move every task past its end_date (and not in a DELAYED/COMPLETED column)
+        to the DELAYED column of its board, across all boards, in one UPDATE.
+        Returns the moved task ids grouped by board.
+        """
+        from django.db import connection
+
+        moved: dict[UUID, list[UUID]] = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(TaskService._MOVE_OVERDUE_SQL, {
+                "today": today,
+                "delayed": ColumnStatus.DELAYED,
+                "completed": ColumnStatus.COMPLETED,
+            })
+            for task_id, board_id in cursor.fetchall():
+                moved.setdefault(board_id, []).append(task_id)
+            if moved:
+                NotificationService.create_for_overdue(
+                    [tid for ids in moved.values() for tid in ids]
+                )
+        return moved
 
     @staticmethod
     def delete(task: Task, user: User = None) -> None:
@@ -394,14 +700,64 @@ class TaskService:
         with transaction.atomic():
             task.soft_delete(deleted_by=user)
             # Recompact order for remaining tasks in the column
-            for idx, tid in enumerate(
-                column.tasks.order_by("order").values_list("id", flat=True)
-            ):
-                Task.objects.filter(id=tid).update(order=idx)
+            _compact_order(Task, "column", column.id)
+        caching.bump("board", column.board_id)
         # If this was a subtask, recalculate parent's per-user progress
         if parent_id:
             TaskService.recalculate_parent_progress(task)
 
+    # Every incomplete task upstream of a task: its dependencies, its parent, and
+    # recursively theirs. Deduplicated per (task, depth); depth-capped against cycles.
+    _BLOCKERS_SQL = """
+        WITH RECURSIVE upstream(id, depth, via) AS (
+            SELECT %(task_id)s::uuid, 0, ''
+            UNION
+            SELECT e.id, u.depth + 1, e.via
+            FROM upstream u
+            CROSS JOIN LATERAL (
+                SELECT d.to_task_id AS id, 'dependency' AS via
+                FROM tasks_dependencies d
+                JOIN tasks dt ON dt.id = d.to_task_id AND NOT dt.is_deleted
+                WHERE d.from_task_id = u.id
+                UNION ALL
+                SELECT t.parent_id, 'parent'
+                FROM tasks t
+                JOIN tasks pt ON pt.id = t.parent_id AND NOT pt.is_deleted
+                WHERE t.id = u.id
+            ) e
+            WHERE u.depth < %(max_depth)s
+        )
+        SELECT t.id, t.title, t.progress, b.depth, b.via
+        FROM (
+            SELECT DISTINCT ON (id) id, depth, via
+            FROM upstream
+            WHERE depth > 0 AND id <> %(task_id)s
+            ORDER BY id, depth, via DESC
+        ) b
+        JOIN tasks t ON t.id = b.id
+        WHERE t.progress < 100
+        ORDER BY b.depth, b.via DESC, t.title
+    """
+
+    @staticmethod
+    def blockers(task: Task) -> list[dict]:
+        """
+        Incomplete tasks that block ``task`` from advancing — direct and transitive
+        dependencies plus the parent chain and its dependencies — nearest first.
+        Single recursive query regardless of graph depth.
+        """
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(TaskService._BLOCKERS_SQL, {
+                "task_id": task.id,
+                "max_depth": TaskService.MAX_HIERARCHY_DEPTH,
+            })
+            return [
+                {"id": row[0], "title": row[1], "progress": row[2], "depth": row[3], "via": row[4]}
+                for row in cursor.fetchall()
+            ]
+
     @staticmethod
     def move(task: Task, *, column_id: UUID, new_order: int, user: User) -> Task:
         """
@@ -419,24 +775,22 @@ class TaskService:
 
         # ── Bloqueo de avance: solo aplica al mover hacia columnas posteriores ──
         if target_column.order > old_column.order:
-            # 1. Verificar tarea padre
-            if task.parent_id:
-                parent = Task.objects.only("title", "progress").get(id=task.parent_id)
-                if parent.progress < 100:
-                    raise HttpError(
-                        400,
-                        f"La tarea padre «{parent.title}» debe completarse al 100% antes de avanzar esta tarea.",
-                    )
-
-            # 2. Verificar dependencias (todas deben estar al 100%)
-            incomplete_titles = list(
-                task.dependencies
-                .filter(progress__lt=100)
-                .values_list("title", flat=True)[:4]
+            blockers = TaskService.blockers(task)
+            # 1. La tarea padre directa debe estar completa
+            parent = next(
+                (b for b in blockers if b["via"] == "parent" and b["depth"] == 1), None
             )
-            if incomplete_titles:
-                displayed = incomplete_titles[:3]
-                extra = len(incomplete_titles) - len(displayed)
+            if parent:
+                raise HttpError(
+                    400,
+                    f"La tarea padre «{parent['title']}» debe completarse al 100% "
+                    "antes de avanzar esta tarea.",
+                )
+
+            # 2. Ninguna dependencia (directa o transitiva) puede estar incompleta
+            if blockers:
+                displayed = [b["title"] for b in blockers[:3]]
+                extra = len(blockers) - len(displayed)
                 msg = "Dependencias sin completar: " + ", ".join(f"«{t}»" for t in displayed)
                 if extra > 0:
                     msg += f" y {extra} más"
@@ -483,12 +837,12 @@ class TaskService:
 
             # Recompact old column if task moved between columns
             if old_column.id != target_column.id:
-                for idx, tid in enumerate(
-                    old_column.tasks.order_by("order").values_list("id", flat=True)
-                ):
-                    Task.objects.filter(id=tid).update(order=idx)
+                _compact_order(Task, "column", old_column.id)
 
-        task.refresh_from_db()
+        task = TaskService.with_relations(Task.objects).get(id=task.id)
+        caching.bump("board", old_column.board_id)
+        if target_column.board_id != old_column.board_id:
+            caching.bump("board", target_column.board_id)
         logger.info("Task %s moved to column %s at position %d", task.id, target_column.id, new_order)
 
         # If this is a subtask, recalculate parent's per-user progress
@@ -508,6 +862,525 @@ class TaskService:
         return task
 
 
+# ─────────────────────────────────────────────────
+# Task Query Service (table view: filter / sort / group / page)
+# ─────────────────────────────────────────────────
+class TaskQueryService:
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    # sort key → (model field, nullable); "-" prefix sorts descending
+    SORT_FIELDS = {
+        "order": ("order", False),
+        "priority": ("priority_rank", False),
+        "start_date": ("start_date", True),
+        "end_date": ("end_date", True),
+        "progress": ("progress", False),
+    }
+    # group key → leading (field, descending, nullable) keys
+    GROUP_FIELDS = {
+        "column": [("column__order", False, False), ("column_id", False, False)],
+        "priority": [("priority_rank", True, False)],
+        "assignee": [("assignee_id", False, True)],
+    }
+    # group key → attribute carried on every returned task
+    GROUP_VALUE = {"column": "column_id", "priority": "priority", "assignee": "assignee_id"}
+
+    @staticmethod
+    def for_board(
+        board_id: UUID,
+        user: User,
+        *,
+        sort: str = "order",
+        group_by: str | None = "column",
+        cursor: str | None = None,
+        limit: int = DEFAULT_LIMIT,
+        **filters,
+    ) -> dict:
+        """
+        One page of a board's visible tasks, filtered, grouped and sorted in
+        the database. Rows are ordered by (group, sort key, id) and paged with
+        a keyset cursor, so deep pages cost the same as the first one. The
+        first page also carries per-group counts for the table headers.
+        """
+        from django.db.models import OrderBy
+
+        board = BoardService.get_or_404(board_id, user)
+        tasks = TaskQueryService._filter(
+            TaskService.visible_to(user, Task.objects.filter(column__board=board)), **filters
+        )
+        keys = TaskQueryService._ordering(sort, group_by)
+        limit = max(1, min(limit, TaskQueryService.MAX_LIMIT))
+
+        page = tasks.annotate(**{f"qk{i}": F(field) for i, (field, _, _) in enumerate(keys)})
+        if cursor:
+            after = TaskQueryService._decode_cursor(cursor, keys)
+            page = page.filter(TaskQueryService._after(keys, after))
+        page = TaskService.with_relations(page.order_by(*(
+            OrderBy(F(f"qk{i}"), descending=desc, nulls_last=nullable or None)
+            for i, (_, desc, nullable) in enumerate(keys)
+        )))
+
+        items = list(page[: limit + 1])
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = TaskQueryService._encode_cursor(
+                [getattr(last, f"qk{i}") for i in range(len(keys))]
+            )
+        if group_by:
+            attr = TaskQueryService.GROUP_VALUE[group_by]
+            for task in items:
+                value = getattr(task, attr)
+                task.group = str(value) if value is not None else None
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "groups": TaskQueryService._groups(board, tasks, group_by) if not cursor else None,
+        }
+
+    # "My work" due-date buckets (disjoint); "week" runs to the coming Sunday
+    DUE_BUCKETS = ("overdue", "today", "week")
+
+    @staticmethod
+    def for_user(
+        user: User,
+        *,
+        due: str | None = None,
+        include_completed: bool = False,
+        cursor: str | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> dict:
+        """
+        The caller's tasks across every workspace they can access — as
+        assignee or collaborator — ordered by due date (undated last).
+        Keyset-paginated like ``for_board``; the first page also carries the
+        open-task count of each due bucket, whatever ``due`` selects.
+        """
+        from django.db.models import Count, Exists, OuterRef, Q
+        from django.utils import timezone
+
+        # UNION of the two index-only lookups: (assignee_id, end_date) and
+        # task_assignments(user_id, task_id); OR-ing them defeats both indexes
+        mine = (
+            Task.objects.filter(assignee=user).order_by().values("id")
+            .union(TaskAssignment.objects.filter(user=user).order_by().values("task_id"))
+        )
+        tasks = Task.objects.filter(id__in=mine).filter(
+            Q(column__board__workspace__owner=user)
+            | Exists(Workspace.members.through.objects.filter(
+                workspace_id=OuterRef("column__board__workspace_id"), user=user
+            )),
+            column__is_deleted=False,
+            column__board__is_deleted=False,
+            column__board__workspace__is_deleted=False,
+        )
+        if not include_completed:
+            tasks = tasks.filter(progress__lt=100)
+
+        buckets = TaskQueryService._due_buckets(timezone.localdate())
+        # Bucket counts cover every bucket whichever one is shown, so they can label the tabs
+        unfiltered = tasks
+        if due:
+            if due not in buckets:
+                raise HttpError(400, f"Vencimiento no válido: {due}")
+            tasks = tasks.filter(buckets[due])
+
+        keys = [("end_date", False, True), ("id", False, False)]
+        limit = max(1, min(limit, TaskQueryService.MAX_LIMIT))
+        page = tasks.annotate(qk0=F("end_date"), qk1=F("id"))
+        if cursor:
+            after = TaskQueryService._decode_cursor(cursor, keys)
+            page = page.filter(TaskQueryService._after(keys, after))
+        page = TaskService.with_relations(
+            page.order_by(F("qk0").asc(nulls_last=True), "qk1").select_related("column__board")
+        )
+
+        items = list(page[: limit + 1])
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = TaskQueryService._encode_cursor([items[-1].qk0, items[-1].qk1])
+
+        counts = None
+        if not cursor:
+            open_tasks = unfiltered.filter(progress__lt=100)
+            counts = open_tasks.aggregate(
+                **{name: Count("id", filter=q) for name, q in buckets.items()}
+            )
+        return {"items": items, "next_cursor": next_cursor, "counts": counts}
+
+    @staticmethod
+    def _due_buckets(today: date) -> dict:
+        from datetime import timedelta
+
+        from django.db.models import Q
+
+        sunday = today + timedelta(days=6 - today.weekday())
+        return {
+            "overdue": Q(end_date__lt=today, progress__lt=100),
+            "today": Q(end_date=today),
+            "week": Q(end_date__gt=today, end_date__lte=sunday),
+        }
+
+    @staticmethod
+    def _filter(
+        tasks,
+        *,
+        assignee_id: UUID | None = None,
+        priority: list[str] | None = None,
+        status: list[str] | None = None,
+        column_id: UUID | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        overdue: bool | None = None,
+        parent_id: UUID | None = None,
+    ):
+        from django.db.backends.postgresql.psycopg_any import DateRange
+        from django.db.models import Exists, OuterRef, Q
+
+        # Subtasks only appear when their parent is asked for, as on the board
+        if parent_id:
+            tasks = tasks.filter(parent_id=parent_id)
+        else:
+            tasks = tasks.filter(parent__isnull=True)
+        if assignee_id:
+            tasks = tasks.filter(
+                Q(assignee_id=assignee_id)
+                | Exists(TaskAssignment.objects.filter(task=OuterRef("pk"), user_id=assignee_id))
+            )
+        if priority:
+            tasks = tasks.filter(priority__in=priority)
+        if status:
+            tasks = tasks.filter(column__status__in=status)
+        if column_id:
+            tasks = tasks.filter(column_id=column_id)
+        if date_from or date_to:
+            if date_from and date_to and date_to < date_from:
+                raise HttpError(400, "La fecha final debe ser posterior a la inicial.")
+            tasks = tasks.filter(start_date__isnull=False).annotate(span=task_date_span()).filter(
+                span__overlap=DateRange(date_from, date_to, "[]")
+            )
+        if overdue is not None:
+            late = Q(end_date__lt=date.today(), progress__lt=100)
+            tasks = tasks.filter(late) if overdue else tasks.exclude(late)
+        return tasks
+
+    @staticmethod
+    def _ordering(sort: str, group_by: str | None) -> list[tuple[str, bool, bool]]:
+        descending = sort.startswith("-")
+        if sort.lstrip("-") not in TaskQueryService.SORT_FIELDS:
+            raise HttpError(400, f"Orden no válido: {sort}")
+        if group_by and group_by not in TaskQueryService.GROUP_FIELDS:
+            raise HttpError(400, f"Agrupación no válida: {group_by}")
+        field, nullable = TaskQueryService.SORT_FIELDS[sort.lstrip("-")]
+        keys = list(TaskQueryService.GROUP_FIELDS[group_by]) if group_by else []
+        return [*keys, (field, descending, nullable), ("id", False, False)]
+
+    @staticmethod
+    def _after(keys, values):
+        """
+        Keyset predicate "row comes after ``values``" for a mixed-direction,
+        NULLS LAST ordering: k0 > v0 OR (k0 = v0 AND k1 > v1) OR …
+        """
+        import operator
+
+        from django.db.models import Q
+
+        clauses, equal = [], Q()
+        for i, ((_, desc, _), value) in enumerate(zip(keys, values, strict=True)):
+            name = f"qk{i}"
+            if value is None:
+                # Nulls sort last, so only other nulls can follow
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+            beyond = Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+            clauses.append(equal & (beyond | Q(**{f"{name}__isnull": True})))
+            equal &= Q(**{name: value})
+        return functools.reduce(operator.or_, clauses)
+
+    @staticmethod
+    def _groups(board: Board, tasks, group_by: str | None) -> list[dict] | None:
+        """Task count per group over the whole filtered result (first page only)."""
+        from django.db.models import Count
+
+        from .models import Priority
+
+        if not group_by:
+            return None
+        attr = TaskQueryService.GROUP_VALUE[group_by]
+        counts = dict(
+            tasks.order_by().values(attr).annotate(count=Count("id")).values_list(attr, "count")
+        )
+        if group_by == "column":
+            columns = board.columns.order_by("order", "id")
+            return [
+                {"key": str(c.id), "label": c.name, "count": counts.get(c.id, 0)} for c in columns
+            ]
+        if group_by == "priority":
+            return [
+                {"key": value, "label": label, "count": counts[value]}
+                for value, label in reversed(Priority.choices)
+                if value in counts
+            ]
+        users = {u.id: u for u in User.objects.filter(id__in=[k for k in counts if k])}
+        groups = [
+            {
+                "key": str(uid),
+                "label": users[uid].get_full_name() or users[uid].email,
+                "count": counts[uid],
+            }
+            for uid in sorted(users)
+        ]
+        if None in counts:
+            groups.append({"key": None, "label": "Sin asignar", "count": counts[None]})
+        return groups
+
+    @staticmethod
+    def _encode_cursor(values: list) -> str:
+        import base64
+        import json
+
+        return base64.urlsafe_b64encode(
+            json.dumps(values, default=str, separators=(",", ":")).encode()
+        ).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, keys) -> list:
+        import base64
+        import binascii
+        import json
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise HttpError(400, "Cursor de paginación no válido.") from exc
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise HttpError(400, "Cursor de paginación no válido.")
+        return values
+
+
+# ─────────────────────────────────────────────────
+# Timeline Service (Gantt windows)
+# ─────────────────────────────────────────────────
+class TimelineService:
+    # Widest window a single request may ask for
+    MAX_WINDOW_DAYS = 2 * 366
+
+    @staticmethod
+    def for_board(board_id: UUID, user: User, *, start: date, end: date) -> dict:
+        board = BoardService.get_or_404(board_id, user)
+        tasks = Task.objects.using(dbrouting.read_alias(user))
+        return TimelineService._window(
+            TaskService.visible_to(user, tasks.filter(column__board=board)),
+            start=start,
+            end=end,
+        )
+
+    @staticmethod
+    def for_workspace(workspace_id: UUID, user: User, *, start: date, end: date) -> dict:
+        workspace = WorkspaceService.get_or_404(workspace_id, user)
+        tasks = Task.objects.using(dbrouting.read_alias(user))
+        return TimelineService._window(
+            TaskService.visible_to(user, tasks.filter(column__board__workspace=workspace)),
+            start=start,
+            end=end,
+        )
+
+    @staticmethod
+    def _window(tasks, *, start: date, end: date) -> dict:
+        """
+        Minimal rows for tasks whose date span overlaps [start, end] (GiST
+        range scan), plus the dependency edges between them. Two queries.
+        """
+        from django.db.backends.postgresql.psycopg_any import DateRange
+
+        if end < start:
+            raise HttpError(400, "La fecha final debe ser posterior a la inicial.")
+        if (end - start).days > TimelineService.MAX_WINDOW_DAYS:
+            raise HttpError(400, "El rango de fechas no puede superar los dos años.")
+
+        rows = list(
+            tasks.filter(start_date__isnull=False)
+            .annotate(span=task_date_span(), board_id=F("column__board_id"))
+            .filter(span__overlap=DateRange(start, end, "[]"))
+            .order_by("column__order", "order")
+            .values(
+                "id", "title", "board_id", "column_id", "parent_id",
+                "priority", "progress", "start_date", "end_date",
+            )
+        )
+        ids = [row["id"] for row in rows]
+        dependencies = (
+            Task.dependencies.through.objects.using(tasks.db)
+            .filter(from_task_id__in=ids, to_task_id__in=ids)
+            .order_by()
+            .values("from_task_id", "to_task_id")
+        ) if ids else []
+        return {
+            "start": start,
+            "end": end,
+            "tasks": rows,
+            "dependencies": [
+                {"task_id": d["from_task_id"], "depends_on_id": d["to_task_id"]}
+                for d in dependencies
+            ],
+        }
+
+
+# ─────────────────────────────────────────────────
+# Search Service (Postgres full-text, Spanish)
+# ─────────────────────────────────────────────────
+class SearchService:
+    # Must match the configuration used by the search_vector triggers
+    CONFIG = "spanish"
+    MAX_LIMIT = 50
+    # Highlight markers: control characters survive ts_headline and are swapped
+    # for <mark> only after the surrounding user text has been HTML-escaped.
+    _START, _STOP = "\x02", "\x03"
+    _HEADLINE_OPTIONS = "StartSel=\x02, StopSel=\x03, MaxFragments=2, MaxWords=20, MinWords=5"
+
+    # Same rule as TaskService.visible_to, for a task aliased ``t``
+    _VISIBLE_TASK_SQL = """
+              NOT t.is_deleted
+              AND t.column_id IN (SELECT id FROM visible_columns)
+              AND (%(privileged)s
+                   OR t.assignee_id = %(user_id)s
+                   OR t.created_by_id = %(user_id)s
+                   OR EXISTS (SELECT 1 FROM task_assignments a
+                              WHERE a.task_id = t.id AND a.user_id = %(user_id)s))"""
+
+    # Tasks and comments matching the query on boards the user can see, ranked
+    # and keyset-paginated on (rank DESC, id); headlines only for the page rows.
+    _SEARCH_SQL = f"""
+        WITH q AS (
+            SELECT websearch_to_tsquery(%(config)s::regconfig, %(q)s) AS query
+        ),
+        visible_columns AS (
+            SELECT c.id, b.id AS board_id, b.name AS board_name
+            FROM columns c
+            JOIN boards b ON b.id = c.board_id AND NOT b.is_deleted
+            JOIN workspaces w ON w.id = b.workspace_id AND NOT w.is_deleted
+            WHERE NOT c.is_deleted
+              AND (w.owner_id = %(user_id)s OR EXISTS (
+                    SELECT 1 FROM workspaces_members m
+                    WHERE m.workspace_id = w.id AND m.user_id = %(user_id)s))
+        ),
+        hits AS (
+            SELECT 'task' AS kind, t.id, t.id AS task_id,
+                   ts_rank(t.search_vector, q.query)::float8 AS rank
+            FROM tasks t, q
+            WHERE t.search_vector @@ q.query
+              AND {_VISIBLE_TASK_SQL}
+            UNION ALL
+            SELECT 'comment', cm.id, cm.task_id,
+                   ts_rank(cm.search_vector, q.query)::float8
+            FROM task_comments cm
+            JOIN tasks t ON t.id = cm.task_id, q
+            WHERE cm.search_vector @@ q.query
+              AND {_VISIBLE_TASK_SQL}
+        ),
+        page AS (
+            SELECT * FROM hits
+            WHERE %(after_id)s::uuid IS NULL
+               OR (-rank, id) > (-%(after_rank)s::float8, %(after_id)s::uuid)
+            ORDER BY rank DESC, id
+            LIMIT %(limit)s
+        )
+        SELECT p.kind, p.id, p.task_id, t.title, vc.board_id, vc.board_name, p.rank,
+               ts_headline(
+                   %(config)s::regconfig,
+                   CASE WHEN p.kind = 'task'
+                        THEN t.title || ' ' || t.description
+                        ELSE cm.content END,
+                   q.query,
+                   %(options)s
+               )
+        FROM page p
+        CROSS JOIN q
+        JOIN tasks t ON t.id = p.task_id
+        JOIN visible_columns vc ON vc.id = t.column_id
+        LEFT JOIN task_comments cm ON p.kind = 'comment' AND cm.id = p.id
+        ORDER BY p.rank DESC, p.id
+    """  # noqa: S608 — constant fragment
+
+    @staticmethod
+    def search(user: User, q: str, *, limit: int = 20, cursor: str | None = None) -> dict:
+        """
+        Ranked full-text search over task titles/descriptions and comments in
+        every workspace the user owns or belongs to. Returns one page and an
+        opaque ``next_cursor`` (None on the last page).
+        """
+        from django.db import connection
+
+        q = q.strip()
+        if not q:
+            return {"items": [], "next_cursor": None}
+        limit = max(1, min(limit, SearchService.MAX_LIMIT))
+        after_rank, after_id = SearchService._decode_cursor(cursor) if cursor else (None, None)
+
+        with connection.cursor() as db:
+            db.execute(SearchService._SEARCH_SQL, {
+                "config": SearchService.CONFIG,
+                "q": q,
+                "user_id": user.id,
+                "privileged": TaskService.is_privileged(user),
+                "after_rank": after_rank,
+                "after_id": after_id,
+                "limit": limit + 1,
+                "options": SearchService._HEADLINE_OPTIONS,
+            })
+            rows = db.fetchall()
+
+        items = [
+            {
+                "type": kind,
+                "id": row_id,
+                "task_id": task_id,
+                "task_title": title,
+                "board_id": board_id,
+                "board_name": board_name,
+                "rank": rank,
+                "headline": SearchService._highlight(headline),
+            }
+            for kind, row_id, task_id, title, board_id, board_name, rank, headline in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = SearchService._encode_cursor(last["rank"], last["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _highlight(headline: str) -> str:
+        from django.utils.html import escape
+
+        return (
+            escape(headline)
+            .replace(SearchService._START, "<mark>")
+            .replace(SearchService._STOP, "</mark>")
+        )
+
+    @staticmethod
+    def _encode_cursor(rank: float, row_id: UUID) -> str:
+        import base64
+
+        return base64.urlsafe_b64encode(f"{rank!r}|{row_id}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[float, UUID]:
+        import base64
+        import binascii
+
+        try:
+            rank, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return float(rank), UUID(row_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise HttpError(400, "Cursor de búsqueda no válido.") from exc
+
+
 # ─────────────────────────────────────────────────
 # Comment Service
 # ─────────────────────────────────────────────────
@@ -536,17 +1409,23 @@ class CommentService:
 
     @staticmethod
     def create_with_file(user: User, task: Task, content: str, file=None) -> TaskComment:
-        """Create a comment with an optional file attachment sent via email."""
-        file_data = None
-        file_name = None
-        file_size = None
-        file_content_type = None
+        """
+        Create a comment with an optional file attachment.
+        The file is streamed to content-addressed storage; emails carry a link.
+        """
+        from . import storage
 
+        attachment = None
         if file is not None:
-            file_data = file.read()
-            file_name = file.name
-            file_size = len(file_data)
-            file_content_type = getattr(file, "content_type", "application/octet-stream")
+            sha256, size = storage.save_upload(file)
+            attachment, _ = Attachment.objects.get_or_create(
+                sha256=sha256,
+                defaults={
+                    "size": size,
+                    "content_type": getattr(file, "content_type", None)
+                    or "application/octet-stream",
+                },
+            )
 
         comment = TaskComment.objects.create(
             task=task,
@@ -554,31 +1433,38 @@ class CommentService:
             author_email=user.email,
             content=content,
             source=CommentSource.APP,
-            attachment_filename=file_name,
-            attachment_size=file_size,
+            attachment=attachment,
+            attachment_filename=file.name if attachment else None,
+            attachment_size=attachment.size if attachment else None,
         )
         NotificationService.create_for_comment(comment, user)
         try:
-            CommentService._send_comment_email(
-                comment, user,
-                file_data=file_data,
-                file_name=file_name,
-                file_content_type=file_content_type,
-            )
+            CommentService._send_comment_email(comment, user)
         except Exception:
             logger.warning("Could not send comment email with file for task %s", task.id)
         return comment
 
     @staticmethod
-    def _send_comment_email(
-        comment: TaskComment,
-        commenter: User,
-        file_data: bytes | None = None,
-        file_name: str | None = None,
-        file_content_type: str | None = None,
-    ):
-        from django.core.mail import EmailMultiAlternatives
-        from django.conf import settings
+    def get_attachment_or_404(comment_id: UUID, user: User | None = None) -> TaskComment:
+        """
+        Comment with a stored attachment. With ``user`` the caller must belong to
+        the task's workspace; without it, access was granted by a signed link.
+        """
+        from django.db.models import Q
+
+        qs = TaskComment.objects.select_related("attachment").filter(
+            attachment__isnull=False
+        )
+        if user is not None:
+            qs = qs.filter(
+                Q(task__column__board__workspace__owner=user)
+                | Q(task__column__board__workspace__members=user)
+            ).distinct()
+        return get_object_or_404(qs, id=comment_id)
+
+    @staticmethod
+    def _send_comment_email(comment: TaskComment, commenter: User):
+        from . import emails, storage
 
         # Re-fetch task with all needed relations to build the email
         task = Task.objects.select_related(
@@ -597,33 +1483,26 @@ class CommentService:
         if not recipients:
             return
 
-        # Reply-To via Cloudmailin plus-addressing
-        inbound_addr = getattr(settings, "INBOUND_EMAIL_ADDRESS", "")
-        reply_to = None
-        if inbound_addr and "@" in inbound_addr:
-            local, domain = inbound_addr.split("@", 1)
-            reply_to = f"{local}+task-{task.id}@{domain}"
-
         sender_name = commenter.get_full_name() or commenter.email
         board_name = task.column.board.name
-        subject = f"[{board_name}] Nuevo comentario: {task.title}"
         body = (
             f'{sender_name} comentó en "{task.title}":\n\n'
             f"{comment.content}\n\n"
-            f"Responde a este email para agregar un comentario a la tarea."
         )
-
-        for recipient in recipients:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=body,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[recipient],
-                reply_to=[reply_to] if reply_to else [],
+        if comment.attachment_id:
+            body += (
+                f"Archivo adjunto: {comment.attachment_filename}\n"
+                f"{storage.download_url(comment.id)}\n\n"
             )
-            if file_data and file_name:
-                msg.attach(file_name, file_data, file_content_type or "application/octet-stream")
-            msg.send(fail_silently=True)
+        body += "Responde a este email para agregar un comentario a la tarea."
+
+        emails.fan_out(
+            recipients,
+            subject=f"[{board_name}] Nuevo comentario: {task.title}",
+            body=body,
+            # Reply-To via Cloudmailin plus-addressing
+            reply_to=emails.reply_to_for(task.id),
+        )
 
     @staticmethod
     def create_from_email(task: Task, sender_email: str, content: str, author=None) -> TaskComment:
@@ -636,17 +1515,157 @@ class CommentService:
         )
 
 
+# ─────────────────────────────────────────────────
+# Inbound Email Service (Cloudmailin webhook → comment)
+# ─────────────────────────────────────────────────
+class InboundEmailService:
+    @staticmethod
+    def idempotency_key(data: dict, raw_body: bytes) -> str:
+        """Message-ID when Cloudmailin provides it, else a hash of the raw payload."""
+        import hashlib
+
+        headers = data.get("headers") or {}
+        for name in ("Message-ID", "Message-Id", "message_id"):
+            message_id = headers.get(name)
+            if isinstance(message_id, list):
+                message_id = message_id[0] if message_id else ""
+            if message_id:
+                return f"msgid:{str(message_id).strip()[:240]}"
+        return f"sha256:{hashlib.sha256(raw_body).hexdigest()}"
+
+    @staticmethod
+    def receive(data: dict, raw_body: bytes) -> tuple[InboundEmail, bool]:
+        """
+        Persist the raw payload once per idempotency key and queue processing.
+        Returns ``(inbound, created)``; retries of the same email are not re-queued.
+        """
+        key = InboundEmailService.idempotency_key(data, raw_body)
+        with transaction.atomic():
+            inbound, created = InboundEmail.objects.get_or_create(
+                idempotency_key=key, defaults={"payload": data}
+            )
+            if created:
+                transaction.on_commit(lambda: InboundEmailService.enqueue(inbound.id))
+        return inbound, created
+
+    @staticmethod
+    def enqueue(inbound_id: UUID) -> None:
+        try:
+            from apps.projects.tasks import process_inbound_email
+            process_inbound_email.delay(str(inbound_id))
+        except Exception as exc:
+            # Row stays PENDING and is picked up by requeue_pending_inbound_emails
+            logger.warning("Could not enqueue inbound email %s: %s", inbound_id, exc)
+
+    @staticmethod
+    def process(inbound_id: UUID) -> InboundEmail | None:
+        """
+        Turn a stored payload into a TaskComment. The row is locked and must still
+        be PENDING, so concurrent or repeated deliveries create one comment at most.
+        """
+        import re
+
+        from django.utils import timezone
+
+        with transaction.atomic():
+            inbound = (
+                InboundEmail.objects.select_for_update()
+                .filter(id=inbound_id, status=InboundEmailStatus.PENDING)
+                .first()
+            )
+            if inbound is None:
+                return None
+
+            def finish(status, detail="", comment=None):
+                inbound.status = status
+                inbound.detail = detail
+                inbound.comment = comment
+                inbound.processed_at = timezone.now()
+                inbound.save(update_fields=[
+                    "status", "detail", "comment", "processed_at", "updated_at",
+                ])
+                return inbound
+
+            data = inbound.payload
+            envelope = data.get("envelope", {})
+            sender = envelope.get("from", "").strip()
+            to = envelope.get("to", "").strip()
+
+            # Prefer reply_plain (Cloudmailin strips quoted text automatically)
+            text = (data.get("reply_plain") or data.get("plain") or "").strip()
+
+            if not sender or not to:
+                logger.warning("Inbound email: missing sender or to fields")
+                return finish(InboundEmailStatus.IGNORED, "missing fields")
+
+            # Extract task UUID from To address: task-{uuid}@reply.stwards.com
+            match = re.search(r"task-([0-9a-f-]{36})", to)
+            try:
+                task_id = UUID(match.group(1)) if match else None
+            except ValueError:  # 36 of those characters, but not a UUID
+                task_id = None
+            if task_id is None:
+                logger.warning("Inbound email: no task UUID in To: %s", to)
+                return finish(InboundEmailStatus.IGNORED, "no task UUID in address")
+
+            task = Task.objects.filter(id=task_id).first()
+            if task is None:
+                logger.warning("Inbound email: task %s not found", task_id)
+                return finish(InboundEmailStatus.IGNORED, "task not found")
+
+            # Basic cleanup if reply_plain wasn't available
+            clean_text = text.split("\n---")[0].split("\n> ")[0].strip()
+            if not clean_text:
+                logger.info("Inbound email: empty content for task %s", task_id)
+                return finish(InboundEmailStatus.IGNORED, "empty content")
+
+            # Try to match sender to a registered User
+            author = User.objects.filter(email=sender).first()
+            comment = CommentService.create_from_email(
+                task, sender, clean_text[:10000], author=author
+            )
+            if author:
+                NotificationService.create_for_comment(comment, author)
+            finish(InboundEmailStatus.PROCESSED, comment=comment)
+
+        if author:
+            try:
+                CommentService._send_comment_email(comment, author)
+            except Exception:
+                logger.warning("Could not send comment email for task %s", task_id)
+
+        logger.info("Inbound email: comment created for task %s from %s", task_id, sender)
+        return inbound
+
+
 # ─────────────────────────────────────────────────
 # Notification Service
 # ─────────────────────────────────────────────────
 class NotificationService:
     @staticmethod
     def list_for_user(user: User):
-        return Notification.objects.filter(user=user).select_related("task")[:50]
+        return NotificationService._latest(user, dbrouting.read_alias(user))
 
     @staticmethod
     def unread_count(user: User) -> int:
-        return Notification.objects.filter(user=user, read=False).count()
+        return NotificationService._unread(user, dbrouting.read_alias(user)).count()
+
+    @staticmethod
+    async def alist_for_user(user: User) -> list[Notification]:
+        using = await dbrouting.aread_alias(user)
+        return [n async for n in NotificationService._latest(user, using)]
+
+    @staticmethod
+    async def aunread_count(user: User) -> int:
+        return await NotificationService._unread(user, await dbrouting.aread_alias(user)).acount()
+
+    @staticmethod
+    def _latest(user: User, using: str):
+        return Notification.objects.using(using).filter(user=user).select_related("task")[:50]
+
+    @staticmethod
+    def _unread(user: User, using: str):
+        return Notification.objects.using(using).filter(user=user, read=False)
 
     @staticmethod
     def mark_read(notification_id, user: User) -> Notification:
@@ -722,3 +1741,36 @@ class NotificationService:
             )
             for uid in recipients
         ])
+
+    @staticmethod
+    def create_for_overdue(task_ids: list[UUID]) -> list[Notification]:
+        """
+        One coalesced notification per user for tasks moved to DELAYED by the
+        daily overdue check, linked to that user's most overdue task.
+        """
+        tasks = {
+            t.id: t
+            for t in Task.objects.filter(id__in=task_ids).only(
+                "id", "title", "end_date", "assignee_id", "created_by_id"
+            )
+        }
+        per_user: dict[UUID, set[UUID]] = {}
+        for task in tasks.values():
+            for uid in (task.assignee_id, task.created_by_id):
+                if uid:
+                    per_user.setdefault(uid, set()).add(task.id)
+        for task_id, uid in TaskAssignment.objects.filter(
+            task_id__in=task_ids
+        ).values_list("task_id", "user_id"):
+            per_user.setdefault(uid, set()).add(task_id)
+
+        notifications = []
+        for uid, ids in per_user.items():
+            first = min((tasks[tid] for tid in ids), key=lambda t: (t.end_date, str(t.id)))
+            message = f'"{first.title}" movida a Retrasado por vencimiento'
+            if len(ids) > 1:
+                message += f" (y {len(ids) - 1} tarea(s) más)"
+            notifications.append(Notification(
+                user_id=uid, task=first, type=NotificationType.MOVED, message=message,
+            ))
+        return Notification.objects.bulk_create(notifications)
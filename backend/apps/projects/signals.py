@@ -2,7 +2,6 @@ import logging
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import TaskAssignment
-from .tasks import send_assignment_notification
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +9,9 @@ logger = logging.getLogger(__name__)
 def trigger_assignment_notification(sender, instance, created, **kwargs):
     """Sends an email notification when a new assignment is created."""
     if created:
+        # Imported here so loading the app does not pull in Celery and the email templates
+        from .tasks import send_assignment_notification
+
         try:
             send_assignment_notification(str(instance.id))
         except Exception as exc:
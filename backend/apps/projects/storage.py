@@ -0,0 +1,138 @@
+"""
+Content-addressed local storage for comment attachments.
+
+Uploads are streamed chunk by chunk into ATTACHMENTS_ROOT/tmp while being
+hashed, then moved into ATTACHMENTS_ROOT/objects under a path derived from the
+SHA-256 digest, so identical files are stored once. Downloads are handed off to
+nginx via X-Accel-Redirect (which also serves Range requests); without nginx we
+fall back to a streamed FileResponse.
+
+nginx aliases only ``objects/`` — partial uploads are never addressable — and
+runs as another user in its own container, so stored files and their shard
+directories are made world-readable whatever the worker's umask.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+from ninja.security import APIKeyQuery
+
+logger = logging.getLogger(__name__)
+
+_LINK_SALT = "projects.attachment-link"
+_FILE_MODE = 0o644
+_DIR_MODE = 0o755
+
+
+def _root() -> Path:
+    return Path(settings.ATTACHMENTS_ROOT)
+
+
+def relative_path(sha256: str) -> str:
+    """Sharded path for a digest: ab/cd/abcd…"""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def absolute_path(sha256: str) -> Path:
+    return _root() / "objects" / relative_path(sha256)
+
+
+def _make_dirs(directory: Path) -> None:
+    """Create ``directory`` and its missing parents, each readable by nginx."""
+    if directory.is_dir():
+        return
+    _make_dirs(directory.parent)
+    directory.mkdir(exist_ok=True)
+    directory.chmod(_DIR_MODE)
+
+
+def save_upload(file) -> tuple[str, int]:
+    """
+    Stream an uploaded file into storage and return ``(sha256, size)``.
+    The whole file is never held in memory; duplicates are discarded.
+    """
+    tmp_dir = _root() / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            os.fchmod(out.fileno(), _FILE_MODE)  # mkstemp creates it 0600
+            for chunk in file.chunks():
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        target = absolute_path(sha256)
+        if target.exists():
+            logger.debug("Attachment %s already stored — deduplicated", sha256)
+        else:
+            _make_dirs(target.parent)
+            os.replace(tmp_name, target)
+            tmp_name = None
+    finally:
+        if tmp_name:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    return sha256, size
+
+
+def download_response(sha256: str, filename: str, content_type: str) -> HttpResponse:
+    """Build the response for an attachment download."""
+    prefix = getattr(settings, "ATTACHMENTS_X_ACCEL_PREFIX", "")
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + relative_path(sha256)
+        response["Content-Disposition"] = content_disposition_header(True, filename)
+        return response
+
+    # Development fallback: Django streams the file itself (no Range support)
+    return FileResponse(
+        open(absolute_path(sha256), "rb"),  # noqa: SIM115 — closed by FileResponse
+        as_attachment=True,
+        filename=filename,
+        content_type=content_type,
+    )
+
+
+def make_link_token(comment_id) -> str:
+    """Signed token that grants download access to one comment's attachment."""
+    return signing.dumps(str(comment_id), salt=_LINK_SALT)
+
+
+def read_link_token(token: str) -> str | None:
+    """Return the comment id a token grants access to, or None if invalid/expired."""
+    max_age = getattr(settings, "ATTACHMENT_LINK_MAX_AGE", 7 * 24 * 3600)
+    try:
+        return signing.loads(token, salt=_LINK_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+
+class AttachmentLinkAuth(APIKeyQuery):
+    """Ninja auth for signed email links: ``?token=`` resolves to a comment id."""
+
+    param_name = "token"
+
+    def authenticate(self, request, key: str | None) -> str | None:
+        if not key:
+            return None
+        return read_link_token(key)
+
+
+def download_url(comment_id) -> str:
+    """Absolute, signed download URL suitable for emails."""
+    backend_url = getattr(settings, "BACKEND_URL", "").rstrip("/")
+    return (
+        f"{backend_url}/api/v1/comments/{comment_id}/attachment?token={make_link_token(comment_id)}"
+    )
@@ -1,39 +1,59 @@
 import logging
 
 from celery import shared_task
-from django.core.mail import send_mail, EmailMultiAlternatives
+from celery.signals import worker_process_init
 from django.conf import settings
-from django.template.loader import render_to_string
+
+from config.celery import app  # noqa: F401 — binds the shared tasks to the project app
+
+from . import emails
 from .models import Task, TaskAssignment
 
 logger = logging.getLogger(__name__)
 
+
+@worker_process_init.connect
+def warm_email_templates(**kwargs):
+    """Compile email templates once per worker process, before the first task."""
+    try:
+        emails.warm_template_cache()
+    except Exception as exc:
+        logger.warning("Could not warm email template cache: %s", exc)
+
+
 @shared_task
 def send_assignment_notification(assignment_id):
     """Sends an HTML email notification to the assigned user."""
     try:
-        assignment = TaskAssignment.objects.select_related(
-            'task', 'task__column__board', 'user'
-        ).get(id=assignment_id)
-        task = assignment.task
-        user = assignment.user
+        assignment = TaskAssignment.objects.only("task_id", "user_id").get(id=assignment_id)
+    except TaskAssignment.DoesNotExist:
+        return
+    send_assignment_notifications(str(assignment.task_id), [str(assignment.user_id)])
 
-        frontend_url = getattr(settings, "FRONTEND_URL", "").rstrip("/")
-        task_url = f"{frontend_url}/board/{task.column.board.id}" if frontend_url else ""
 
-        inbound_addr = getattr(settings, "INBOUND_EMAIL_ADDRESS", "")
-        reply_to = None
-        if inbound_addr and "@" in inbound_addr:
-            local, domain = inbound_addr.split("@", 1)
-            reply_to = f"{local}+task-{task.id}@{domain}"
+@shared_task
+def send_assignment_notifications(task_id, user_ids):
+    """
+    Sends the assignment email to every newly assigned user of a task.
+    The HTML is rendered once per task; only the greeting is personalized.
+    """
+    try:
+        task = Task.objects.select_related("column__board").get(id=task_id)
+        users = list(
+            TaskAssignment.objects.filter(task_id=task_id, user_id__in=user_ids)
+            .values_list("user__email", "user__first_name")
+        )
+        if not users:
+            return
 
+        frontend_url = getattr(settings, "FRONTEND_URL", "").rstrip("/")
+        task_url = f"{frontend_url}/board/{task.column.board.id}" if frontend_url else ""
         end_date_str = task.end_date.strftime("%d/%m/%Y") if task.end_date else None
-        nombre = user.first_name or user.email
 
-        subject = f"Nueva tarea asignada: {task.title}"
+        board_name = task.column.board.name
         plain_body = (
-            f"Hola {nombre},\n\n"
-            f"Te han asignado a la tarea '{task.title}' en el tablero '{task.column.board.name}'.\n\n"
+            f"Hola {emails.RECIPIENT_NAME_PLACEHOLDER},\n\n"
+            f"Te han asignado a la tarea '{task.title}' en el tablero '{board_name}'.\n\n"
         )
         if end_date_str:
             plain_body += f"Fecha límite: {end_date_str}\n\n"
@@ -42,28 +62,27 @@ def send_assignment_notification(assignment_id):
         plain_body += "¡Buen trabajo!"
 
         context = {
-            "user": user,
+            "recipient_name": emails.RECIPIENT_NAME_PLACEHOLDER,
             "task": task,
-            "board_name": task.column.board.name,
+            "board_name": board_name,
             "task_url": task_url,
             "end_date": end_date_str,
         }
-        html_body = render_to_string("projects/email/assignment_notification.html", context)
+        html_body = emails.render("projects/email/assignment_notification.html", context)
 
-        msg = EmailMultiAlternatives(
-            subject=subject,
+        emails.fan_out(
+            [email for email, _ in users],
+            subject=f"Nueva tarea asignada: {task.title}",
             body=plain_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[user.email],
-            reply_to=[reply_to] if reply_to else [],
+            html_body=html_body,
+            reply_to=emails.reply_to_for(task.id),
+            personalize={email: first_name or email for email, first_name in users},
         )
-        msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=True)
 
-    except TaskAssignment.DoesNotExist:
+    except Task.DoesNotExist:
         pass
     except Exception as exc:
-        logger.warning("send_assignment_notification failed: %s", exc)
+        logger.warning("send_assignment_notifications failed for task %s: %s", task_id, exc)
 
 
 @shared_task
@@ -91,15 +110,6 @@ def send_task_moved_email(task_id, old_column_name, new_column_name, mover_email
         if not recipients:
             return
 
-        # Build Reply-To using Cloudmailin plus-addressing:
-        # cca91010c6927746fa43+task-{uuid}@cloudmailin.net
-        inbound_addr = getattr(settings, "INBOUND_EMAIL_ADDRESS", "")
-        if inbound_addr and "@" in inbound_addr:
-            local, domain = inbound_addr.split("@", 1)
-            reply_to = f"{local}+task-{task.id}@{domain}"
-        else:
-            reply_to = None
-
         frontend_url = getattr(settings, "FRONTEND_URL", "").rstrip("/")
         task_url = f"{frontend_url}/board/{task.column.board.id}" if frontend_url else ""
 
@@ -111,19 +121,18 @@ def send_task_moved_email(task_id, old_column_name, new_column_name, mover_email
             "board_name": task.column.board.name,
             "task_url": task_url,
         }
-        html_body = render_to_string("projects/email/task_moved.html", context)
-        subject = f"[{task.column.board.name}] Tarea movida: {task.title}"
-
-        for recipient in recipients:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=f'"{task.title}" movida de {old_column_name} a {new_column_name} ({task.progress}%).',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[recipient],
-                reply_to=[reply_to] if reply_to else [],
-            )
-            msg.attach_alternative(html_body, "text/html")
-            msg.send(fail_silently=True)
+        emails.fan_out(
+            recipients,
+            subject=f"[{task.column.board.name}] Tarea movida: {task.title}",
+            body=(
+                f'"{task.title}" movida de {old_column_name} a {new_column_name} '
+                f"({task.progress}%)."
+            ),
+            html_body=emails.render("projects/email/task_moved.html", context),
+            # Reply-To via Cloudmailin plus-addressing:
+            # cca91010c6927746fa43+task-{uuid}@cloudmailin.net
+            reply_to=emails.reply_to_for(task.id),
+        )
 
     except Task.DoesNotExist:
         pass
@@ -131,42 +140,67 @@ def send_task_moved_email(task_id, old_column_name, new_column_name, mover_email
         logger.warning("send_task_moved_email failed for task %s: %s", task_id, exc)
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def process_inbound_email(self, inbound_id):
+    """Creates the comment for a stored Cloudmailin payload (idempotent)."""
+    from .models import InboundEmail, InboundEmailStatus
+    from .services import InboundEmailService
+
+    try:
+        InboundEmailService.process(inbound_id)
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc) from exc
+        logger.warning("process_inbound_email failed for %s: %s", inbound_id, exc)
+        InboundEmail.objects.filter(
+            id=inbound_id, status=InboundEmailStatus.PENDING
+        ).update(status=InboundEmailStatus.FAILED, detail=str(exc)[:255])
+
+
+@shared_task
+def requeue_pending_inbound_emails():
+    """
+    Safety net: re-enqueues payloads still PENDING a few minutes after arrival
+    (e.g. the broker was unreachable when the webhook responded).
+    """
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from .models import InboundEmail, InboundEmailStatus
+
+    cutoff = timezone.now() - timedelta(minutes=5)
+    ids = list(
+        InboundEmail.objects.filter(
+            status=InboundEmailStatus.PENDING, created_at__lt=cutoff
+        ).values_list("id", flat=True)[:500]
+    )
+    for inbound_id in ids:
+        process_inbound_email.delay(str(inbound_id))
+    return len(ids)
+
+
 @shared_task
 def check_overdue_tasks():
     """
     Daily job: finds tasks past their end_date that are not in a COMPLETED or
     DELAYED column and moves them to the DELAYED column of their board.
+    A single set-based UPDATE covers every board; see
+    TaskService.move_overdue_to_delayed.
     Runs via celery-beat every day at 00:05.
     """
     from django.utils import timezone
-    from django.db import transaction
-    from .models import Board, Column, ColumnStatus
-
-    today = timezone.now().date()
-    moved_count = 0
 
-    for board in Board.objects.prefetch_related("columns"):
-        delayed_col = board.columns.filter(status=ColumnStatus.DELAYED).first()
-        if not delayed_col:
-            continue  # Board has no DELAYED column — skip
+    from .services import TaskService
 
-        overdue_tasks = (
-            Task.objects.filter(column__board=board, end_date__lt=today)
-            .exclude(column__status__in=[ColumnStatus.DELAYED, ColumnStatus.COMPLETED])
+    moved = TaskService.move_overdue_to_delayed(timezone.now().date())
+    for board_id, task_ids in moved.items():
+        logger.info(
+            "check_overdue_tasks: moved %d tasks to DELAYED in board %s",
+            len(task_ids),
+            board_id,
         )
 
-        if not overdue_tasks.exists():
-            continue
-
-        with transaction.atomic():
-            count = overdue_tasks.count()
-            overdue_tasks.update(column=delayed_col)
-            moved_count += count
-            logger.info(
-                "check_overdue_tasks: moved %d tasks to DELAYED in board %s",
-                count,
-                board.id,
-            )
-
+    moved_count = sum(len(ids) for ids in moved.values())
     logger.info("check_overdue_tasks finished: total moved=%d", moved_count)
     return moved_count
@@ -0,0 +1,58 @@
+"""
+Query-count assertions for API tests.
+
+An endpoint passes when it runs the same number of SQL queries against a small
+and a large dataset — its cost does not grow with the data (no N+1) — and that
+number is within its declared budget. Failures list the repeated statements,
+grouped by fingerprint, which is usually enough to spot the loop.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Callable
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from config.instrumentation import fingerprint
+
+# Column lists are noise in a report and would push the WHERE clause past the
+# fingerprint's length cap
+_SELECT_LIST = re.compile(r"^SELECT .+? FROM ", re.DOTALL)
+
+
+def capture_queries(fn: Callable):
+    """Run ``fn`` and return ``(result, [sql, ...])`` for the queries it executed."""
+    with CaptureQueriesContext(connection) as ctx:
+        result = fn()
+    return result, [q["sql"] for q in ctx.captured_queries]
+
+
+def repeated_sql(statements: list[str], top: int = 10) -> str:
+    """The most repeated statements (by fingerprint), one ``N× sql`` per line."""
+    counts = Counter(fingerprint(_SELECT_LIST.sub("SELECT … FROM ", sql)) for sql in statements)
+    lines = [f"{n:>4}× {sql}" for sql, n in counts.most_common(top) if n > 1]
+    return "\n".join(lines) or "(no repeated statements)"
+
+
+def assert_query_budget(name: str, small: list[str], large: list[str], budget: int) -> None:
+    """
+    Fail unless both runs issued the same number of queries and it is at most
+    ``budget``. ``small``/``large`` are the statements from ``capture_queries``.
+    """
+    problems = []
+    if len(large) != len(small):
+        problems.append(
+            f"query count grows with the data: {len(small)} (small) → {len(large)} (large)"
+        )
+    if len(large) > budget:
+        problems.append(f"{len(large)} queries, budget is {budget}")
+    if problems:
+        pytest.fail(
+            f"{name}: "
+            + "; ".join(problems)
+            + "\nRepeated SQL on the large dataset:\n"
+            + repeated_sql(large),
+            pytrace=False,
+        )
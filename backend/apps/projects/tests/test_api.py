@@ -74,6 +74,49 @@ class TestWorkspaceEndpoints:
         assert response.status_code == 404
 
 
+@pytest.mark.django_db
+class TestUserDirectoryEndpoints:
+    def _user(self, first, last, email):
+        return UserFactory(first_name=first, last_name=last, email=email)
+
+    def test_search_prefix_first_and_limited(self, api_client):
+        me = self._user("Ana", "Ruiz", "ana@stwards.com")
+        self._user("Mariana", "López", "mariana@stwards.com")
+        self._user("Andrés", "Gil", "andres@stwards.com")
+        self._user("Ana", "Externa", "ana@otra.com")  # outside the directory
+
+        response = api_client.get("/users?q=an&limit=2", headers=_auth(me))
+        assert response.status_code == 200
+        names = [u["first_name"] for u in response.json()]
+        assert len(names) == 2
+        assert set(names) == {"Ana", "Andrés"}  # prefix hits beat the infix one
+
+        response = api_client.get("/users?q=100%25", headers=_auth(me))
+        assert response.json() == []  # LIKE wildcards are escaped
+
+    def test_unfiltered_directory_revalidates_with_etag(self, api_client):
+        me = self._user("Ana", "Ruiz", "ana@stwards.com")
+
+        first = api_client.get("/users", headers=_auth(me))
+        etag = first.headers["ETag"]
+        cached = api_client.get("/users", headers={**_auth(me), "If-None-Match": etag})
+        assert cached.status_code == 304
+
+        self._user("Luis", "Mora", "luis@stwards.com")
+        fresh = api_client.get("/users", headers={**_auth(me), "If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert len(fresh.json()) == 2
+
+    def test_member_search(self, api_client):
+        owner = self._user("Ana", "Ruiz", "ana@stwards.com")
+        ws = WorkspaceService.create(owner, name="WS")
+        ws.members.add(self._user("Carla", "Paz", "carla@stwards.com"))
+        self._user("Carlos", "Vega", "carlos@stwards.com")  # not a member
+
+        response = api_client.get(f"/workspaces/{ws.id}/members?q=carl", headers=_auth(owner))
+        assert [u["first_name"] for u in response.json()] == ["Carla"]
+
+
 @pytest.mark.django_db
 class TestBoardEndpoints:
     def test_list_boards_paginated(self, api_client):
@@ -121,12 +164,19 @@ class TestBoardEndpoints:
         assert response.json()["name"] == "New"
 
     def test_delete_board(self, api_client):
-        user = UserFactory()
+        user = UserFactory(role="gestor")
         ws = WorkspaceService.create(user, name="WS")
         board = BoardService.create(user, name="B", workspace_id=ws.id)
         response = api_client.delete(f"/boards/{board.id}", headers=_auth(user))
         assert response.status_code == 204
 
+    def test_developer_cannot_delete_board(self, api_client):
+        user = UserFactory(role="desarrollador")
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        response = api_client.delete(f"/boards/{board.id}", headers=_auth(user))
+        assert response.status_code == 403
+
     def test_user_cannot_access_other_board(self, api_client):
         user1 = UserFactory()
         user2 = UserFactory()
@@ -153,8 +203,8 @@ class TestColumnEndpoints:
 
 @pytest.mark.django_db
 class TestTaskEndpoints:
-    def _setup(self):
-        user = UserFactory()
+    def _setup(self, **user_fields):
+        user = UserFactory(**user_fields)
         ws = WorkspaceService.create(user, name="WS")
         board = BoardService.create(user, name="B", workspace_id=ws.id)
         columns = list(board.columns.order_by("order"))
@@ -184,11 +234,17 @@ class TestTaskEndpoints:
         assert data["priority"] == "high"
 
     def test_delete_task(self, api_client):
-        user, board, columns = self._setup()
+        user, board, columns = self._setup(role="gestor")
         task = TaskService.create(user, column_id=columns[0].id, title="Del")
         response = api_client.delete(f"/tasks/{task.id}", headers=_auth(user))
         assert response.status_code == 204
 
+    def test_developer_cannot_delete_task(self, api_client):
+        user, board, columns = self._setup()
+        task = TaskService.create(user, column_id=columns[0].id, title="Del")
+        response = api_client.delete(f"/tasks/{task.id}", headers=_auth(user))
+        assert response.status_code == 403
+
     def test_move_task(self, api_client):
         user, board, columns = self._setup()
         task = TaskService.create(user, column_id=columns[0].id, title="Move")
@@ -211,3 +267,840 @@ class TestTaskEndpoints:
             headers=_auth(user2),
         )
         assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestTimelineEndpoints:
+    def _setup(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        return user, ws, board, col
+
+    def test_board_timeline_returns_overlapping_tasks_and_edges(self, api_client):
+        from datetime import date
+
+        user, _, board, col = self._setup()
+        inside = TaskService.create(
+            user,
+            column_id=col.id,
+            title="In",
+            start_date=date(2026, 3, 30),
+            end_date=date(2026, 4, 2),
+        )
+        starts_only = TaskService.create(
+            user,
+            column_id=col.id,
+            title="Day",
+            start_date=date(2026, 4, 15),
+            dependency_ids=[inside.id],
+        )
+        TaskService.create(
+            user,
+            column_id=col.id,
+            title="Before",
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 3, 29),
+        )
+        TaskService.create(user, column_id=col.id, title="Undated")
+
+        response = api_client.get(
+            f"/boards/{board.id}/timeline?from=2026-04-01&to=2026-06-30", headers=_auth(user)
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert {t["title"] for t in data["tasks"]} == {"In", "Day"}
+        assert "description" not in data["tasks"][0]
+        assert data["dependencies"] == [
+            {"task_id": str(starts_only.id), "depends_on_id": str(inside.id)}
+        ]
+
+    def test_workspace_timeline_spans_boards(self, api_client):
+        from datetime import date
+
+        user, ws, board, col = self._setup()
+        other = BoardService.create(user, name="B2", workspace_id=ws.id)
+        other_col = other.columns.order_by("order").first()
+        for c in (col, other_col):
+            TaskService.create(user, column_id=c.id, title="T", start_date=date(2026, 5, 1))
+
+        response = api_client.get(
+            f"/workspaces/{ws.id}/timeline?from=2026-05-01&to=2026-05-31", headers=_auth(user)
+        )
+        assert response.status_code == 200
+        assert {t["board_id"] for t in response.json()["tasks"]} == {str(board.id), str(other.id)}
+
+    def test_rejects_inverted_window(self, api_client):
+        user, _, board, _ = self._setup()
+        response = api_client.get(
+            f"/boards/{board.id}/timeline?from=2026-06-01&to=2026-05-01", headers=_auth(user)
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestBoardTaskQuery:
+    def _setup(self):
+        user = UserFactory(role="administrador")
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        columns = list(board.columns.order_by("order"))
+        return user, ws, board, columns
+
+    def test_filters_and_group_counts(self, api_client):
+        from datetime import date, timedelta
+
+        user, _, board, columns = self._setup()
+        late = TaskService.create(
+            user,
+            column_id=columns[0].id,
+            title="Late",
+            priority="high",
+            start_date=date.today() - timedelta(days=5),
+            end_date=date.today() - timedelta(days=1),
+        )
+        # Distinct orders, so the default sort does not fall back to the random ids
+        TaskService.create(
+            user, column_id=columns[1].id, title="Urgent", priority="urgent", order=0
+        )
+        TaskService.create(user, column_id=columns[1].id, title="Low", priority="low", order=1)
+        TaskService.create(user, column_id=columns[0].id, title="Sub", parent_id=late.id)
+
+        url = f"/boards/{board.id}/tasks"
+        response = api_client.get(url, headers=_auth(user))
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["title"] for t in data["items"]] == ["Late", "Urgent", "Low"]
+        assert [(g["label"], g["count"]) for g in data["groups"]][:2] == [
+            (columns[0].name, 1),
+            (columns[1].name, 2),
+        ]
+        assert data["items"][0]["group"] == str(columns[0].id)
+
+        response = api_client.get(
+            f"{url}?priority=high&priority=urgent&group_by=priority", headers=_auth(user)
+        )
+        assert [t["title"] for t in response.json()["items"]] == ["Urgent", "Late"]
+        assert [g["key"] for g in response.json()["groups"]] == ["urgent", "high"]
+
+        response = api_client.get(f"{url}?overdue=true", headers=_auth(user))
+        assert [t["title"] for t in response.json()["items"]] == ["Late"]
+        response = api_client.get(f"{url}?parent_id={late.id}", headers=_auth(user))
+        assert [t["title"] for t in response.json()["items"]] == ["Sub"]
+
+    def test_keyset_pages_cover_every_task_once(self, api_client):
+        from datetime import date, timedelta
+
+        user, _, board, columns = self._setup()
+        for i in range(7):
+            TaskService.create(
+                user,
+                column_id=columns[i % 2].id,
+                title=f"T{i}",
+                end_date=date(2026, 5, 1) + timedelta(days=i % 3) if i % 4 else None,
+            )
+
+        seen, cursor = [], None
+        while True:
+            qs = "sort=-end_date&limit=3" + (f"&cursor={cursor}" if cursor else "")
+            response = api_client.get(f"/boards/{board.id}/tasks?{qs}", headers=_auth(user))
+            assert response.status_code == 200
+            page = response.json()
+            seen += page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+            assert page["groups"] is None or len(seen) == 3
+
+        assert sorted(t["title"] for t in seen) == [f"T{i}" for i in range(7)]
+        # Column groups first, then latest due date, undated tasks last
+        keys = [(t["column_id"] != str(columns[0].id), t["end_date"] is None) for t in seen]
+        assert keys == sorted(keys)
+        for column_id in {t["column_id"] for t in seen}:
+            dated = [t["end_date"] for t in seen if t["column_id"] == column_id and t["end_date"]]
+            assert dated == sorted(dated, reverse=True)
+
+    def test_non_admin_sees_only_own_tasks(self, api_client):
+        owner, ws, board, columns = self._setup()
+        member = UserFactory(role="desarrollador")
+        ws.members.add(member)
+        TaskService.create(owner, column_id=columns[0].id, title="Theirs")
+        TaskService.create(owner, column_id=columns[0].id, title="Mine", assignee_id=member.id)
+
+        response = api_client.get(f"/boards/{board.id}/tasks?group_by=", headers=_auth(member))
+        assert [t["title"] for t in response.json()["items"]] == ["Mine"]
+        assert response.json()["groups"] is None
+
+    def test_rejects_bad_cursor(self, api_client):
+        user, _, board, _ = self._setup()
+        response = api_client.get(f"/boards/{board.id}/tasks?cursor=xyz", headers=_auth(user))
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestMyTasksEndpoint:
+    def test_spans_workspaces_and_assignment_paths(self, api_client):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        me, other = UserFactory(), UserFactory()
+        today = timezone.localdate()
+        boards = []
+        for name in ("WS1", "WS2"):
+            ws = WorkspaceService.create(other, name=name)
+            ws.members.add(me)
+            boards.append(BoardService.create(other, name=name, workspace_id=ws.id))
+        col1, col2 = (b.columns.order_by("order").first() for b in boards)
+
+        late = TaskService.create(
+            other,
+            column_id=col1.id,
+            title="Late",
+            assignee_id=me.id,
+            end_date=today - timedelta(days=2),
+        )
+        TaskService.create(
+            other, column_id=col2.id, title="Today", assignee_ids=[me.id], end_date=today
+        )
+        TaskService.create(other, column_id=col2.id, title="Undated", assignee_id=me.id)
+        TaskService.create(
+            other,
+            column_id=col1.id,
+            title="Done",
+            assignee_id=me.id,
+            end_date=today,
+            progress=100,
+        )
+        TaskService.create(other, column_id=col1.id, title="Not mine", end_date=today)
+
+        response = api_client.get("/me/tasks", headers=_auth(me))
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["title"] for t in data["items"]] == ["Late", "Today", "Undated"]
+        assert data["items"][0]["board_id"] == str(late.column.board_id)
+        assert data["counts"] == {"overdue": 1, "today": 1, "week": 0}
+
+        response = api_client.get("/me/tasks?due=today", headers=_auth(me))
+        assert [t["title"] for t in response.json()["items"]] == ["Today"]
+        # The counts still label every tab
+        assert response.json()["counts"] == {"overdue": 1, "today": 1, "week": 0}
+
+    def test_keyset_pagination(self, api_client, django_assert_max_num_queries):
+        from datetime import date, timedelta
+
+        me = UserFactory()
+        ws = WorkspaceService.create(me, name="WS")
+        board = BoardService.create(me, name="B", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        for i in range(5):
+            TaskService.create(
+                me,
+                column_id=col.id,
+                title=f"T{i}",
+                assignee_id=me.id,
+                end_date=date(2026, 1, 1) + timedelta(days=i) if i < 4 else None,
+            )
+
+        first = api_client.get("/me/tasks?limit=3", headers=_auth(me)).json()
+        with django_assert_max_num_queries(7):
+            second = api_client.get(
+                f"/me/tasks?limit=3&cursor={first['next_cursor']}", headers=_auth(me)
+            ).json()
+        assert [t["title"] for t in first["items"] + second["items"]] == [
+            "T0",
+            "T1",
+            "T2",
+            "T3",
+            "T4",
+        ]
+        assert second["next_cursor"] is None
+        assert second["counts"] is None
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_server_timing_header(self, api_client):
+        user = UserFactory()
+        response = api_client.get("/workspaces", headers=_auth(user))
+        timing = response["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert "ser;dur=" in timing
+        assert "total;dur=" in timing
+
+    def test_budget_overrun_logs_fingerprints(self, api_client, settings, caplog):
+        settings.QUERY_BUDGETS = {"api/v1/workspaces": 0}
+        user = UserFactory()
+        with caplog.at_level("WARNING", logger="config.instrumentation"):
+            api_client.get("/workspaces", headers=_auth(user))
+        [record] = [r for r in caplog.records if r.name == "config.instrumentation"]
+        assert "api/v1/workspaces" in record.getMessage()
+        assert "FROM" in record.getMessage()
+
+    def test_memory_sample_dropped_when_requests_overlap(self, settings):
+        from config.instrumentation import RequestMetrics, _request_finished, _request_started
+
+        settings.REQUEST_MEMORY_SAMPLE_RATE = 1.0
+        traced, other = RequestMetrics(), RequestMetrics()
+        assert _request_started(traced)
+        assert not _request_started(other)
+        _request_finished(other, tracing=False)
+        _request_finished(traced, tracing=True)
+        assert traced.memory_peak is None
+
+    def test_fingerprint_collapses_literals(self):
+        from config.instrumentation import fingerprint
+
+        assert fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND n = 'x'") == (
+            "SELECT * FROM t WHERE id IN (?, …) AND n = ?"
+        )
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    @staticmethod
+    def _sample(name, **labels):
+        from prometheus_client import REGISTRY
+
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_records_route_latency_and_queries(self, api_client, client):
+        user = UserFactory()
+        route = {"route": "api/v1/boards/<board_id>"}
+        before = self._sample("db_queries_total", **route)
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        api_client.get(f"/boards/{board.id}", headers=_auth(user))
+
+        assert self._sample("db_queries_total", **route) > before
+        body = client.get("/metrics").content.decode()
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="api/v1/boards/<board_id>",status="200"}'
+        ) in body
+        assert "http_request_cpu_seconds_total" in body
+        assert "http_requests_in_flight" in body
+
+    def test_samples_request_memory_peak(self, api_client, settings):
+        settings.REQUEST_MEMORY_SAMPLE_RATE = 1.0
+        user = UserFactory()
+        route = {"route": "api/v1/workspaces"}
+        before = self._sample("http_request_memory_peak_bytes_count", **route)
+        api_client.get("/workspaces", headers=_auth(user))
+        assert self._sample("http_request_memory_peak_bytes_count", **route) == before + 1
+        assert self._sample("http_request_memory_peak_bytes_sum", **route) > 0
+
+    def test_counts_rate_limit_rejections(self, api_client, settings):
+        settings.RATE_LIMIT_ENABLED = True
+        settings.RATE_LIMIT_REQUESTS = 1
+        before = self._sample("rate_limit_rejections_total", scope="api")
+        api_client.get("/health")
+        assert api_client.get("/health").status_code == 429
+        assert self._sample("rate_limit_rejections_total", scope="api") == before + 1
+
+    def test_records_celery_task_duration(self):
+        from apps.projects.tasks import check_overdue_tasks
+
+        labels = {"task": check_overdue_tasks.name, "state": "SUCCESS"}
+        before = self._sample("celery_task_duration_seconds_count", **labels)
+        check_overdue_tasks.apply()
+        assert self._sample("celery_task_duration_seconds_count", **labels) == before + 1
+
+    def test_token_required_when_configured(self, client, settings):
+        settings.METRICS_TOKEN = "scrape"  # noqa: S105 — test value
+        assert client.get("/metrics").status_code == 403
+        assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape").status_code == 200
+
+    @pytest.mark.parametrize(("token", "status"), [("", 404), ("scrape", 200)])
+    def test_production_serves_metrics_only_with_a_token(self, token, status):
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        script = (
+            "import django; django.setup()\n"
+            "from django.test import Client\n"
+            "print(Client().get('/metrics', secure=True,"
+            " HTTP_AUTHORIZATION='Bearer scrape').status_code)"
+        )
+        env = {
+            **os.environ,
+            "DJANGO_ENV": "production",
+            "DJANGO_SETTINGS_MODULE": "config.settings",
+            "ALLOWED_HOSTS": "testserver",
+            "METRICS_TOKEN": token,
+        }
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[3],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip().splitlines()[-1] == str(status)
+
+    def test_merges_worker_process_files(self, client, settings, tmp_path):
+        import subprocess
+        import sys
+
+        # Each process writes its own files, as gunicorn/celery workers do
+        script = (
+            "from prometheus_client import Counter;"
+            "Counter('celery_task_failures', 'x', ['task', 'exception'])"
+            ".labels('t', 'E').inc()"
+        )
+        for _ in range(2):
+            subprocess.run(  # noqa: S603 — fixed interpreter and script
+                [sys.executable, "-c", script],
+                env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+                check=True,
+            )
+        settings.METRICS_DIRS = [str(tmp_path)]
+        body = client.get("/metrics").content.decode()
+        assert 'celery_task_failures_total{exception="E",task="t"} 2.0' in body
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    @pytest.fixture(autouse=True)
+    def _profiles(self, settings, tmp_path):
+        settings.PROFILING_DIR = tmp_path
+        settings.PROFILING_SAMPLE_INTERVAL = 0.001
+
+    def _board(self, user):
+        ws = WorkspaceService.create(user, name="WS")
+        return BoardService.create(user, name="B", workspace_id=ws.id)
+
+    def test_admin_gets_collapsed_stack_profile(self, api_client, tmp_path):
+        admin = UserFactory(role="administrador")
+        board = self._board(admin)
+        headers = {**_auth(admin), "X-Profile": "sample"}
+        response = api_client.get(f"/boards/{board.id}", headers=headers)
+
+        assert response.status_code == 200
+        name = response["X-Profile"]
+        assert name.endswith(".collapsed") and "boards-board-id" in name
+        lines = (tmp_path / name).read_text().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_cprofile_mode_writes_pstats(self, api_client, tmp_path):
+        import pstats
+
+        admin = UserFactory(role="administrador")
+        board = self._board(admin)
+        response = api_client.get(f"/boards/{board.id}?__profile=cprofile", headers=_auth(admin))
+        stats = pstats.Stats(str(tmp_path / response["X-Profile"]))
+        assert stats.total_calls > 0
+
+    def test_ignored_for_non_admins(self, api_client, tmp_path):
+        user = UserFactory()
+        board = self._board(user)
+        headers = {**_auth(user), "X-Profile": "sample"}
+        response = api_client.get(f"/boards/{board.id}", headers=headers)
+        assert response.status_code == 200
+        assert "X-Profile" not in response
+        assert not list(tmp_path.iterdir())
+
+    def test_capped_per_hour(self, api_client, settings):
+        settings.PROFILING_MAX_PER_HOUR = 1
+        admin = UserFactory(role="administrador")
+        headers = {**_auth(admin), "X-Profile": "sample"}
+        assert api_client.get("/workspaces", headers=headers)["X-Profile"].endswith(".collapsed")
+        assert api_client.get("/workspaces", headers=headers)["X-Profile"] == "rate-limited"
+
+    def test_download_returns_the_profile_as_the_body(self, api_client, tmp_path):
+        admin = UserFactory(role="administrador")
+        board = self._board(admin)
+        headers = {**_auth(admin), "X-Profile": "sample", "X-Profile-Download": "1"}
+        response = api_client.get(f"/boards/{board.id}", headers=headers)
+
+        assert response.status_code == 200
+        assert response["X-Profile-Status"] == "200"
+        name = response["X-Profile"]
+        assert response["Content-Disposition"] == f'attachment; filename="{name}"'
+        assert response.content == (tmp_path / name).read_bytes()
+
+    def test_download_keeps_the_views_status(self, api_client):
+        import uuid
+
+        admin = UserFactory(role="administrador")
+        path = f"/boards/{uuid.uuid4()}?__profile=cprofile&__profile_download=1"
+        response = api_client.get(path, headers=_auth(admin))
+
+        assert response.status_code == 200
+        assert response["X-Profile-Status"] == "404"
+        assert response["Content-Type"] == "application/octet-stream"
+
+    @pytest.mark.usefixtures("unreachable_cache")
+    def test_unreachable_cache_skips_profiling_without_locking_it(self, api_client):
+        from config import profiling
+
+        admin = UserFactory(role="administrador")
+        headers = {**_auth(admin), "X-Profile": "sample"}
+        response = api_client.get("/workspaces", headers=headers)
+
+        assert response.status_code == 200
+        assert response["X-Profile"] == "rate-limited"
+        assert not profiling._running.locked()
+
+
+@pytest.mark.django_db
+class TestAsyncEndpoints:
+    """The async read endpoints, served through the ASGI (async) middleware chain."""
+
+    @staticmethod
+    def _get(path, user=None, **headers):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        if user is not None:
+            headers.update(_auth(user))
+        return async_to_sync(AsyncClient().get)(f"/api/v1{path}", headers=headers)
+
+    def test_middleware_chain_stays_async(self, settings):
+        from django.utils.module_loading import import_string
+
+        sync_only = [
+            path
+            for path in settings.MIDDLEWARE
+            if not getattr(import_string(path), "async_capable", False)
+        ]
+        assert sync_only == []
+
+    def test_board_detail(self):
+        from apps.projects.tests.factories import TaskFactory
+
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        TaskFactory(column=board.columns.first(), assignee=user, created_by=user)
+
+        response = self._get(f"/boards/{board.id}", user)
+        assert response.status_code == 200
+        columns = response.json()["columns"]
+        assert len(columns) == 4
+        [task] = [t for c in columns for t in c["tasks"]]
+        assert task["assignee"]["id"] == str(user.id)
+        # Queries run by the async ORM are still counted for the request
+        assert 'desc="0 queries"' not in response["Server-Timing"]
+
+    def test_board_of_another_user_is_404(self):
+        owner = UserFactory()
+        ws = WorkspaceService.create(owner, name="WS")
+        board = BoardService.create(owner, name="B", workspace_id=ws.id)
+        assert self._get(f"/boards/{board.id}", UserFactory()).status_code == 404
+
+    def test_workspaces_paginated(self):
+        user = UserFactory()
+        for n in range(21):
+            WorkspaceService.create(user, name=f"WS{n}")
+
+        data = self._get("/workspaces?page=2", user).json()
+        assert data["count"] == 21
+        assert len(data["items"]) == 1
+        assert data["items"][0]["boards"] == []
+
+    def test_notifications_and_count(self):
+        from apps.projects.models import Notification, NotificationType
+        from apps.projects.tests.factories import TaskFactory
+
+        user = UserFactory()
+        task = TaskFactory(title="Revisar")
+        Notification.objects.create(
+            user=user, task=task, type=NotificationType.COMMENT, message="Aviso"
+        )
+
+        [item] = self._get("/notifications", user).json()
+        assert item["task_title"] == "Revisar"
+        assert self._get("/notifications/count", user).json() == {"unread": 1}
+
+    def test_requires_token(self):
+        assert self._get("/notifications/count").status_code == 401
+        assert self._get("/notifications/count", Authorization="Bearer nope").status_code == 401
+
+    def test_admin_can_profile(self, settings, tmp_path):
+        settings.PROFILING_DIR = tmp_path
+        settings.PROFILING_SAMPLE_INTERVAL = 0.001
+        admin = UserFactory(role="administrador")
+
+        response = self._get("/notifications", admin, **{"X-Profile": "sample"})
+        assert response["X-Profile"].endswith(".collapsed")
+        assert (tmp_path / response["X-Profile"]).exists()
+
+    # Committed transactions: the view's thread opens its own database connection
+    @pytest.mark.django_db(transaction=True)
+    def test_sync_view_under_asgi_reports_cpu_and_memory(self, settings):
+        """Through the real ASGI handler: the sync view runs in a thread of its own."""
+        import asyncio
+
+        from asgiref.sync import async_to_sync
+        from prometheus_client import REGISTRY
+
+        from config.asgi import application
+
+        settings.REQUEST_MEMORY_SAMPLE_RATE = 1.0
+        route = {"route": "api/v1/health"}
+
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, {**route, **labels}) or 0
+
+        cpu = sample("http_request_cpu_seconds_total", method="GET")
+        peaks = sample("http_request_memory_peak_bytes_count")
+        sent, body_read = [], asyncio.Event()
+
+        async def receive():
+            if body_read.is_set():  # then only a disconnect could come
+                await asyncio.Event().wait()
+            body_read.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/health",
+            "raw_path": b"/api/v1/health",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        async_to_sync(application)(scope, receive, send)
+
+        assert sent[0]["status"] == 200
+        assert sample("http_request_cpu_seconds_total", method="GET") > cpu
+        assert sample("http_request_memory_peak_bytes_count") == peaks + 1
+
+    def test_async_view_reports_no_cpu(self):
+        from prometheus_client import REGISTRY
+
+        labels = {"method": "GET", "route": "api/v1/notifications/count"}
+        before = REGISTRY.get_sample_value("http_request_cpu_seconds_total", labels)
+        self._get("/notifications/count", UserFactory())
+        assert REGISTRY.get_sample_value("http_request_cpu_seconds_total", labels) == before
+
+
+@pytest.mark.django_db
+class TestSearchEndpoint:
+    def _setup(self, user=None):
+        user = user or UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="Obra", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        return user, board, col
+
+    def test_tsvectors_are_not_loaded_with_tasks_or_comments(self):
+        from apps.projects.models import Task, TaskComment
+
+        for model in (Task, TaskComment):
+            assert "search_vector" not in str(model.objects.all().query)
+
+    def test_finds_tasks_and_comments_with_highlight(self, api_client):
+        from apps.projects.services import CommentService
+
+        user, board, col = self._setup()
+        task = TaskService.create(
+            user,
+            column_id=col.id,
+            title="Revisar planos eléctricos",
+            description="Incluye <script>alert(1)</script>",
+        )
+        CommentService.create(user, task, "Los planos llegaron tarde")
+        TaskService.create(user, column_id=col.id, title="Comprar cemento")
+
+        response = api_client.get("/search?q=planos", headers=_auth(user))
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert {i["type"] for i in items} == {"task", "comment"}
+        assert items[0]["type"] == "task"  # title matches outrank comment text
+        assert items[0]["board_name"] == "Obra"
+        assert "<mark>planos</mark>" in items[0]["headline"]
+        assert "<script>" not in items[0]["headline"]
+
+    def test_only_visible_workspaces_and_live_tasks(self, api_client):
+        user, _, col = self._setup()
+        other, _, other_col = self._setup(UserFactory())
+        TaskService.create(other, column_id=other_col.id, title="Presupuesto ajeno")
+        deleted = TaskService.create(user, column_id=col.id, title="Presupuesto viejo")
+        TaskService.delete(deleted, user=user)
+
+        response = api_client.get("/search?q=presupuesto", headers=_auth(user))
+        assert response.json()["items"] == []
+
+    def test_keyset_pagination_and_trigger_on_update(self, api_client):
+        user, _, col = self._setup()
+        tasks = [TaskService.create(user, column_id=col.id, title=f"Informe {i}") for i in range(3)]
+        TaskService.update(tasks[0], title="Informe mensual informe")
+
+        seen, cursor = [], None
+        for _ in range(3):
+            url = "/search?q=informe&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            page = api_client.get(url, headers=_auth(user)).json()
+            seen += [i["id"] for i in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen[0] == str(tasks[0].id)  # repeated term ranks first
+        assert sorted(seen) == sorted(str(t.id) for t in tasks)
+
+    def test_invalid_cursor(self, api_client):
+        user, _, _ = self._setup()
+        response = api_client.get("/search?q=x&cursor=@@", headers=_auth(user))
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestAttachmentEndpoints:
+    def _setup(self, settings, tmp_path):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from apps.projects.services import CommentService
+
+        settings.ATTACHMENTS_ROOT = tmp_path
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        task = TaskService.create(user, column_id=board.columns.first().id, title="T")
+        upload = SimpleUploadedFile("informe.pdf", b"%PDF-1.4", content_type="application/pdf")
+        comment = CommentService.create_with_file(user, task, "Adjunto", file=upload)
+        return user, comment
+
+    def test_download_hands_off_to_nginx(self, api_client, settings, tmp_path):
+        user, comment = self._setup(settings, tmp_path)
+        settings.ATTACHMENTS_X_ACCEL_PREFIX = "/protected-attachments/"
+        response = api_client.get(f"/comments/{comment.id}/attachment", headers=_auth(user))
+        assert response.status_code == 200
+        sha = comment.attachment.sha256
+        assert response["X-Accel-Redirect"] == f"/protected-attachments/{sha[:2]}/{sha[2:4]}/{sha}"
+        assert "informe.pdf" in response["Content-Disposition"]
+        assert response.content == b""
+
+    def test_download_streams_without_nginx(self, api_client, settings, tmp_path):
+        user, comment = self._setup(settings, tmp_path)
+        response = api_client.get(f"/comments/{comment.id}/attachment", headers=_auth(user))
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"%PDF-1.4"
+
+    def test_download_with_signed_link(self, api_client, settings, tmp_path):
+        from apps.projects.storage import make_link_token
+
+        _, comment = self._setup(settings, tmp_path)
+        token = make_link_token(comment.id)
+        response = api_client.get(f"/comments/{comment.id}/attachment?token={token}")
+        assert response.status_code == 200
+
+    def test_signed_link_is_scoped_to_comment(self, api_client, settings, tmp_path):
+        import uuid
+
+        from apps.projects.storage import make_link_token
+
+        _, comment = self._setup(settings, tmp_path)
+        token = make_link_token(uuid.uuid4())
+        response = api_client.get(f"/comments/{comment.id}/attachment?token={token}")
+        assert response.status_code == 403
+
+    def test_other_user_cannot_download(self, api_client, settings, tmp_path):
+        _, comment = self._setup(settings, tmp_path)
+        response = api_client.get(
+            f"/comments/{comment.id}/attachment", headers=_auth(UserFactory())
+        )
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestInboundEmailWebhook:
+    SECRET = "hook-secret"  # noqa: S105 — test value
+
+    def _payload(self, task, message_id="<abc@mail.stwards.com>"):
+        return {
+            "headers": {"Message-ID": message_id},
+            "envelope": {"from": "someone@stwards.com", "to": f"in+task-{task.id}@cloudmailin.net"},
+            "reply_plain": "Respuesta por correo",
+        }
+
+    def _task(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        return TaskService.create(user, column_id=board.columns.first().id, title="T")
+
+    def test_accepts_and_processes_async(
+        self, api_client, settings, django_capture_on_commit_callbacks
+    ):
+        from apps.projects.models import InboundEmail, InboundEmailStatus, TaskComment
+
+        settings.INBOUND_EMAIL_SECRET = self.SECRET
+        task = self._task()
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                "/webhooks/inbound-email",
+                json=self._payload(task),
+                headers={"X-Webhook-Secret": self.SECRET},
+            )
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        inbound = InboundEmail.objects.get()
+        assert inbound.status == InboundEmailStatus.PROCESSED
+        assert TaskComment.objects.get(task=task).content == "Respuesta por correo"
+
+    def test_retry_is_deduplicated(self, api_client, settings, django_capture_on_commit_callbacks):
+        from apps.projects.models import InboundEmail, TaskComment
+
+        settings.INBOUND_EMAIL_SECRET = self.SECRET
+        task = self._task()
+        for _ in range(2):
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post(
+                    "/webhooks/inbound-email",
+                    json=self._payload(task),
+                    headers={"X-Webhook-Secret": self.SECRET},
+                )
+        assert response.status_code == 202
+        assert response.json()["status"] == "duplicate"
+        assert InboundEmail.objects.count() == 1
+        assert TaskComment.objects.filter(task=task).count() == 1
+
+    def test_invalid_secret_is_rejected(self, api_client, settings):
+        from apps.projects.models import InboundEmail
+
+        settings.INBOUND_EMAIL_SECRET = self.SECRET
+        response = api_client.post(
+            "/webhooks/inbound-email",
+            json=self._payload(self._task()),
+            headers={"X-Webhook-Secret": "wrong"},
+        )
+        assert response.status_code == 200  # answered, not accepted for processing (202)
+        assert response.json() == {"status": "error", "reason": "unauthorized"}
+        assert not InboundEmail.objects.exists()
+
+    def test_processing_twice_creates_one_comment(self):
+        from apps.projects.models import InboundEmail, TaskComment
+        from apps.projects.services import InboundEmailService
+
+        task = self._task()
+        inbound = InboundEmail.objects.create(idempotency_key="k", payload=self._payload(task))
+        InboundEmailService.process(inbound.id)
+        assert InboundEmailService.process(inbound.id) is None
+        assert TaskComment.objects.filter(task=task).count() == 1
+
+    @pytest.mark.parametrize("local_part", ["task-" + "-" * 36, "task-" + "a" * 36])
+    def test_malformed_task_id_is_ignored(self, local_part):
+        from apps.projects.models import InboundEmail, InboundEmailStatus
+        from apps.projects.services import InboundEmailService
+
+        payload = self._payload(self._task())
+        payload["envelope"]["to"] = f"in+{local_part}@cloudmailin.net"
+        inbound = InboundEmail.objects.create(idempotency_key="k", payload=payload)
+
+        processed = InboundEmailService.process(inbound.id)
+        assert processed.status == InboundEmailStatus.IGNORED
+        assert processed.detail == "no task UUID in address"
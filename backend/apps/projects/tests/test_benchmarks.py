@@ -0,0 +1,47 @@
+"""Smoke tests for the benchmark dataset generator, runner and comparison."""
+
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.projects.management.commands.compare_benchmarks import compare
+from apps.projects.models import Task
+
+
+@pytest.mark.django_db
+def test_seed_and_run_benchmarks(tmp_path):
+    call_command("seed_bench_data", workspaces=1, boards=1, tasks=30, users=3, comments=1)
+    assert Task.objects.filter(parent__isnull=False).exists()
+    assert Task.dependencies.through.objects.exists()
+
+    output = tmp_path / "bench.json"
+    call_command("run_benchmarks", repeat=2, warmup=1, output=str(output))
+    results = json.loads(output.read_text())["results"]
+    assert set(results) >= {"board_detail_admin", "board_detail_member", "task_move"}
+    assert all(r["queries"] > 0 for r in results.values())
+
+
+def test_compare_flags_slowdowns_and_extra_queries(tmp_path):
+    baseline = {
+        "results": {
+            "a": {"median_ms": 10.0, "queries": 5},
+            "b": {"median_ms": 10.0, "queries": 5},
+            "c": {"median_ms": 10.0, "queries": 5},
+        }
+    }
+    current = {
+        "results": {
+            "a": {"median_ms": 11.0, "queries": 5},
+            "b": {"median_ms": 13.0, "queries": 5},
+            "c": {"median_ms": 9.0, "queries": 6},
+        }
+    }
+    rows = compare(baseline, current, threshold=0.2)
+    assert [r["name"] for r in rows if r["regressed"]] == ["b", "c"]
+
+    for name, data in (("base.json", baseline), ("now.json", current)):
+        (tmp_path / name).write_text(json.dumps(data))
+    with pytest.raises(CommandError):
+        call_command("compare_benchmarks", str(tmp_path / "base.json"), str(tmp_path / "now.json"))
@@ -0,0 +1,89 @@
+"""Tests for the versioned-key cache layer."""
+
+import threading
+import uuid
+
+import pytest
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.tests.factories import UserFactory
+from apps.projects import caching
+from apps.projects.services import BoardService, WorkspaceService
+
+
+class TestVersionedCache:
+    def test_bump_invalidates_only_its_scope(self):
+        board, other = uuid.uuid4(), uuid.uuid4()
+        calls = []
+
+        def compute(tag):
+            calls.append(tag)
+            return tag
+
+        assert caching.get_or_compute("board", board, "x", lambda: compute("a")) == "a"
+        assert caching.get_or_compute("board", board, "x", lambda: compute("b")) == "a"
+        caching.get_or_compute("board", other, "x", lambda: compute("o"))
+
+        caching.bump("board", board)
+        assert caching.get_or_compute("board", board, "x", lambda: compute("c")) == "c"
+        assert caching.get_or_compute("board", other, "x", lambda: compute("p")) == "o"
+        assert calls == ["a", "o", "c"]
+        assert caching.stats()["x"] == {"hit": 2, "miss": 3, "wait": 0}
+
+    def test_none_is_cached(self):
+        calls = []
+        for _ in range(2):
+            caching.get_or_compute("user", 1, "maybe", lambda: calls.append(1))
+        assert calls == [1]
+
+    def test_unknown_scope_rejected(self):
+        with pytest.raises(ValueError):
+            caching.bump("team", 1)
+
+    def test_waiter_reuses_value_computed_by_lock_holder(self, local_cache, monkeypatch):
+        monkeypatch.setattr(caching, "LOCK_POLL", 0.01)
+        key = caching.make_key("workspace", 7, "report")
+        local_cache.add(f"{key}:lock", 1)  # another worker is recomputing
+
+        def finish():
+            local_cache.set(key, "from-holder")
+
+        timer = threading.Timer(0.05, finish)
+        timer.start()
+        try:
+            value = caching.get_or_compute("workspace", 7, "report", lambda: "recomputed")
+        finally:
+            timer.cancel()
+        assert value == "from-holder"
+        assert caching.stats()["report"]["wait"] == 1
+
+
+class TestCacheUnavailable:
+    def test_values_are_computed_and_bumps_do_not_raise(self, unreachable_cache):
+        calls = []
+        for _ in range(2):
+            assert caching.get_or_compute("board", 1, "x", lambda: calls.append(1) or "v") == "v"
+        caching.bump("board", 1)
+        assert calls == [1, 1]
+
+    @pytest.mark.django_db
+    def test_writes_succeed_without_the_cache(self, unreachable_cache, api_client):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        column = board.columns.order_by("order").first()
+
+        response = api_client.post(
+            "/tasks",
+            json={"title": "Sin Redis", "column_id": str(column.id)},
+            headers={"Authorization": f"Bearer {create_access_token(user)}"},
+        )
+        assert response.status_code == 201
+
+
+def test_nothing_is_cached_without_a_shared_cache(settings):
+    settings.SHARED_CACHE = False
+    calls = []
+    for _ in range(2):
+        caching.get_or_compute("board", 1, "x", lambda: calls.append(1))
+    assert calls == [1, 1]
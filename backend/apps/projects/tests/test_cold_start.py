@@ -0,0 +1,71 @@
+"""Tests for the cold-start path: lazy imports, boot-time warmup and its benchmark."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from config import warmup
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+DEFERRED = ("celery", "kombu", "google", "apps.projects.tasks", "apps.projects.emails")
+
+
+def test_loading_the_app_defers_celery_email_and_google():
+    script = (
+        f"import sys, config.wsgi\nprint([m for m in sys.modules if m.startswith({DEFERRED!r})])"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_celery_app_still_reachable_from_config():
+    import config
+    from config.celery import app
+
+    assert config.celery_app is app
+    assert set(app.conf.beat_schedule) == {
+        "check-overdue-tasks-daily",
+        "requeue-pending-inbound-emails",
+    }
+
+
+def test_warm_up_times_each_step_and_survives_a_failing_one(monkeypatch):
+    def unreachable():
+        raise OSError("connection refused")
+
+    # Connecting for real would close the test's own connection
+    monkeypatch.setitem(warmup.STEPS, "database", unreachable)
+    timings = warmup.warm_up()
+
+    assert list(timings) == ["urls", "translations", "database", "cache"]
+    assert timings["database"] is None
+    assert all(timings[step] is not None for step in ("urls", "translations", "cache"))
+
+
+def test_warm_up_can_be_disabled(settings):
+    settings.WARMUP_ENABLED = False
+    assert warmup.warm_up() == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.slow
+def test_bench_cold_start(tmp_path):
+    output = tmp_path / "cold-start.json"
+    call_command("bench_cold_start", runs=1, imports=5, output=str(output))
+    report = json.loads(output.read_text())
+
+    assert set(report["results"]) == {"cold", "warm"}
+    assert report["results"]["cold"]["warmup_ms"] < report["results"]["warm"]["warmup_ms"]
+    assert report["results"]["warm"]["status"] == [200]
+    assert report["imports"][0]["module"] == "config.wsgi"
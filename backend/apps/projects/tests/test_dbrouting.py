@@ -0,0 +1,167 @@
+"""Tests for read-replica routing (config/dbrouting.py)."""
+
+import pytest
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Board
+from config import dbrouting
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    """A replica alias whose lag is whatever ``replica.lag`` says; counts the checks."""
+    settings.REPLICA_READS_ENABLED = True
+    monkeypatch.setattr(dbrouting, "replica_configured", lambda: True)
+
+    class Replica:
+        lag = 0.2
+        checks = 0
+
+    def measure_lag():
+        Replica.checks += 1
+        return Replica.lag
+
+    monkeypatch.setattr(dbrouting, "measure_lag", measure_lag)
+    return Replica
+
+
+def test_router_sends_writes_to_the_primary():
+    router = dbrouting.ReplicaRouter()
+    board = Board()
+    board._state.db = dbrouting.REPLICA
+
+    assert router.db_for_read(Board) == dbrouting.PRIMARY
+    assert router.db_for_read(Board, instance=board) == dbrouting.REPLICA
+    assert router.db_for_write(Board, instance=board) == dbrouting.PRIMARY
+    assert router.allow_migrate(dbrouting.PRIMARY, "projects")
+    assert not router.allow_migrate(dbrouting.REPLICA, "projects")
+
+
+def test_primary_without_a_replica():
+    assert dbrouting.read_alias() == dbrouting.PRIMARY
+
+
+def test_fresh_replica_serves_reads_and_lag_is_checked_once_per_interval(replica):
+    assert dbrouting.read_alias() == dbrouting.REPLICA
+    assert dbrouting.read_alias() == dbrouting.REPLICA
+    assert replica.checks == 1
+
+
+@pytest.mark.parametrize("lag", [30.0, None])
+def test_lagging_or_unreachable_replica_falls_back_to_primary(replica, lag):
+    replica.lag = lag
+    assert dbrouting.read_alias() == dbrouting.PRIMARY
+
+
+def test_lag_is_rechecked_after_the_interval(replica, settings):
+    settings.REPLICA_LAG_CHECK_INTERVAL = 0
+    replica.lag = 30.0
+    assert dbrouting.read_alias() == dbrouting.PRIMARY
+    replica.lag = 0.1
+    assert dbrouting.read_alias() == dbrouting.REPLICA
+
+
+@pytest.mark.django_db
+def test_writer_reads_from_primary_after_a_write(replica, api_client):
+    writer, reader = UserFactory(), UserFactory()
+    response = api_client.post(
+        "/workspaces",
+        json={"name": "WS"},
+        headers={"Authorization": f"Bearer {create_access_token(writer)}"},
+    )
+    assert response.status_code == 201
+
+    assert dbrouting.read_alias(writer) == dbrouting.PRIMARY
+    assert dbrouting.read_alias(reader) == dbrouting.REPLICA
+
+
+def test_no_replica_reads_without_a_shared_cache(settings):
+    settings.DATABASES = {**settings.DATABASES, dbrouting.REPLICA: settings.DATABASES["default"]}
+    settings.REPLICA_READS_ENABLED = True
+    assert dbrouting.replica_configured()
+
+    settings.SHARED_CACHE = False  # stickiness would be per process
+    assert not dbrouting.replica_configured()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("unreachable_cache")
+class TestCacheUnavailable:
+    def test_reads_go_to_the_primary(self, replica):
+        assert dbrouting.read_alias(UserFactory()) == dbrouting.PRIMARY
+
+    def test_write_still_succeeds(self, replica, api_client):
+        user = UserFactory()
+        response = api_client.post(
+            "/workspaces",
+            json={"name": "WS"},
+            headers={"Authorization": f"Bearer {create_access_token(user)}"},
+        )
+        assert response.status_code == 201
+
+    def test_write_still_succeeds_under_asgi(self, replica):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        user = UserFactory()
+        response = async_to_sync(AsyncClient().post)(
+            "/api/v1/workspaces",
+            {"name": "WS"},
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {create_access_token(user)}"},
+        )
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_lag_query_reports_nothing_on_a_server_not_replaying(monkeypatch):
+    # The test database is a primary: no WAL received, so no lag figure
+    monkeypatch.setattr(dbrouting, "REPLICA", dbrouting.PRIMARY)
+    assert dbrouting.measure_lag() is None
+
+
+class _ReplicaAnswering:
+    """``connections`` stand-in whose replica answers the lag query with ``row``."""
+
+    def __init__(self, row):
+        self.row = row
+
+    def __getitem__(self, alias):
+        return self
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        pass
+
+    def fetchone(self):
+        return self.row
+
+
+@pytest.mark.parametrize(
+    ("row", "lag"),
+    [
+        ((True, 0), 0.0),
+        ((True, 1.5), 1.5),
+        # Disconnected: replayed all it had, so "no lag" — yet arbitrarily stale
+        ((False, 0), None),
+    ],
+)
+def test_lag_counts_only_while_streaming(monkeypatch, row, lag):
+    monkeypatch.setattr(dbrouting, "connections", _ReplicaAnswering(row))
+    assert dbrouting.measure_lag() == lag
+
+
+def test_replica_not_streaming_is_stale(settings, monkeypatch):
+    settings.REPLICA_READS_ENABLED = True
+    monkeypatch.setattr(dbrouting, "replica_configured", lambda: True)
+    monkeypatch.setattr(dbrouting, "connections", _ReplicaAnswering((False, 0)))
+    assert dbrouting.read_alias() == dbrouting.PRIMARY
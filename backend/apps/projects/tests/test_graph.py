@@ -0,0 +1,281 @@
+"""Tests for the dependency graph engine."""
+
+import gc
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.tests.factories import UserFactory
+from apps.projects import graph
+from apps.projects.services import BoardService, TaskService, WorkspaceService
+
+
+def _auth(user):
+    return {"Authorization": f"Bearer {create_access_token(user)}"}
+
+
+def _ids(n):
+    return [uuid.uuid4() for _ in range(n)]
+
+
+class TestComputeSchedule:
+    def test_critical_path_and_slack(self):
+        a, b, c, d = _ids(4)
+        # a(2) → b(3) → d(1);  a → c(1) → d
+        g = graph.Graph(
+            durations={a: 2, b: 3, c: 1, d: 1},
+            edges=[(a, b), (a, c), (b, d), (c, d)],
+        )
+        schedule = graph.compute_schedule(g)
+        by_id = {n.task_id: n for n in schedule.nodes}
+
+        assert schedule.project_duration == 6
+        assert schedule.critical_path == [a, b, d]
+        assert by_id[c].earliest_start == 2
+        assert by_id[c].latest_start == 4
+        assert by_id[c].slack == 2
+        assert not by_id[c].critical
+
+    def test_topological_order_detects_cycle(self):
+        a, b, c = _ids(3)
+        with pytest.raises(graph.CycleError) as exc:
+            graph.topological_order([a, b, c], [(a, b), (b, c), (c, b)])
+        assert set(exc.value.task_ids) == {b, c}
+
+    # Timed, so CI runs it in its own step without coverage tracing
+    @pytest.mark.slow
+    def test_10k_nodes_under_100ms(self):
+        if sys.gettrace() is not None:
+            pytest.skip("timed — coverage tracing skews it; run with --no-cov")
+        nodes = _ids(10_000)
+        edges = [(nodes[i], nodes[i + 1]) for i in range(len(nodes) - 1)]
+        edges += [(nodes[i], nodes[i + 7]) for i in range(0, len(nodes) - 7, 3)]
+        g = graph.Graph(durations=dict.fromkeys(nodes, 1), edges=edges)
+
+        elapsed = float("inf")
+        gc.disable()  # a collection landing inside one run doubles its time
+        try:
+            for _ in range(5):  # best of five — ignore scheduler noise
+                started = time.perf_counter()
+                schedule = graph.compute_schedule(g)
+                elapsed = min(elapsed, time.perf_counter() - started)
+        finally:
+            gc.enable()
+
+        assert schedule.project_duration == 10_000
+        assert elapsed < 0.1
+
+
+@pytest.mark.django_db
+class TestDependencyGraphService:
+    def _setup(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        return user, board, col
+
+    def test_load_graph_is_one_query(self):
+        from apps.projects.tests.query_budget import assert_query_budget, capture_queries
+
+        def chain(n):
+            user, board, col = self._setup()
+            tasks = [TaskService.create(user, column_id=col.id, title="T0")]
+            for i in range(1, n):
+                tasks.append(
+                    TaskService.create(
+                        user, column_id=col.id, title=f"T{i}", dependency_ids=[tasks[-1].id]
+                    )
+                )
+            loaded, statements = capture_queries(lambda: graph.load_graph(board_id=board.id))
+            expected = {(a.id, b.id) for a, b in zip(tasks, tasks[1:], strict=False)}
+            assert set(loaded.edges) == expected
+            return statements
+
+        small, large = chain(2), chain(6)
+        assert_query_budget("load_graph", small, large, budget=1)
+
+    def test_update_rejects_cycle(self):
+        from ninja.errors import HttpError
+
+        user, _, col = self._setup()
+        a = TaskService.create(user, column_id=col.id, title="A")
+        b = TaskService.create(user, column_id=col.id, title="B", dependency_ids=[a.id])
+        c = TaskService.create(user, column_id=col.id, title="C", dependency_ids=[b.id])
+
+        with pytest.raises(HttpError) as exc:
+            TaskService.update(a, dependency_ids=[c.id])
+        assert exc.value.status_code == 400
+        assert not a.dependencies.exists()
+
+    def test_update_rejects_self_dependency(self):
+        from ninja.errors import HttpError
+
+        user, _, col = self._setup()
+        a = TaskService.create(user, column_id=col.id, title="A")
+        with pytest.raises(HttpError):
+            TaskService.update(a, dependency_ids=[a.id])
+
+    def test_critical_path_endpoint(self, api_client):
+        user, board, col = self._setup()
+        start = date(2026, 1, 5)
+        a = TaskService.create(
+            user, column_id=col.id, title="A", start_date=start, end_date=start + timedelta(days=1)
+        )
+        b = TaskService.create(
+            user,
+            column_id=col.id,
+            title="B",
+            dependency_ids=[a.id],
+            start_date=start,
+            end_date=start + timedelta(days=2),
+        )
+        side = TaskService.create(user, column_id=col.id, title="Side", dependency_ids=[a.id])
+
+        response = api_client.get(f"/boards/{board.id}/critical-path", headers=_auth(user))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["project_duration"] == 5
+        assert data["critical_path"] == [str(a.id), str(b.id)]
+        side_row = next(t for t in data["tasks"] if t["task_id"] == str(side.id))
+        assert side_row["slack"] == 2
+
+    def test_schedule_cache_invalidated_on_write(self):
+        user, board, col = self._setup()
+        a = TaskService.create(user, column_id=col.id, title="A")
+        assert graph.board_schedule(board.id).project_duration == 1
+
+        TaskService.create(user, column_id=col.id, title="B", dependency_ids=[a.id])
+        assert graph.board_schedule(board.id).project_duration == 2
+
+
+@pytest.mark.django_db
+class TestTransitiveBlockers:
+    def _setup(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        columns = list(board.columns.order_by("order"))
+        return user, columns
+
+    def test_move_blocked_by_dependency_of_dependency(self):
+        from ninja.errors import HttpError
+
+        from apps.projects.models import Task
+
+        user, columns = self._setup()
+        a = TaskService.create(user, column_id=columns[0].id, title="A")
+        b = TaskService.create(user, column_id=columns[0].id, title="B", dependency_ids=[a.id])
+        c = TaskService.create(user, column_id=columns[0].id, title="C", dependency_ids=[b.id])
+        Task.objects.filter(id=b.id).update(progress=100)  # direct dependency is done
+
+        with pytest.raises(HttpError) as exc:
+            TaskService.move(c, column_id=columns[1].id, new_order=0, user=user)
+        assert "«A»" in exc.value.message
+
+        Task.objects.filter(id=a.id).update(progress=100)
+        moved = TaskService.move(c, column_id=columns[1].id, new_order=0, user=user)
+        assert moved.column_id == columns[1].id
+
+    def test_blockers_endpoint_includes_parent_dependencies(
+        self, api_client, django_assert_num_queries
+    ):
+        from apps.projects.models import Task
+
+        user, columns = self._setup()
+        upstream = TaskService.create(user, column_id=columns[0].id, title="Upstream")
+        parent = TaskService.create(
+            user, column_id=columns[0].id, title="Parent", dependency_ids=[upstream.id]
+        )
+        Task.objects.filter(id=parent.id).update(progress=100)
+        child = TaskService.create(
+            user, column_id=columns[0].id, title="Child", parent_id=parent.id
+        )
+
+        with django_assert_num_queries(1):
+            blockers = TaskService.blockers(child)
+        assert [(b["title"], b["via"], b["depth"]) for b in blockers] == [
+            ("Upstream", "dependency", 2)
+        ]
+
+        response = api_client.get(f"/tasks/{child.id}/blockers", headers=_auth(user))
+        assert response.status_code == 200
+        assert [b["id"] for b in response.json()] == [str(upstream.id)]
+
+
+@pytest.mark.django_db
+class TestAutoSchedule:
+    def _setup(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        return user, col
+
+    def _task(self, user, col, title, start, days, deps=()):
+        return TaskService.create(
+            user,
+            column_id=col.id,
+            title=title,
+            dependency_ids=list(deps),
+            start_date=start,
+            end_date=start + timedelta(days=days - 1),
+        )
+
+    def test_slip_shifts_downstream_keeping_duration(self, django_assert_max_num_queries):
+        user, col = self._setup()
+        d0 = date(2026, 3, 2)
+        a = self._task(user, col, "A", d0, 2)  # 2–3
+        b = self._task(user, col, "B", d0 + timedelta(days=2), 3, [a.id])  # 4–6
+        c = self._task(user, col, "C", d0 + timedelta(days=10), 1, [b.id])  # has slack
+        other = self._task(user, col, "Other", d0 + timedelta(days=5), 1)  # unrelated
+
+        with django_assert_max_num_queries(4):
+            a.end_date = d0 + timedelta(days=4)  # slips to the 6th
+            rescheduled = graph.reschedule_dependents(a)
+
+        assert [t.id for t in rescheduled] == [b.id]
+        b.refresh_from_db()
+        assert (b.start_date, b.end_date) == (date(2026, 3, 7), date(2026, 3, 9))
+        c.refresh_from_db()
+        other.refresh_from_db()
+        assert c.start_date == d0 + timedelta(days=10)
+        assert other.start_date == d0 + timedelta(days=5)
+
+    def test_update_endpoint_returns_rescheduled(self, api_client):
+        user, col = self._setup()
+        d0 = date(2026, 3, 2)
+        a = self._task(user, col, "A", d0, 1)
+        b = self._task(user, col, "B", d0 + timedelta(days=1), 1, [a.id])
+        c = self._task(user, col, "C", d0 + timedelta(days=2), 2, [b.id])
+
+        response = api_client.put(
+            f"/tasks/{a.id}",
+            json={"end_date": "2026-03-05", "auto_schedule": True},
+            headers=_auth(user),
+        )
+        assert response.status_code == 200
+        shifted = {
+            t["id"]: (t["start_date"], t["end_date"]) for t in response.json()["rescheduled"]
+        }
+        assert shifted == {
+            str(b.id): ("2026-03-06", "2026-03-06"),
+            str(c.id): ("2026-03-07", "2026-03-08"),
+        }
+
+    def test_without_flag_dependents_are_untouched(self, api_client):
+        user, col = self._setup()
+        d0 = date(2026, 3, 2)
+        a = self._task(user, col, "A", d0, 1)
+        b = self._task(user, col, "B", d0 + timedelta(days=1), 1, [a.id])
+
+        response = api_client.put(
+            f"/tasks/{a.id}", json={"end_date": "2026-03-05"}, headers=_auth(user)
+        )
+        assert response.json()["rescheduled"] == []
+        b.refresh_from_db()
+        assert b.start_date == d0 + timedelta(days=1)
@@ -0,0 +1,71 @@
+"""Tests for the worker recycling hooks in gunicorn.conf.py."""
+
+import importlib.util
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+CONF = Path(__file__).resolve().parents[3] / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def conf():
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", CONF)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _worker():
+    return SimpleNamespace(pid=123, alive=True, log=logging.getLogger("gunicorn.error"))
+
+
+def test_worker_over_rss_limit_is_recycled(conf):
+    worker = _worker()
+    conf.post_fork(None, worker)
+    assert 0.9 <= worker.max_rss / (conf.max_worker_rss_mb * 2**20) <= 1.0
+
+    request = SimpleNamespace(path="/api/v1/boards/x")
+    worker.max_rss = 2**40
+    conf.post_request(worker, request, {}, None)
+    assert worker.alive
+
+    worker.max_rss = 1
+    conf.post_request(worker, request, {}, None)
+    assert not worker.alive
+
+
+def test_recycling_defaults(conf):
+    assert conf.max_requests > 0 and conf.max_requests_jitter > 0
+    assert conf.worker_rss_bytes() > 0
+
+
+def test_uvicorn_worker_recycled_by_watchdog(conf, monkeypatch):
+    kills = []
+    monkeypatch.setattr(conf.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(conf.os, "kill", lambda pid, sig: kills.append((pid, sig)))
+    worker = _worker()
+    worker.max_rss = 1
+
+    conf.watch_rss(worker, conf.rss_check_interval)
+    assert kills == [(conf.os.getpid(), conf.signal.SIGTERM)]
+
+
+def test_every_worker_warms_up_and_only_uvicorn_ones_get_a_watchdog(conf, monkeypatch):
+    from config import warmup
+
+    started, warmed = [], []
+    monkeypatch.setattr(conf.threading.Thread, "start", lambda thread: started.append(thread))
+    monkeypatch.setattr(warmup, "warm_up", lambda: warmed.append(True))
+    worker = _worker()
+
+    worker.cfg = SimpleNamespace(worker_class_str="sync")
+    conf.post_worker_init(worker)
+    assert started == []
+
+    worker.cfg = SimpleNamespace(worker_class_str="uvicorn_worker.UvicornWorker")
+    conf.post_worker_init(worker)
+    assert [t.name for t in started] == ["rss-watchdog"]
+    assert len(warmed) == 2
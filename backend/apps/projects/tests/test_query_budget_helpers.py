@@ -0,0 +1,17 @@
+"""Tests for the query-budget assertions (apps.projects.tests.query_budget)."""
+
+import pytest
+
+from apps.projects.tests.query_budget import assert_query_budget
+
+
+def test_failure_reports_repeated_sql():
+    small = ['SELECT "id", "title" FROM "tasks" WHERE "id" = 1']
+    large = [small[0].replace("1", str(i)) for i in (2, 3, 4)]
+    with pytest.raises(pytest.fail.Exception, match=r'3× SELECT … FROM "tasks" WHERE "id" = \?'):
+        assert_query_budget("demo", small, large, budget=10)
+
+
+def test_passes_within_budget():
+    statements = ['SELECT "id" FROM "tasks"', 'SELECT "id" FROM "boards"']
+    assert_query_budget("demo", statements, list(statements), budget=2)
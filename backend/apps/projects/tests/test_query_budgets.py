@@ -0,0 +1,378 @@
+"""
+Query budgets for every API endpoint.
+
+Each case is requested against a dataset of ``SMALL`` and of ``LARGE`` rows per
+collection (members, boards, tasks, subtasks, assignments, dependencies,
+comments, notifications, allowlist entries). The query count must be the same
+for both sizes and within the case's budget; see ``query_budget``.
+
+A budget is the endpoint's current count: raise it in the same change that
+adds a query, never to absorb an N+1.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import Client
+
+from apps.accounts.auth import create_access_token, create_refresh_token
+from apps.accounts.models import AllowedEmail, User
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Notification, NotificationType, TaskAssignment, TaskComment
+from apps.projects.services import BoardService, CommentService, UserDirectoryService
+from apps.projects.tests.factories import BoardFactory, TaskFactory, WorkspaceFactory
+from apps.projects.tests.query_budget import assert_query_budget, capture_queries
+
+pytestmark = pytest.mark.query_budget
+
+SMALL, LARGE = 2, 6
+GOOGLE_EMAIL = "invitado@example.com"
+INBOUND_SECRET = "secreto-webhook"  # noqa: S105 — test value
+
+
+@dataclass
+class Dataset:
+    admin: User
+    member: User
+    people: list
+    workspace: object
+    board: object
+    columns: list
+    task: object  # top-level, no dependencies; has subtasks and comments
+    subtask: object
+    notification: object
+    allowed: object
+    comment: object = None  # with an attachment; only built by cases that need it
+
+
+def build_dataset(n: int) -> Dataset:
+    admin = UserFactory(role=User.UserRole.ADMIN)
+    member = UserFactory(role=User.UserRole.DEVELOPER)
+    people = UserFactory.create_batch(n)
+    workspace = WorkspaceFactory(owner=admin, members=[admin, member, *people])
+    board = BoardService.create(admin, name="Principal", workspace_id=workspace.id)
+    BoardFactory.create_batch(n - 1, workspace=workspace)
+    columns = list(board.columns.order_by("order"))
+
+    today = date.today()
+    tasks = [
+        TaskFactory(
+            column=columns[0],
+            assignee=people[i],
+            created_by=admin,
+            start_date=today - timedelta(days=2),
+            end_date=today + timedelta(days=i),
+        )
+        for i in range(n)
+    ]
+    subtasks = [
+        TaskFactory(column=columns[0], parent=tasks[0], assignee=person) for person in people
+    ]
+    for prev, task in zip(tasks[1:], tasks[2:], strict=False):
+        task.dependencies.add(prev)
+    TaskAssignment.objects.bulk_create(
+        [
+            TaskAssignment(task=task, user=user)
+            for task in tasks + subtasks
+            for user in [member, *people]
+        ]
+    )
+    TaskComment.objects.bulk_create(
+        [
+            TaskComment(task=task, author=person, author_email=person.email, content="Comentario")
+            for task in tasks
+            for person in people
+        ]
+    )
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(user=user, task=task, type=NotificationType.COMMENT, message="Aviso")
+            for task in tasks
+            for user in (admin, member)
+        ]
+    )
+    allowed = AllowedEmail.objects.bulk_create(
+        [AllowedEmail(email=GOOGLE_EMAIL, name="Invitado")]
+        + [AllowedEmail(email=f"allowed{i}@example.com") for i in range(n - 1)]
+    )
+    return Dataset(
+        admin=admin,
+        member=member,
+        people=people,
+        workspace=workspace,
+        board=board,
+        columns=columns,
+        task=tasks[0],
+        subtask=subtasks[0],
+        notification=notifications[0],
+        allowed=allowed[0],
+    )
+
+
+class Case(NamedTuple):
+    name: str
+    budget: int
+    method: str
+    path: str  # relative to /api/v1; formatted with ``d`` = the Dataset
+    body: object = None  # Callable[[Dataset], dict | list] | None
+    as_member: bool = False
+    anonymous: bool = False
+    multipart: bool = False
+    headers: dict | None = None
+    setup: object = None  # Callable[[Dataset], None], run before measuring
+
+
+def _window() -> str:
+    today = date.today()
+    return f"from={today - timedelta(days=7)}&to={today + timedelta(days=30)}"
+
+
+def _attachment(d: Dataset) -> None:
+    upload = SimpleUploadedFile("informe.pdf", b"%PDF-1.4", content_type="application/pdf")
+    d.comment = CommentService.create_with_file(d.admin, d.task, "Adjunto", file=upload)
+
+
+CASES = [
+    # Workspaces
+    Case("list_workspaces", 4, "get", "/workspaces"),
+    Case("create_workspace", 3, "post", "/workspaces", lambda d: {"name": "Nuevo"}),
+    Case(
+        "update_workspace",
+        4,
+        "put",
+        "/workspaces/{d.workspace.id}",
+        lambda d: {"name": "Renombrado"},
+    ),
+    Case("delete_workspace", 6, "delete", "/workspaces/{d.workspace.id}"),
+    Case("workspace_members", 3, "get", "/workspaces/{d.workspace.id}/members"),
+    Case("workspace_timeline", 4, "get", "/workspaces/{d.workspace.id}/timeline?" + _window()),
+    Case("list_users", 3, "get", "/users"),
+    Case("search_users", 2, "get", "/users?q=a"),
+    # Boards
+    Case("list_boards", 3, "get", "/boards"),
+    Case(
+        "create_board",
+        9,
+        "post",
+        "/boards",
+        lambda d: {"name": "Nuevo", "workspace_id": str(d.workspace.id)},
+    ),
+    Case("board_detail", 9, "get", "/boards/{d.board.id}"),
+    Case("board_detail_member", 9, "get", "/boards/{d.board.id}", as_member=True),
+    Case("critical_path", 4, "get", "/boards/{d.board.id}/critical-path"),
+    Case("board_timeline", 4, "get", "/boards/{d.board.id}/timeline?" + _window()),
+    Case("board_tasks", 10, "get", "/boards/{d.board.id}/tasks"),
+    Case(
+        "board_tasks_member",
+        10,
+        "get",
+        "/boards/{d.board.id}/tasks?group_by=assignee",
+        as_member=True,
+    ),
+    Case("update_board", 4, "put", "/boards/{d.board.id}", lambda d: {"name": "Renombrado"}),
+    Case("delete_board", 5, "delete", "/boards/{d.board.id}"),
+    # Columns
+    Case(
+        "create_column",
+        4,
+        "post",
+        "/boards/{d.board.id}/columns",
+        lambda d: {"name": "Revisión", "order": 4},
+    ),
+    Case("update_column", 10, "put", "/columns/{d.columns[0].id}", lambda d: {"name": "Haciendo"}),
+    Case("delete_column", 8, "delete", "/columns/{d.columns[0].id}"),
+    # Tasks
+    Case(
+        "create_task",
+        18,
+        "post",
+        "/tasks",
+        lambda d: {
+            "title": "Nueva",
+            "column_id": str(d.columns[0].id),
+            "assignee_ids": [str(p.id) for p in d.people],
+        },
+    ),
+    Case(
+        "update_task",
+        17,
+        "put",
+        "/tasks/{d.task.id}",
+        lambda d: {
+            "title": "Editada",
+            "assignee_ids": [str(p.id) for p in d.people[1:]],
+            "assignment_progress": [{"user_id": str(p.id), "progress": 50} for p in d.people[1:]],
+        },
+    ),
+    Case("update_subtask", 13, "put", "/tasks/{d.subtask.id}", lambda d: {"progress": 80}),
+    Case("delete_task", 6, "delete", "/tasks/{d.task.id}"),
+    Case("task_blockers", 3, "get", "/tasks/{d.task.id}/blockers"),
+    Case(
+        "move_task",
+        22,
+        "post",
+        "/tasks/{d.task.id}/move",
+        lambda d: {"column_id": str(d.columns[1].id), "new_order": 0},
+    ),
+    Case("my_tasks", 8, "get", "/me/tasks", as_member=True),
+    # Comments
+    Case("list_comments", 3, "get", "/tasks/{d.task.id}/comments"),
+    Case("create_comment", 8, "post", "/tasks/{d.task.id}/comments", lambda d: {"content": "Hola"}),
+    Case(
+        "upload_comment",
+        12,
+        "post",
+        "/tasks/{d.task.id}/comments/upload",
+        lambda d: {
+            "content": "Adjunto",
+            "file": SimpleUploadedFile("a.txt", b"hola", content_type="text/plain"),
+        },
+        multipart=True,
+    ),
+    Case("download_attachment", 2, "get", "/comments/{d.comment.id}/attachment", setup=_attachment),
+    # Search
+    Case("search", 2, "get", "/search?q=task"),
+    # Notifications
+    Case("list_notifications", 2, "get", "/notifications"),
+    Case("notification_count", 2, "get", "/notifications/count"),
+    Case("mark_notification_read", 4, "post", "/notifications/{d.notification.id}/read"),
+    Case("mark_all_read", 2, "post", "/notifications/read-all"),
+    # Auth
+    Case(
+        "login",
+        1,
+        "post",
+        "/auth/login",
+        lambda d: {"email": d.member.email, "password": "testpass123"},
+        anonymous=True,
+    ),
+    Case(
+        "register",
+        6,
+        "post",
+        "/auth/register",
+        lambda d: {
+            "email": "nuevo@example.com",
+            "password": "secreta123",
+            "first_name": "Nuevo",
+            "last_name": "Usuario",
+        },
+        anonymous=True,
+    ),
+    Case(
+        "refresh",
+        1,
+        "post",
+        "/auth/refresh",
+        lambda d: {"refresh": create_refresh_token(d.member)},
+        anonymous=True,
+    ),
+    Case(
+        "google_login", 10, "post", "/auth/google", lambda d: {"id_token": "token"}, anonymous=True
+    ),
+    Case("me", 1, "get", "/auth/me"),
+    # Access administration
+    Case("list_allowed_emails", 2, "get", "/auth/allowed-emails"),
+    Case(
+        "create_allowed_email",
+        3,
+        "post",
+        "/auth/allowed-emails",
+        lambda d: {"email": "otro@example.com"},
+    ),
+    Case(
+        "bulk_allowed_emails",
+        3,
+        "post",
+        "/auth/allowed-emails/bulk",
+        lambda d: [{"email": p.email} for p in d.people] + [{"email": GOOGLE_EMAIL}],
+    ),
+    Case(
+        "update_allowed_email",
+        3,
+        "patch",
+        "/auth/allowed-emails/{d.allowed.id}",
+        lambda d: {"role": User.UserRole.MANAGER},
+    ),
+    Case("delete_allowed_email", 3, "delete", "/auth/allowed-emails/{d.allowed.id}"),
+    Case("list_admin_users", 2, "get", "/auth/admin/users"),
+    Case("activate_user", 3, "patch", "/auth/admin/users/{d.member.id}/activate"),
+    Case("deactivate_user", 3, "patch", "/auth/admin/users/{d.member.id}/deactivate"),
+    Case(
+        "set_user_password",
+        3,
+        "post",
+        "/auth/admin/users/{d.member.id}/set-password",
+        lambda d: {"password": "nueva-clave-123"},
+    ),
+    # Webhooks
+    Case(
+        "inbound_email",
+        6,
+        "post",
+        "/webhooks/inbound-email",
+        lambda d: {
+            "headers": {"Message-ID": "<m1@example.com>"},
+            "envelope": {"from": d.member.email, "to": f"task-{d.task.id}@reply.example.com"},
+            "reply_plain": "Respuesta",
+        },
+        anonymous=True,
+        headers={"HTTP_X_WEBHOOK_SECRET": INBOUND_SECRET},
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def _isolated(settings, tmp_path, monkeypatch, db):
+    settings.RATE_LIMIT_ENABLED = False
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]  # fast fixtures
+    settings.ATTACHMENTS_ROOT = tmp_path
+    settings.INBOUND_EMAIL_SECRET = INBOUND_SECRET
+    # Per-process memos are paid once, not by whichever size runs first
+    UserDirectoryService._trigram_available()
+    monkeypatch.setattr(
+        "apps.accounts.api.verify_google_token",
+        lambda token: {"email": GOOGLE_EMAIL, "email_verified": True, "sub": "google-1"},
+    )
+
+
+def _request(client: Client, case: Case, d: Dataset):
+    kwargs = dict(case.headers or {})
+    if not case.anonymous:
+        user = d.member if case.as_member else d.admin
+        kwargs["HTTP_AUTHORIZATION"] = f"Bearer {create_access_token(user)}"
+    if case.body is not None:
+        body = case.body(d)
+        if case.multipart:
+            kwargs["data"] = body
+        else:
+            kwargs.update(data=body, content_type="application/json")
+    return getattr(client, case.method)("/api/v1" + case.path.format(d=d), **kwargs)
+
+
+def _measure(case: Case, size: int) -> list[str]:
+    client = Client()
+    with transaction.atomic():
+        d = build_dataset(size)
+        if case.setup:
+            case.setup(d)
+        cache.clear()  # every size starts cold
+        response, statements = capture_queries(lambda: _request(client, case, d))
+        transaction.set_rollback(True)
+    assert response.status_code < 400, (
+        f"{case.name}: HTTP {response.status_code} {response.content[:300]!r}"
+    )
+    return statements
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("case", [pytest.param(c, id=c.name) for c in CASES])
+def test_query_count_is_bounded_and_size_independent(case):
+    small = _measure(case, SMALL)
+    large = _measure(case, LARGE)
+    assert_query_budget(case.name, small, large, case.budget)
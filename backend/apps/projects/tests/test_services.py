@@ -1,9 +1,11 @@
 """Tests for the Service Layer."""
 
+from datetime import date
+
 import pytest
 
 from apps.accounts.tests.factories import UserFactory
-from apps.projects.models import Board, ColumnStatus, Task, Workspace
+from apps.projects.models import Board, ColumnStatus, Task, TaskAssignment, Workspace
 from apps.projects.services import BoardService, ColumnService, TaskService, WorkspaceService
 
 
@@ -296,3 +298,257 @@ class TestTaskService:
 
         moved = TaskService.move(t1, column_id=col.id, new_order=0, user=user)
         assert moved.progress == 0
+
+
+@pytest.mark.django_db
+class TestEmailFanOut:
+    def _setup_task(self, collaborators=3):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="Board", workspace_id=ws.id)
+        column = board.columns.order_by("order").first()
+        task = TaskService.create(user, column_id=column.id, title="T")
+        others = [UserFactory() for _ in range(collaborators)]
+        TaskAssignment.objects.bulk_create(
+            [TaskAssignment(task=task, user=u) for u in others]
+        )
+        return user, task, others
+
+    def test_comment_email_links_attachment(self, mailoutbox, settings, tmp_path):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from apps.projects.services import CommentService
+
+        settings.ATTACHMENTS_ROOT = tmp_path
+        user, task, others = self._setup_task()
+        upload = SimpleUploadedFile("a.pdf", b"%PDF", content_type="application/pdf")
+        comment = CommentService.create_with_file(user, task, "Hola", file=upload)
+
+        assert sorted(m.to[0] for m in mailoutbox) == sorted(u.email for u in others)
+        for msg in mailoutbox:
+            assert msg.attachments == []
+            assert f"/api/v1/comments/{comment.id}/attachment?token=" in msg.body
+
+    def test_assignment_emails_render_once_and_personalize(self, mailoutbox):
+        from unittest import mock
+
+        from apps.projects import emails
+        from apps.projects.tasks import send_assignment_notifications
+
+        user, task, others = self._setup_task()
+        with mock.patch.object(emails, "render", wraps=emails.render) as render:
+            send_assignment_notifications(str(task.id), [str(u.id) for u in others])
+
+        assert render.call_count == 1
+        assert len(mailoutbox) == len(others)
+        for msg in mailoutbox:
+            recipient = next(u for u in others if u.email == msg.to[0])
+            html = msg.alternatives[0][0]
+            assert emails.RECIPIENT_NAME_PLACEHOLDER not in html
+            assert recipient.first_name in msg.body
+
+    def test_sync_assignments_notifies_new_assignees_once(self, django_capture_on_commit_callbacks):
+        from unittest import mock
+
+        user, task, _ = self._setup_task(collaborators=0)
+        new_users = [UserFactory(), UserFactory()]
+        with mock.patch(
+            "apps.projects.tasks.send_assignment_notifications"
+        ) as send, django_capture_on_commit_callbacks(execute=True):
+            TaskService.sync_assignments(task, [u.id for u in new_users])
+
+        send.assert_called_once()
+        assert set(send.call_args.args[1]) == {str(u.id) for u in new_users}
+
+
+@pytest.mark.django_db
+class TestAttachmentStorage:
+    def test_save_upload_is_content_addressed(self, settings, tmp_path):
+        import hashlib
+
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from apps.projects import storage
+
+        settings.ATTACHMENTS_ROOT = tmp_path
+        data = b"x" * 200_000
+        sha_a, size_a = storage.save_upload(SimpleUploadedFile("a.bin", data))
+        sha_b, _ = storage.save_upload(SimpleUploadedFile("b.bin", data))
+
+        assert sha_a == sha_b == hashlib.sha256(data).hexdigest()
+        assert size_a == len(data)
+        assert storage.absolute_path(sha_a).read_bytes() == data
+        assert list((tmp_path / "tmp").iterdir()) == []
+
+    def test_stored_files_are_readable_by_nginx(self, settings, tmp_path):
+        import os
+        import stat
+
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from apps.projects import storage
+
+        settings.ATTACHMENTS_ROOT = tmp_path
+        umask = os.umask(0o077)  # whatever the worker's umask, nginx reads as another user
+        try:
+            sha, _ = storage.save_upload(SimpleUploadedFile("a.bin", b"data"))
+        finally:
+            os.umask(umask)
+
+        path = storage.absolute_path(sha)
+        assert path.is_relative_to(tmp_path / "objects")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+        for directory in (path.parent, path.parent.parent, tmp_path / "objects"):
+            assert stat.S_IMODE(directory.stat().st_mode) == 0o755
+
+    def test_duplicate_uploads_share_one_attachment(self, settings, tmp_path):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from apps.projects.models import Attachment
+        from apps.projects.services import CommentService
+
+        settings.ATTACHMENTS_ROOT = tmp_path
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        task = TaskService.create(user, column_id=board.columns.first().id, title="T")
+
+        c1 = CommentService.create_with_file(user, task, "1", SimpleUploadedFile("a.txt", b"hi"))
+        c2 = CommentService.create_with_file(user, task, "2", SimpleUploadedFile("b.txt", b"hi"))
+
+        assert c1.attachment_id == c2.attachment_id
+        assert Attachment.objects.count() == 1
+        assert c2.attachment_filename == "b.txt"
+        assert c2.attachment_size == 2
+
+
+@pytest.mark.django_db
+class TestCheckOverdueTasks:
+    def _board(self, user):
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        return {c.status: c for c in board.columns.all()}
+
+    def test_moves_overdue_tasks_across_boards(self):
+        from datetime import timedelta
+
+        from apps.projects.models import Notification
+        from apps.projects.tasks import check_overdue_tasks
+
+        user = UserFactory()
+        past = date.today() - timedelta(days=3)
+        cols_a, cols_b = self._board(user), self._board(user)
+        already = TaskService.create(
+            user, column_id=cols_a[ColumnStatus.DELAYED].id, title="Ya", end_date=past, order=0
+        )
+        late_1 = TaskService.create(
+            user, column_id=cols_a[ColumnStatus.PENDING].id, title="A1", end_date=past
+        )
+        late_2 = TaskService.create(
+            user, column_id=cols_a[ColumnStatus.IN_PROGRESS].id, title="A2",
+            end_date=past - timedelta(days=1),
+        )
+        late_b = TaskService.create(
+            user, column_id=cols_b[ColumnStatus.PENDING].id, title="B1", end_date=past
+        )
+        done = TaskService.create(
+            user, column_id=cols_a[ColumnStatus.COMPLETED].id, title="Done", end_date=past
+        )
+        future = TaskService.create(
+            user, column_id=cols_a[ColumnStatus.PENDING].id, title="F",
+            end_date=date.today() + timedelta(days=1),
+        )
+
+        assert check_overdue_tasks() == 3
+
+        for task in (already, late_1, late_2, late_b, done, future):
+            task.refresh_from_db()
+        assert late_1.column_id == late_2.column_id == cols_a[ColumnStatus.DELAYED].id
+        assert late_b.column_id == cols_b[ColumnStatus.DELAYED].id
+        assert done.column_id == cols_a[ColumnStatus.COMPLETED].id
+        assert future.column_id == cols_a[ColumnStatus.PENDING].id
+        # Appended after existing DELAYED tasks, most overdue first
+        assert (already.order, late_2.order, late_1.order) == (0, 1, 2)
+        assert late_b.order == 0
+        # Creator gets one coalesced notification
+        assert Notification.objects.filter(user=user).count() == 1
+
+    def test_query_count_independent_of_board_count(self, django_assert_max_num_queries):
+        from datetime import timedelta
+
+        from apps.projects.services import TaskService as Service
+
+        user = UserFactory()
+        past = date.today() - timedelta(days=1)
+        for _ in range(5):
+            cols = self._board(user)
+            pending = cols[ColumnStatus.PENDING].id
+            TaskService.create(user, column_id=pending, title="T", end_date=past)
+
+        with django_assert_max_num_queries(6):
+            moved = Service.move_overdue_to_delayed(date.today())
+        assert sum(len(ids) for ids in moved.values()) == 5
+
+
+@pytest.mark.django_db
+class TestParentProgressRollup:
+    def _setup(self):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        col = board.columns.order_by("order").first()
+        return user, col
+
+    def test_rollup_propagates_up_the_chain(self):
+        user, col = self._setup()
+        milestone = TaskService.create(user, column_id=col.id, title="M", assignee_ids=[user.id])
+        group = TaskService.create(
+            user, column_id=col.id, title="G", parent_id=milestone.id,
+            assignee_id=user.id, assignee_ids=[user.id],
+        )
+        leaf_a = TaskService.create(
+            user, column_id=col.id, title="A", parent_id=group.id, assignee_id=user.id
+        )
+        TaskService.create(
+            user, column_id=col.id, title="B", parent_id=group.id, assignee_id=user.id
+        )
+
+        TaskService.update(leaf_a, progress=100)
+
+        assert TaskAssignment.objects.get(task=group, user=user).individual_progress == 50
+        assert TaskAssignment.objects.get(task=milestone, user=user).individual_progress == 50
+
+    def test_users_without_subtasks_keep_manual_progress(self):
+        user, col = self._setup()
+        other = UserFactory()
+        parent = TaskService.create(
+            user, column_id=col.id, title="P", assignee_ids=[user.id, other.id]
+        )
+        TaskAssignment.objects.filter(task=parent, user=other).update(individual_progress=40)
+        child = TaskService.create(
+            user, column_id=col.id, title="C", parent_id=parent.id, assignee_id=user.id
+        )
+
+        TaskService.update(child, progress=80)
+
+        assert TaskAssignment.objects.get(task=parent, user=user).individual_progress == 80
+        assert TaskAssignment.objects.get(task=parent, user=other).individual_progress == 40
+
+    def test_query_count_independent_of_depth(self, django_assert_max_num_queries):
+        user, col = self._setup()
+        parent = None
+        for depth in range(6):
+            parent = TaskService.create(
+                user, column_id=col.id, title=f"L{depth}", assignee_id=user.id,
+                assignee_ids=[user.id], parent_id=parent.id if parent else None,
+            )
+        leaf = TaskService.create(
+            user, column_id=col.id, title="Leaf", parent_id=parent.id,
+            assignee_id=user.id, progress=100,
+        )
+
+        with django_assert_max_num_queries(4):
+            TaskService.recalculate_parent_progress(leaf)
+        assert set(
+            TaskAssignment.objects.values_list("individual_progress", flat=True)
+        ) == {100}
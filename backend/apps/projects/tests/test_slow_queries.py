@@ -0,0 +1,80 @@
+"""Tests for the slow-query log (config.slowqueries)."""
+
+import json
+import logging
+import uuid
+
+import pytest
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.services import BoardService, WorkspaceService
+from config import slowqueries
+
+
+@pytest.fixture
+def slow_log(settings, caplog):
+    """Treat every statement as slow and collect what gets logged."""
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_SAMPLE_RATE = 1.0
+    slowqueries.reset()
+    logger = logging.getLogger("slow_query")  # does not propagate to caplog's root handler
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+    slowqueries.reset()
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    def test_logs_caller_shape_and_plan(self, slow_log):
+        user = UserFactory()
+        ws = WorkspaceService.create(user, name="WS")
+        board = BoardService.create(user, name="B", workspace_id=ws.id)
+        slowqueries.reset()  # setup statements used up the EXPLAIN allowance
+        slow_log.clear()
+
+        BoardService.get_detail(board.id, user)
+        records = [r for r in slow_log.records if r.caller == "BoardService.get_detail"]
+        assert records
+        first = records[0]
+        assert "UUID" in first.params_shape
+        assert first.plan[0]["Plan"]["Node Type"]
+        assert str(board.id) not in first.getMessage() + json.dumps(first.plan)
+
+    def test_explains_are_rate_limited_and_deduplicated(self, slow_log, settings):
+        settings.SLOW_QUERY_EXPLAIN_PER_MINUTE = 2
+        user = UserFactory()
+        slowqueries.reset()
+        slow_log.clear()
+        for _ in range(3):
+            WorkspaceService.list_for_user(user).count()
+        plans = [r.plan for r in slow_log.records if r.plan is not None]
+        assert 1 <= len(plans) <= 2
+        fingerprints = [r.fingerprint for r in slow_log.records if r.plan is not None]
+        assert len(fingerprints) == len(set(fingerprints))
+
+    def test_failed_explain_keeps_transaction_usable(self):
+        from django.db import connection
+
+        assert slowqueries.explain(connection, "SELECT * FROM no_such_table", None) is None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchone() == (1,)
+
+    def test_plan_masks_unquoted_numbers(self):
+        from django.db import connection
+
+        from apps.projects.models import Task
+
+        query = Task.objects.filter(progress__lt=87, title="Secreto").values("id").query
+        sql, params = query.sql_with_params()
+        with connection.cursor():  # opens the connection
+            plan = json.dumps(slowqueries.explain(connection, sql, params))
+        assert "87" not in plan and "Secreto" not in plan
+        assert "progress < ?" in plan
+
+
+def test_param_shape_hides_values():
+    assert slowqueries.param_shape((uuid.uuid4(), "x", [1, 2, 3], None)) == (
+        "(UUID, str, list[3], NoneType)"
+    )
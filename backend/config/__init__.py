@@ -1,3 +1,12 @@
-from .celery import app as celery_app
-
+# The Celery app loads on first use, not with every process that imports
+# ``config`` — web workers only need it to enqueue (apps/projects/tasks.py
+# imports it before declaring the tasks).
 __all__ = ["celery_app"]
+
+
+def __getattr__(name):
+    if name == "celery_app":
+        from .celery import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
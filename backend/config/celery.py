@@ -1,13 +1,68 @@
 """
 Celery configuration for Stward Task.
+
+Every task's run time and failures are recorded in the Prometheus metrics
+(config/metrics.py) through the task signals below. With
+``PROMETHEUS_MULTIPROC_DIR`` set, the worker empties it on startup, like
+gunicorn.conf.py does for the web workers.
 """
 
+import glob
 import os
+import time
 
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import task_failure, task_postrun, task_prerun, worker_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
 
 app = Celery("stward")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks(["apps.projects"])
+
+# Periodic tasks (celery beat)
+app.conf.beat_schedule = {
+    "check-overdue-tasks-daily": {
+        "task": "apps.projects.tasks.check_overdue_tasks",
+        "schedule": crontab(hour=0, minute=5),  # Every day at 00:05
+    },
+    "requeue-pending-inbound-emails": {
+        "task": "apps.projects.tasks.requeue_pending_inbound_emails",
+        "schedule": crontab(minute="*/10"),
+    },
+}
+
+_task_started: dict[str, float] = {}
+
+
+@worker_init.connect
+def _reset_metrics_dir(**kwargs):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+@task_prerun.connect
+def _start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _observe_task(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    from config.metrics import observe_task
+
+    observe_task(task.name, state or "UNKNOWN", time.perf_counter() - started)
+
+
+@task_failure.connect
+def _count_task_failure(sender=None, exception=None, **kwargs):
+    from config.metrics import TASK_FAILURES
+
+    TASK_FAILURES.labels(getattr(sender, "name", "unknown"), type(exception).__name__).inc()
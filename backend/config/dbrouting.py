@@ -0,0 +1,214 @@
+"""
+Read-replica routing.
+
+When ``DB_REPLICA_HOST`` is set, settings add a ``replica`` database alias — a
+streaming replica of ``default``. Nothing reads from it implicitly: the
+services behind the polled, read-only endpoints (board detail, timelines,
+workspace list, notifications) ask ``read_alias(user)`` where to read and
+query ``.using()`` it. Everything else, and every write, stays on the primary.
+
+``read_alias`` answers the primary when:
+
+- no replica is configured, ``REPLICA_READS_ENABLED`` is off, or the cache is
+  not shared (``SHARED_CACHE``, i.e. no ``REDIS_CACHE_URL``) — the sticky flag
+  below would only be seen by the worker that set it;
+- the user wrote recently — ``ReadYourWritesMiddleware`` marks a user sticky
+  for ``REPLICA_STICKY_SECONDS`` after any unsafe request (shared cache, so
+  every worker honours it), so nobody reads their own change back stale;
+- the cache cannot be reached, so whether the user wrote recently is unknown;
+- the replica lags more than ``REPLICA_MAX_LAG`` seconds behind, is not
+  streaming from the primary, or cannot be reached. Lag is measured on the
+  replica at most every ``REPLICA_LAG_CHECK_INTERVAL`` seconds per process and
+  exported as the ``db_replica_lag_seconds`` gauge.
+
+A write whose sticky flag cannot be stored is logged, not failed: it has
+already committed.
+
+``ReplicaRouter`` keeps the rest consistent: objects loaded from the replica
+fetch their relations (and prefetches) from it too, but are always saved to the
+primary, and migrations only run on the primary.
+
+Settings:
+    REPLICA_READS_ENABLED: bool (default True)
+    REPLICA_MAX_LAG: float — seconds of lag tolerated (default 5)
+    REPLICA_LAG_CHECK_INTERVAL: float — seconds between lag checks (default 5)
+    REPLICA_STICKY_SECONDS: int — primary-only window after a write (default 15)
+"""
+
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+from config.metrics import DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Whether a WAL receiver is streaming from the primary, and the lag: zero while
+# the replica has replayed everything it received — an idle primary sends
+# nothing, and the last replay timestamp would age without any real lag. A
+# replica cut off from the primary has also replayed all it received, so the
+# lag only means something while it streams.
+_LAG_SQL = """
+    SELECT
+        EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'),
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+"""
+
+_lock = threading.Lock()
+_lag_state = {"checked": float("-inf"), "fresh": False}
+
+
+class ReplicaRouter:
+    """Reads follow the instance they hang off; writes and migrations go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both sides of the replication
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA} or None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+# ─────────────────────────────────────────────────
+# Choosing where to read
+# ─────────────────────────────────────────────────
+def replica_configured() -> bool:
+    return (
+        REPLICA in settings.DATABASES
+        and getattr(settings, "REPLICA_READS_ENABLED", True)
+        and getattr(settings, "SHARED_CACHE", False)
+    )
+
+
+def read_alias(user=None) -> str:
+    """Database alias for a read-only query on behalf of ``user``."""
+    if not replica_configured():
+        return PRIMARY
+    if user is not None:
+        try:
+            sticky = cache.get(_sticky_key(user.id))
+        except Exception as exc:
+            logger.error("Cache unavailable, reading from the primary: %s", exc)
+            return PRIMARY
+        if sticky:
+            return PRIMARY
+    return REPLICA if _replica_fresh() else PRIMARY
+
+
+async def aread_alias(user=None) -> str:
+    return await sync_to_async(read_alias)(user)
+
+
+def _sticky_key(user_id) -> str:
+    return f"db:sticky:{user_id}"
+
+
+def _replica_fresh() -> bool:
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5)
+    now = time.monotonic()
+    with _lock:
+        if now - _lag_state["checked"] < interval:
+            return _lag_state["fresh"]
+        _lag_state["checked"] = now  # other threads keep the last answer meanwhile
+
+    lag = measure_lag()
+    fresh = lag is not None and lag <= getattr(settings, "REPLICA_MAX_LAG", 5)
+    if not fresh:
+        logger.warning("Replica lag %s s over the limit; reading from the primary", lag)
+    with _lock:
+        _lag_state["fresh"] = fresh
+    return fresh
+
+
+def measure_lag() -> float | None:
+    """
+    Seconds the replica is behind the primary, or None if it cannot tell —
+    unreachable, or not streaming, so its data may be arbitrarily old.
+    """
+    try:
+        with connections[REPLICA].cursor() as cursor:
+            cursor.execute(_LAG_SQL)
+            streaming, lag = cursor.fetchone()
+    except DatabaseError as exc:
+        logger.warning("Replica lag check failed: %s", exc)
+        return None
+    if not streaming:
+        logger.warning("Replica is not streaming from the primary")
+        return None
+    lag = None if lag is None else float(lag)
+    if lag is not None:
+        DB_REPLICA_LAG.set(lag)
+    return lag
+
+
+def reset() -> None:
+    """Forget the last lag check (tests)."""
+    with _lock:
+        _lag_state.update(checked=float("-inf"), fresh=False)
+
+
+# ─────────────────────────────────────────────────
+# Read-your-writes
+# ─────────────────────────────────────────────────
+class ReadYourWritesMiddleware:
+    """After a user's unsafe request, keep their reads on the primary for a while."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        key = self._sticky_key_for(request)
+        if key:
+            try:
+                cache.set(key, 1, getattr(settings, "REPLICA_STICKY_SECONDS", 15))
+            except Exception as exc:
+                logger.error("Cache unavailable, writer not kept on the primary: %s", exc)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        key = self._sticky_key_for(request)
+        if key:
+            try:
+                await cache.aset(key, 1, getattr(settings, "REPLICA_STICKY_SECONDS", 15))
+            except Exception as exc:
+                logger.error("Cache unavailable, writer not kept on the primary: %s", exc)
+        return response
+
+    @staticmethod
+    def _sticky_key_for(request) -> str | None:
+        if request.method in SAFE_METHODS or not replica_configured():
+            return None
+        # Set by Ninja's authentication on the way in
+        user_id = getattr(getattr(request, "auth", None), "id", None)
+        return _sticky_key(user_id) if user_id else None
@@ -0,0 +1,295 @@
+"""
+Per-request instrumentation: SQL query count and time, serialization time and
+total time.
+
+Every request gets a ``RequestMetrics`` (reachable through ``current_metrics()``).
+Queries are counted by a ``connection.execute_wrapper`` installed on every
+database connection when it is opened (``install``), which records into the
+metrics of the current request — held in a context variable, so it is also
+found from the threads the async ORM runs queries in — and JSON rendering is
+timed by ``TimedJSONRenderer``. The figures are returned in a ``Server-Timing``
+header, written to the JSON access log and recorded in the Prometheus metrics
+(config/metrics.py) by route; a request that runs more queries than its
+route's budget logs a warning with the most repeated SQL fingerprints.
+
+A sampled fraction of requests (``REQUEST_MEMORY_SAMPLE_RATE``) also runs under
+``tracemalloc`` to measure its peak Python heap growth. Tracing is process-wide
+(and slows allocation down), so a request is traced only when it is the only
+one in flight in its process, and its sample is dropped if another one starts
+before it ends — always the case in a sync worker, the quiet moments under ASGI.
+
+The middleware serves both WSGI and ASGI. Under ASGI a sync view runs in a
+thread of its own for the request: ``process_view`` — which Django runs in that
+thread — notes it, and the request's CPU time is read from that thread's clock
+(``pthread_getcpuclockid``; Linux, elsewhere none is reported). Async views
+report no CPU time: other requests interleave with them on the event loop, so
+the figure would not be theirs alone.
+
+Settings:
+    REQUEST_METRICS_ENABLED: bool (default True)
+    QUERY_BUDGET_DEFAULT: int | None — queries allowed per request (default 50)
+    QUERY_BUDGETS: dict — route pattern (e.g. "api/v1/boards/<board_id>")
+        → budget, overriding the default
+    REQUEST_MEMORY_SAMPLE_RATE: float — fraction of requests traced (default 0)
+"""
+
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from ninja.renderers import JSONRenderer
+
+from config import metrics as prometheus
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("access")
+
+_current: contextvars.ContextVar["RequestMetrics | None"] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+# Requests in flight in this process, and the one whose memory is being traced
+_flight = threading.Lock()
+_flight_state: dict = {"requests": 0, "traced": None}
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literals and placeholders collapsed, so repeats of one query group together."""
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LISTS.sub("(?, …)", sql)
+    return _SPACES.sub(" ", sql).strip()[:300]
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    cpu_started: float | None = field(default_factory=time.thread_time)
+    cpu_thread: int | None = None  # thread measured, when not the current one (ASGI)
+    queries: int = 0
+    db_time: float = 0.0
+    serialize_time: float = 0.0
+    memory_peak: int | None = None  # bytes, sampled requests only
+    memory_shared: bool = False  # another request ran while this one was traced
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record_query(self, sql: str, duration: float) -> None:
+        self.queries += 1
+        self.db_time += duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def cpu_time(self) -> float | None:
+        """CPU consumed by the request's thread since it started."""
+        if self.cpu_started is None:
+            return None
+        if self.cpu_thread is None:
+            return time.thread_time() - self.cpu_started
+        now = _thread_cpu(self.cpu_thread)
+        return None if now is None else now - self.cpu_started
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Metrics of the request being handled on this thread/task, if any."""
+    return _current.get()
+
+
+def _thread_cpu(thread_id: int) -> float | None:
+    """CPU time of another thread of this process, where the platform can tell."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        return None
+
+
+def _request_started(metrics: RequestMetrics) -> bool:
+    """
+    Count the request in flight; start tracing its allocations if it is sampled
+    and alone in the process. Returns whether it is traced.
+    """
+    rate = getattr(settings, "REQUEST_MEMORY_SAMPLE_RATE", 0.0)
+    sampled = rate > 0 and random.random() < rate  # noqa: S311
+    with _flight:
+        _flight_state["requests"] += 1
+        traced = _flight_state["traced"]
+        if traced is not None:
+            traced.memory_shared = True  # its peak would include this request's
+            return False
+        if not sampled or _flight_state["requests"] > 1 or tracemalloc.is_tracing():
+            return False
+        _flight_state["traced"] = metrics
+        tracemalloc.start()
+        return True
+
+
+def _request_finished(metrics: RequestMetrics, tracing: bool) -> None:
+    with _flight:
+        _flight_state["requests"] -= 1
+        if not tracing:
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _flight_state["traced"] = None
+    if not metrics.memory_shared:
+        metrics.memory_peak = peak
+
+
+def _record(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.record_query(sql, time.perf_counter() - started)
+
+
+def install(sender=None, connection=None, **kwargs) -> None:
+    """``connection_created`` receiver: count this connection's queries per request."""
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """Ninja JSON renderer that adds its rendering time to the request metrics."""
+
+    def render(self, request, data, *, response_status):
+        started = time.perf_counter()
+        try:
+            return super().render(request, data, response_status=response_status)
+        finally:
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.serialize_time += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures every request and reports it. Place first in MIDDLEWARE so the
+    total covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        prometheus.REQUESTS_IN_FLIGHT.inc()
+        tracing = _request_started(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_finished(metrics, tracing)
+            prometheus.REQUESTS_IN_FLIGHT.dec()
+            _current.reset(token)
+        return self._report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(cpu_started=None)  # set by process_view for sync views
+        token = _current.set(metrics)
+        prometheus.REQUESTS_IN_FLIGHT.inc()
+        tracing = _request_started(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_finished(metrics, tracing)
+            prometheus.REQUESTS_IN_FLIGHT.dec()
+            _current.reset(token)
+        return self._report(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Under ASGI, Django runs this — a sync method — in the thread the request's
+        sync view will run in; start that thread's CPU clock.
+        """
+        metrics = _current.get()
+        if metrics is None or metrics.cpu_started is not None or iscoroutinefunction(view_func):
+            return None
+        thread = threading.get_ident()
+        metrics.cpu_started = _thread_cpu(thread)
+        metrics.cpu_thread = thread
+        return None
+
+    def _report(self, request, response, metrics: RequestMetrics):
+        total = metrics.total_time
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+                f"ser;dur={metrics.serialize_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+        route = getattr(request.resolver_match, "route", None) or ""
+        extra = {
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 1),
+            "db_queries": metrics.queries,
+            "db_ms": round(metrics.db_time * 1000, 1),
+            "serialize_ms": round(metrics.serialize_time * 1000, 1),
+        }
+        if metrics.memory_peak is not None:
+            extra["memory_peak_kb"] = metrics.memory_peak // 1024
+        access_logger.info(
+            "%s %s %s", request.method, request.path, response.status_code, extra=extra
+        )
+        prometheus.observe_request(
+            request.method,
+            route,
+            response.status_code,
+            duration=total,
+            cpu=metrics.cpu_time,
+            queries=metrics.queries,
+            db_time=metrics.db_time,
+            memory_peak=metrics.memory_peak,
+        )
+        self._check_budget(request, route, metrics)
+        return response
+
+    @staticmethod
+    def _check_budget(request, route: str, metrics: RequestMetrics) -> None:
+        budgets = getattr(settings, "QUERY_BUDGETS", {})
+        budget = budgets.get(route, getattr(settings, "QUERY_BUDGET_DEFAULT", 50))
+        if budget is None or metrics.queries <= budget:
+            return
+        top = "; ".join(f"{n}× {sql}" for sql, n in metrics.fingerprints.most_common(5))
+        logger.warning(
+            "Query budget exceeded: %s %s ran %d queries (budget %d). Top: %s",
+            request.method,
+            route or request.path,
+            metrics.queries,
+            budget,
+            top,
+        )
@@ -0,0 +1,198 @@
+"""
+Prometheus metrics: API latency and CPU per route, DB load and replica lag,
+cache and rate limiter outcomes, Celery task durations — scraped from ``GET /metrics``.
+
+Requests are observed by ``RequestMetricsMiddleware`` (see instrumentation.py),
+cache lookups by ``apps.projects.caching`` and rejections by the rate limiter;
+Celery tasks through the task signals connected in ``config.celery``.
+
+Under gunicorn every worker is a separate process, so the client library runs
+in multiprocess mode: set ``PROMETHEUS_MULTIPROC_DIR`` in the environment
+before the process starts (gunicorn.conf.py prepares and cleans it) and each
+process writes its samples to files there. ``/metrics`` merges the files of
+every directory in ``METRICS_DIRS`` — the web workers' and, when the volume is
+shared, the Celery workers' — into one set of series. Without the variable
+(runserver, tests) the in-process default registry is served.
+
+Settings:
+    METRICS_ENABLED: bool (default True; in production only with a token)
+    METRICS_TOKEN: str — bearer token required to scrape (default "": open,
+        for development and the compose stack, where nginx does not proxy
+        /metrics; production settings turn the endpoint off without one, as
+        Cloud Run exposes it publicly)
+    METRICS_DIRS: list[str] — multiprocess directories merged on scrape
+        (default: PROMETHEUS_MULTIPROC_DIR)
+"""
+
+import glob
+import hmac
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# ─────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of a request through the whole middleware stack.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_CPU = Counter(
+    "http_request_cpu_seconds",
+    "CPU time of the thread running the request, for sync views (WSGI or ASGI).",
+    ["method", "route"],
+)
+REQUEST_MEMORY_PEAK = Histogram(
+    "http_request_memory_peak_bytes",
+    "Peak Python heap growth during a request (tracemalloc, sampled requests only).",
+    ["route"],
+    buckets=tuple(mb * 2**20 for mb in (1, 2, 5, 10, 25, 50, 100, 250)),
+)
+WORKER_RECYCLES = Counter(
+    "worker_recycles",
+    "Gunicorn workers retired by the recycling policy (gunicorn.conf.py).",
+    ["reason"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled right now.",
+    multiprocess_mode="livesum",
+)
+
+# ─────────────────────────────────────────────────
+# Database
+# ─────────────────────────────────────────────────
+DB_QUERIES = Counter(
+    "db_queries",
+    "SQL queries executed while handling requests.",
+    ["route"],
+)
+DB_TIME = Counter(
+    "db_query_duration_seconds",
+    "Time spent in SQL queries while handling requests.",
+    ["route"],
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag of the read replica at its last check (config/dbrouting.py).",
+    multiprocess_mode="max",
+)
+
+# ─────────────────────────────────────────────────
+# Cache and rate limiting
+# ─────────────────────────────────────────────────
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Versioned-cache lookups by value name and result (hit, miss, wait).",
+    ["name", "result"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections",
+    "Requests answered 429 by the rate limiter.",
+    ["scope"],
+)
+
+# ─────────────────────────────────────────────────
+# Celery
+# ─────────────────────────────────────────────────
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Run time of a Celery task by final state.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_FAILURES = Counter(
+    "celery_task_failures",
+    "Celery tasks that raised, by exception type.",
+    ["task", "exception"],
+)
+
+
+# ─────────────────────────────────────────────────
+# Recording
+# ─────────────────────────────────────────────────
+def observe_request(
+    method: str,
+    route: str,
+    status: int,
+    *,
+    duration: float,
+    cpu: float | None,
+    queries: int,
+    db_time: float,
+    memory_peak: int | None = None,
+) -> None:
+    """Record one finished request. ``route`` is the URL pattern, never the raw path."""
+    route = route or UNMATCHED_ROUTE
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(duration)
+    if cpu is not None:
+        REQUEST_CPU.labels(method, route).inc(cpu)
+    if memory_peak is not None:
+        REQUEST_MEMORY_PEAK.labels(route).observe(memory_peak)
+    if queries:
+        DB_QUERIES.labels(route).inc(queries)
+        DB_TIME.labels(route).inc(db_time)
+
+
+def observe_task(task: str, state: str, duration: float) -> None:
+    TASK_DURATION.labels(task, state).observe(duration)
+
+
+# ─────────────────────────────────────────────────
+# Exposition
+# ─────────────────────────────────────────────────
+class _MergedDirsCollector:
+    """``MultiProcessCollector`` over the files of several directories at once."""
+
+    def __init__(self, paths: list[str]):
+        self.paths = paths
+
+    def collect(self):
+        files = [f for path in self.paths for f in glob.glob(os.path.join(path, "*.db"))]
+        return MultiProcessCollector.merge(files, accumulate=True)
+
+
+def _metric_dirs() -> list[str]:
+    dirs = getattr(settings, "METRICS_DIRS", None)
+    if dirs is None:
+        dirs = [os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")]
+    return [d for d in dirs if d]
+
+
+def _registry():
+    dirs = _metric_dirs()
+    if not dirs:
+        return REGISTRY
+    registry = CollectorRegistry()
+    registry.register(_MergedDirsCollector(dirs))
+    return registry
+
+
+def metrics_view(request):
+    """Prometheus text exposition of everything above."""
+    if not getattr(settings, "METRICS_ENABLED", True):
+        return HttpResponseNotFound()
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponseForbidden()
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
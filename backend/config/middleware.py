@@ -1,16 +1,30 @@
 """Custom security middleware."""
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 
 
 class CSPMiddleware:
     """Adds Content-Security-Policy header to responses in production."""
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._add_policy(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._add_policy(await self.get_response(request))
+
+    @staticmethod
+    def _add_policy(response):
         policy = getattr(settings, "CSP_POLICY", None)
         if policy:
             response["Content-Security-Policy"] = policy
@@ -0,0 +1,283 @@
+"""
+On-demand profiling of individual production requests.
+
+An administrator adds ``X-Profile: sample`` (or ``cprofile``) to a request —
+or ``?__profile=sample`` where headers are awkward — and the rest of the
+middleware chain and the view run under a profiler:
+
+- ``sample``: a background thread snapshots the request thread's stack every
+  ``PROFILING_SAMPLE_INTERVAL`` seconds. Low overhead, so timings stay
+  realistic; the output is in collapsed-stack format (``a;b;c 12``), readable
+  by flamegraph.pl, inferno and speedscope.
+- ``cprofile``: deterministic ``cProfile`` stats (``.pstats``), exact call
+  counts at a noticeable overhead; open with snakeviz or ``pstats``.
+
+The profile is written to ``PROFILING_DIR`` and its file name returned in the
+``X-Profile`` response header. Where that directory cannot be reached — Cloud
+Run's filesystem is per instance and gone with it — add ``X-Profile-Download:
+1`` (or ``?__profile_download=1``): the response body is then the profile
+itself, as an attachment, with the view's own status in ``X-Profile-Status``.
+
+Only users with the ``administrador`` role (checked against the request's JWT)
+can trigger it; everyone else's flag is ignored. Profiles are capped at
+``PROFILING_MAX_PER_HOUR`` across workers (shared cache) and one at a time per
+process; over the cap — or when the cache cannot be reached — the request runs
+normally and ``X-Profile: rate-limited`` is returned.
+
+Under ASGI a request is not pinned to one thread: its view runs on the event
+loop, alongside other requests, and its ORM calls in worker threads. There
+``sample`` snapshots every thread of the worker, and ``cprofile`` covers the
+event-loop thread only — both also see whatever else the worker was doing, so
+profile async endpoints on a quiet worker or read the output with that in mind.
+
+Settings:
+    PROFILING_ENABLED: bool (default True)
+    PROFILING_DIR: Path — where profiles are written
+    PROFILING_MAX_PER_HOUR: int (default 10)
+    PROFILING_SAMPLE_INTERVAL: float — seconds between samples (default 0.005)
+"""
+
+import cProfile
+import logging
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sample", "cprofile")
+HEADER = "X-Profile"
+QUERY_FLAG = "__profile"
+DOWNLOAD_HEADER = "X-Profile-Download"
+DOWNLOAD_FLAG = "__profile_download"
+
+_running = threading.Lock()  # one profile at a time per process
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack from a background thread, or every
+    thread's (``thread_id=None``, each stack rooted at its thread's name).
+    """
+
+    def __init__(self, thread_id: int | None, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frame = frames.get(self.thread_id)
+                if frame is not None:
+                    self.stacks[self._collapse(frame)] += 1
+                continue
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident != self._thread.ident:
+                    thread = names.get(ident, str(ident))
+                    self.stacks[f"{thread};{self._collapse(frame)}"] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text: one ``root;…;leaf count`` line per distinct stack."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests flagged by an administrator. Place right after
+    RequestMetricsMiddleware so the profile covers the rest of the chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self._mode(request)
+        if mode is None:
+            return self.get_response(request)
+        if not self._is_admin(request):
+            return self.get_response(request)
+        if not self._acquire():
+            response = self.get_response(request)
+            response[HEADER] = "rate-limited"
+            return response
+
+        try:
+            started = time.perf_counter()
+            if mode == "cprofile":
+                profiler = cProfile.Profile()
+                response = profiler.runcall(self.get_response, request)
+            else:
+                interval = getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.005)
+                with StackSampler(threading.get_ident(), interval) as sampler:
+                    response = self.get_response(request)
+            elapsed = time.perf_counter() - started
+        finally:
+            _running.release()
+
+        output = profiler if mode == "cprofile" else sampler
+        return self._save(request, response, mode, output, elapsed)
+
+    async def __acall__(self, request):
+        mode = self._mode(request)
+        if mode is None:
+            return await self.get_response(request)
+        if not await self._ais_admin(request):
+            return await self.get_response(request)
+        if not await sync_to_async(self._acquire)():
+            response = await self.get_response(request)
+            response[HEADER] = "rate-limited"
+            return response
+
+        try:
+            started = time.perf_counter()
+            if mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    profiler.disable()
+            else:
+                interval = getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.005)
+                with StackSampler(None, interval) as sampler:
+                    response = await self.get_response(request)
+            elapsed = time.perf_counter() - started
+        finally:
+            _running.release()
+
+        output = profiler if mode == "cprofile" else sampler
+        return await sync_to_async(self._save)(request, response, mode, output, elapsed)
+
+    @staticmethod
+    def _mode(request) -> str | None:
+        """The requested profiling mode, or None when the request is not profiled."""
+        mode = (request.headers.get(HEADER) or request.GET.get(QUERY_FLAG) or "").lower()
+        if mode not in MODES or not getattr(settings, "PROFILING_ENABLED", True):
+            return None
+        return mode
+
+    def _save(self, request, response, mode: str, output, elapsed: float):
+        path = self._path_for(request, mode)
+        if mode == "cprofile":
+            output.dump_stats(path)
+        else:
+            path.write_text(output.collapsed())
+        logger.info(
+            "Profiled %s %s (%s, %.0f ms) → %s",
+            request.method,
+            request.path,
+            mode,
+            elapsed * 1000,
+            path.name,
+        )
+        if not self._download(request):
+            response[HEADER] = path.name
+            return response
+        response.close()
+        download = HttpResponse(
+            path.read_bytes(),
+            content_type="text/plain" if mode == "sample" else "application/octet-stream",
+        )
+        download["Content-Disposition"] = f'attachment; filename="{path.name}"'
+        download[HEADER] = path.name
+        download["X-Profile-Status"] = str(response.status_code)
+        return download
+
+    @staticmethod
+    def _download(request) -> bool:
+        """Whether the profile should replace the response body."""
+        flag = request.headers.get(DOWNLOAD_HEADER) or request.GET.get(DOWNLOAD_FLAG) or ""
+        return flag.lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def _bearer_token(request) -> str | None:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        return token
+
+    @classmethod
+    def _is_admin(cls, request) -> bool:
+        from apps.accounts.auth import jwt_auth
+        from apps.accounts.models import User
+
+        token = cls._bearer_token(request)
+        user = jwt_auth.authenticate(request, token) if token else None
+        return user is not None and user.role == User.UserRole.ADMIN
+
+    @classmethod
+    async def _ais_admin(cls, request) -> bool:
+        from apps.accounts.auth import async_jwt_auth
+        from apps.accounts.models import User
+
+        token = cls._bearer_token(request)
+        user = await async_jwt_auth.authenticate(request, token) if token else None
+        return user is not None and user.role == User.UserRole.ADMIN
+
+    @staticmethod
+    def _acquire() -> bool:
+        """Take the per-process slot and one unit of the hourly allowance."""
+        if not _running.acquire(blocking=False):
+            return False
+        key = f"prof:{int(time.time() // 3600)}"
+        allowed = False
+        try:
+            cache.add(key, 0, 3600)
+            allowed = cache.incr(key) <= getattr(settings, "PROFILING_MAX_PER_HOUR", 10)
+        except ValueError:  # evicted between add and incr
+            pass
+        except Exception as exc:
+            logger.error("Cache unavailable, request not profiled: %s", exc)
+        finally:
+            if not allowed:
+                _running.release()
+        return allowed
+
+    @staticmethod
+    def _path_for(request, mode: str) -> Path:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        route = getattr(request.resolver_match, "route", "") or request.path
+        slug = _SLUG.sub("-", route.lower()).strip("-")[:60] or "root"
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        suffix = "pstats" if mode == "cprofile" else "collapsed"
+        return directory / f"{stamp}-{slug}-{uuid.uuid4().hex[:8]}.{suffix}"
@@ -1,14 +1,22 @@
 """
 Rate limiting middleware using Django's cache framework.
 Limits per-IP with stricter limits on auth endpoints.
+Rejections are counted in the ``rate_limit_rejections_total`` metric.
+If the cache fails, requests are let through rather than answered 500.
 """
 
+import logging
 import time
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.core.cache import cache
 from django.http import JsonResponse
 
+from config.metrics import RATE_LIMIT_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
 
 class RateLimitMiddleware:
     """
@@ -22,48 +30,80 @@ class RateLimitMiddleware:
         RATE_LIMIT_AUTH_WINDOW: int — window for auth endpoints (default 60)
     """
 
+    sync_capable = True
+    async_capable = True
+
+    # Strict limit only for endpoints that need brute-force protection
+    SENSITIVE_AUTH_PATHS = (
+        "/api/v1/auth/login",
+        "/api/v1/auth/register",
+        "/api/v1/auth/google",
+    )
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         if not getattr(settings, "RATE_LIMIT_ENABLED", True):
             return self.get_response(request)
 
-        ip = self._get_client_ip(request)
+        scope, cache_key, max_requests, window = self._limits(request)
+        now = time.time()
+        try:
+            requests_log = [t for t in cache.get(cache_key, []) if t > now - window]
+            if len(requests_log) >= max_requests:
+                return self._reject(scope, requests_log, window, now)
+            requests_log.append(now)
+            cache.set(cache_key, requests_log, timeout=window)
+        except Exception as exc:
+            logger.error("Cache unavailable, request not rate limited: %s", exc)
 
-        # Strict limit only for endpoints that need brute-force protection
-        SENSITIVE_AUTH_PATHS = (
-            "/api/v1/auth/login",
-            "/api/v1/auth/register",
-            "/api/v1/auth/google",
-        )
-        is_auth = any(request.path.startswith(p) for p in SENSITIVE_AUTH_PATHS)
-        if is_auth:
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+            return await self.get_response(request)
+
+        scope, cache_key, max_requests, window = self._limits(request)
+        now = time.time()
+        try:
+            requests_log = [t for t in await cache.aget(cache_key, []) if t > now - window]
+            if len(requests_log) >= max_requests:
+                return self._reject(scope, requests_log, window, now)
+            requests_log.append(now)
+            await cache.aset(cache_key, requests_log, timeout=window)
+        except Exception as exc:
+            logger.error("Cache unavailable, request not rate limited: %s", exc)
+
+        return await self.get_response(request)
+
+    def _limits(self, request) -> tuple[str, str, int, int]:
+        """Scope, cache key, allowance and window that apply to this request."""
+        ip = self._get_client_ip(request)
+        if any(request.path.startswith(p) for p in self.SENSITIVE_AUTH_PATHS):
             max_requests = getattr(settings, "RATE_LIMIT_AUTH_REQUESTS", 10)
             window = getattr(settings, "RATE_LIMIT_AUTH_WINDOW", 60)
-            cache_key = f"rl:auth:{ip}"
+            scope = "auth"
         else:
             max_requests = getattr(settings, "RATE_LIMIT_REQUESTS", 100)
             window = getattr(settings, "RATE_LIMIT_WINDOW", 60)
-            cache_key = f"rl:api:{ip}"
-
-        now = time.time()
-        requests_log = cache.get(cache_key, [])
-        requests_log = [t for t in requests_log if t > now - window]
+            scope = "api"
+        return scope, f"rl:{scope}:{ip}", max_requests, window
 
-        if len(requests_log) >= max_requests:
-            retry_after = int(window - (now - requests_log[0]))
-            response = JsonResponse(
-                {"detail": "Demasiadas solicitudes. Intente nuevamente más tarde."},
-                status=429,
-            )
-            response["Retry-After"] = str(max(retry_after, 1))
-            return response
-
-        requests_log.append(now)
-        cache.set(cache_key, requests_log, timeout=window)
-
-        return self.get_response(request)
+    @staticmethod
+    def _reject(scope: str, requests_log: list[float], window: int, now: float):
+        RATE_LIMIT_REJECTIONS.labels(scope).inc()
+        retry_after = int(window - (now - requests_log[0]))
+        response = JsonResponse(
+            {"detail": "Demasiadas solicitudes. Intente nuevamente más tarde."},
+            status=429,
+        )
+        response["Retry-After"] = str(max(retry_after, 1))
+        return response
 
     @staticmethod
     def _get_client_ip(request):
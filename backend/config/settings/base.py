@@ -3,6 +3,7 @@ Django settings — base configuration.
 Shared across all environments. Environment-specific overrides in dev/prod.
 """
 
+import copy
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party
     "corsheaders",
     "ninja",
@@ -40,10 +42,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.instrumentation.RequestMetricsMiddleware",  # first: times the whole stack
+    "config.profiling.ProfilingMiddleware",  # admin-only, on request (X-Profile header)
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "config.middleware.CSPMiddleware",
     "config.ratelimit.RateLimitMiddleware",
+    "config.dbrouting.ReadYourWritesMiddleware",  # primary-only reads after a user's write
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -71,10 +76,26 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 # ──────────────────────────────────────────────
-# Database — PostgreSQL, no unsafe defaults
+# Database — PostgreSQL (psycopg 3), no unsafe defaults
 # ──────────────────────────────────────────────
+# DB_POOL_MODE:
+#   "django"    — psycopg_pool per process (default). Connections are opened once
+#                 and reused, so requests never pay connect + TLS. Each process
+#                 holds at most DB_POOL_MAX_SIZE: size it per process type (a sync
+#                 gunicorn worker needs 1–2, a Celery prefork child 1, an ASGI
+#                 worker one per request querying at once — the cap on its
+#                 concurrent DB work) so the total stays workers × max_size
+#                 however far workers scale.
+#   "pgbouncer" — no pool in Django; connect to pgbouncer in transaction-pooling
+#                 mode instead. Persistent client connections, client-side
+#                 parameter binding (Django's default) and no server-side cursors,
+#                 which transaction pooling cannot keep across transactions.
+#   "off"       — a connection per request (CONN_MAX_AGE=0).
+DB_POOL_MODE = os.environ.get("DB_POOL_MODE", "django")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -83,21 +104,116 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
         "HOST": os.environ.get("DB_HOST", "db"),
         "PORT": os.environ.get("DB_PORT", "5432"),
-        "CONN_MAX_AGE": 600,
-        "CONN_HEALTH_CHECKS": True,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,  # with the pool: checked on checkout
+        "OPTIONS": {},
     }
 }
+if DB_POOL_MODE == "django":
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "1")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "4")),
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),  # wait for a free connection
+        "max_idle": 300,
+        "max_lifetime": 1800,
+    }
+elif DB_POOL_MODE == "pgbouncer":
+    DATABASES["default"]["CONN_MAX_AGE"] = 600
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Read replica (streaming replica of "default"): only the read-only endpoints'
+# services read from it, with read-your-writes stickiness and a lag cut-off —
+# see config/dbrouting.py. Its pool is separate and sized like the primary's.
+# Requires the shared cache (REDIS_CACHE_URL) — the stickiness lives there, so
+# without it every read stays on the primary.
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["config.dbrouting.ReplicaRouter"]
+REPLICA_READS_ENABLED = os.environ.get("REPLICA_READS_ENABLED", "true").lower() == "true"
+REPLICA_MAX_LAG = float(os.environ.get("REPLICA_MAX_LAG", "5"))  # seconds
+REPLICA_LAG_CHECK_INTERVAL = 5
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "15"))
 
 # ──────────────────────────────────────────────
-# Cache — used for rate limiting
+# Cache — shared by every worker/instance (rate limiting, apps.projects.caching)
 # ──────────────────────────────────────────────
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "stward-ratelimit",
+# Same Redis as Celery, separate logical database. Without REDIS_CACHE_URL (Cloud
+# Run has no Redis) each process keeps its own memory cache: rate limits are per
+# process and apps.projects.caching stops caching, as its bumps would not be seen
+# by the other processes.
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL", "")
+SHARED_CACHE = bool(REDIS_CACHE_URL)
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+            "KEY_PREFIX": "stward",
+            "TIMEOUT": 300,
+        }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "stward",
+        }
+    }
+
+# ──────────────────────────────────────────────
+# Request metrics — Server-Timing, access log, query budgets
+# ──────────────────────────────────────────────
+REQUEST_METRICS_ENABLED = True
+# Fraction of requests whose peak heap growth is measured with tracemalloc
+REQUEST_MEMORY_SAMPLE_RATE = float(os.environ.get("REQUEST_MEMORY_SAMPLE_RATE", "0.01"))
+QUERY_BUDGET_DEFAULT = 50
+# Tighter budgets per route pattern (request.resolver_match.route)
+QUERY_BUDGETS = {
+    "api/v1/boards/<board_id>": 10,
+    "api/v1/boards/<board_id>/tasks": 12,
+    "api/v1/me/tasks": 10,
 }
 
+# ──────────────────────────────────────────────
+# Slow-query log with EXPLAIN plans (see config/slowqueries.py)
+# ──────────────────────────────────────────────
+SLOW_QUERY_ENABLED = True
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_EXPLAIN_PER_MINUTE = 6
+SLOW_QUERY_EXPLAIN_COOLDOWN = 600
+
+# ──────────────────────────────────────────────
+# On-demand request profiling (see config/profiling.py)
+# ──────────────────────────────────────────────
+PROFILING_ENABLED = True
+PROFILING_DIR = Path(os.environ.get("PROFILING_DIR", BASE_DIR / "media" / "profiles"))
+PROFILING_MAX_PER_HOUR = 10
+PROFILING_SAMPLE_INTERVAL = 0.005
+
+# ──────────────────────────────────────────────
+# Boot-time warmup of each gunicorn worker (see config/warmup.py)
+# ──────────────────────────────────────────────
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "true").lower() == "true"
+
+# ──────────────────────────────────────────────
+# Prometheus metrics — GET /metrics (see config/metrics.py)
+# ──────────────────────────────────────────────
+METRICS_ENABLED = True
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# Multiprocess directories merged on scrape: this process group's own plus, when
+# the volume is shared, the Celery workers'
+METRICS_DIRS = [
+    d for d in os.environ.get(
+        "METRICS_DIRS", os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+    ).split(",") if d
+]
+
 # ──────────────────────────────────────────────
 # Rate limiting
 # ──────────────────────────────────────────────
@@ -148,6 +264,18 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# ──────────────────────────────────────────────
+# Attachments — content-addressed local storage
+# ──────────────────────────────────────────────
+ATTACHMENTS_ROOT = Path(os.environ.get("ATTACHMENTS_ROOT", BASE_DIR / "media" / "attachments"))
+# Internal nginx location that serves ATTACHMENTS_ROOT; empty → Django streams the file
+ATTACHMENTS_X_ACCEL_PREFIX = os.environ.get("ATTACHMENTS_X_ACCEL_PREFIX", "")
+ATTACHMENT_LINK_MAX_AGE = 7 * 24 * 3600  # signed email links, seconds
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
+
+# Stream every upload to a temp file — workers never hold attachment bytes in memory
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
+
 # ──────────────────────────────────────────────
 # Default primary key type
 # ──────────────────────────────────────────────
@@ -161,14 +289,8 @@ CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "redis://redis:6
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
-# Periodic tasks (celery beat)
-from celery.schedules import crontab  # noqa: E402
-CELERY_BEAT_SCHEDULE = {
-    "check-overdue-tasks-daily": {
-        "task": "apps.projects.tasks.check_overdue_tasks",
-        "schedule": crontab(hour=0, minute=5),  # Every day at 00:05
-    },
-}
+# Periodic tasks (celery beat): app.conf.beat_schedule in config/celery.py,
+# so importing settings does not load celery.schedules
 
 # ──────────────────────────────────────────────
 # Email
@@ -238,5 +360,17 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": False,
         },
+        # One JSON line per request (config.instrumentation)
+        "access": {
+            "handlers": ["json_console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        # Slow statements with their EXPLAIN plan (config.slowqueries)
+        "slow_query": {
+            "handlers": ["json_console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
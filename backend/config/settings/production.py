@@ -43,7 +43,14 @@ SECURE_CONTENT_TYPE_NOSNIFF = True
 # ──────────────────────────────────────────────
 # Database — enforce SSL in production
 # ──────────────────────────────────────────────
-DATABASES["default"]["OPTIONS"] = {"sslmode": "require"}  # noqa: F405
+for _db in DATABASES.values():  # noqa: F405 — the replica too, when configured
+    _db["OPTIONS"]["sslmode"] = "require"
+
+# ──────────────────────────────────────────────
+# Prometheus metrics — no nginx in front on Cloud Run, so /metrics is public:
+# served only to scrapers holding METRICS_TOKEN, and 404 when none is set
+# ──────────────────────────────────────────────
+METRICS_ENABLED = bool(METRICS_TOKEN)  # noqa: F405
 
 # ──────────────────────────────────────────────
 # Structured logging — JSON in production
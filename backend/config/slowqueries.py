@@ -0,0 +1,190 @@
+"""
+Slow-query log with automatic EXPLAIN capture.
+
+An ``execute_wrapper`` on every database connection (web workers and Celery
+alike, installed from ``connection_created``) times each statement. One that
+takes longer than the threshold is logged — sampled — to the ``slow_query``
+logger with its fingerprint, the *shape* of its parameters (types, never
+values), the application function that issued it (e.g.
+``BoardService.get_detail``) and, for a limited number per minute, its
+``EXPLAIN (FORMAT JSON)`` plan.
+
+The plan is taken with a plain ``EXPLAIN`` — never ``ANALYZE`` — so the
+statement is not run again, on the raw DB-API cursor so it bypasses the query
+counters, and inside a savepoint when a transaction is open so a failing
+EXPLAIN cannot abort it. A fingerprint is explained at most once per cooldown.
+Literals PostgreSQL prints into the plan (filter and index conditions) —
+quoted ones, and the numbers client-side binding leaves bare, as in
+``(individual_progress < 100)`` — are masked like the fingerprint's, so neither
+the log line nor the plan carries parameter values. Boolean parameters are the
+exception: PostgreSQL folds ``flag = true`` into ``flag`` or ``NOT flag``.
+
+Settings:
+    SLOW_QUERY_ENABLED: bool (default True)
+    SLOW_QUERY_THRESHOLD_MS: int — statements slower than this are slow (default 200)
+    SLOW_QUERY_SAMPLE_RATE: float — fraction of slow statements logged (default 1.0)
+    SLOW_QUERY_EXPLAIN_PER_MINUTE: int — EXPLAINs per process per minute;
+        0 disables them (default 6)
+    SLOW_QUERY_EXPLAIN_COOLDOWN: int — seconds before the same fingerprint
+        is explained again (default 600)
+"""
+
+import json
+import logging
+import random
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+from config.instrumentation import _LITERALS, fingerprint
+
+logger = logging.getLogger("slow_query")
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+_lock = threading.Lock()
+_explain_times: list[float] = []  # monotonic timestamps of EXPLAINs in the last minute
+_explained: dict[str, float] = {}  # fingerprint → when it was last explained
+
+
+# ─────────────────────────────────────────────────
+# Statement description
+# ─────────────────────────────────────────────────
+def param_shape(params) -> str:
+    """Types of the parameters, with list lengths: ``(UUID, str, list[12])``."""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {_shape(v)}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(_shape(p) for p in params) + ")"
+
+
+def _shape(value) -> str:
+    if isinstance(value, list | tuple):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def caller() -> str:
+    """
+    The application function behind the statement: the innermost service
+    method on the stack, else the innermost function in ``apps.*`` (an API
+    view evaluating a lazy queryset, a task…).
+    """
+    frame = sys._getframe(1)
+    first_app = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("apps.") and ".tests" not in module:
+            name = frame.f_code.co_qualname
+            if module.endswith(".services"):
+                return name
+            first_app = first_app or f"{module}.{name}"
+        frame = frame.f_back
+    return first_app or "?"
+
+
+# ─────────────────────────────────────────────────
+# Sampling and rate limiting
+# ─────────────────────────────────────────────────
+def _should_explain(fp: str, now: float) -> bool:
+    per_minute = getattr(settings, "SLOW_QUERY_EXPLAIN_PER_MINUTE", 6)
+    cooldown = getattr(settings, "SLOW_QUERY_EXPLAIN_COOLDOWN", 600)
+    if per_minute <= 0:
+        return False
+    with _lock:
+        _explain_times[:] = [t for t in _explain_times if t > now - 60]
+        if len(_explain_times) >= per_minute or _explained.get(fp, -cooldown) > now - cooldown:
+            return False
+        _explain_times.append(now)
+        _explained[fp] = now
+        if len(_explained) > 1000:  # forget the oldest half rather than grow forever
+            for key in sorted(_explained, key=_explained.get)[:500]:
+                del _explained[key]
+        return True
+
+
+def reset() -> None:
+    """Forget the EXPLAIN history (tests)."""
+    with _lock:
+        _explain_times.clear()
+        _explained.clear()
+
+
+def explain(connection, sql: str, params):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, or None if it cannot be explained."""
+    if connection.vendor != "postgresql" or connection.connection is None:
+        return None
+    savepoint = connection.in_atomic_block
+    with connection.connection.cursor() as cursor:
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception as exc:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.debug("EXPLAIN failed: %s", exc)
+            return None
+    return _mask(json.loads(plan) if isinstance(plan, str) else plan)
+
+
+def _mask(node):
+    if isinstance(node, dict):
+        return {k: _mask(v) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_mask(v) for v in node]
+    if isinstance(node, str):
+        return _LITERALS.sub("?", node)
+    return node
+
+
+# ─────────────────────────────────────────────────
+# Wrapper
+# ─────────────────────────────────────────────────
+def slow_query_wrapper(execute, sql, params, many, context):
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+
+    threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 200) / 1000
+    if duration < threshold or not getattr(settings, "SLOW_QUERY_ENABLED", True):
+        return result
+    if random.random() >= getattr(settings, "SLOW_QUERY_SAMPLE_RATE", 1.0):  # noqa: S311
+        return result
+    _report(context["connection"], sql, params, many, duration)
+    return result
+
+
+def _report(connection, sql: str, params, many: bool, duration: float) -> None:
+    fp = fingerprint(sql)
+    plan = None
+    explainable = not many and sql.lstrip().upper().startswith(EXPLAINABLE)
+    if explainable and _should_explain(fp, time.monotonic()):
+        plan = explain(connection, sql, params)
+    caller_name = caller()
+    logger.warning(
+        "Slow query (%.0f ms) from %s: %s",
+        duration * 1000,
+        caller_name,
+        fp,
+        extra={
+            "duration_ms": round(duration * 1000, 1),
+            "caller": caller_name,
+            "fingerprint": fp,
+            "params_shape": "executemany" if many else param_shape(params),
+            "database": connection.alias,
+            "plan": plan,
+        },
+    )
+
+
+def install(sender=None, connection=None, **kwargs) -> None:
+    """``connection_created`` receiver: wrap every statement on the new connection."""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
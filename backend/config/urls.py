@@ -5,11 +5,14 @@ from ninja import NinjaAPI
 from apps.accounts.api import router as auth_router
 from apps.projects.api import router as projects_router
 from apps.projects.webhooks import webhook_router
+from config.instrumentation import TimedJSONRenderer
+from config.metrics import metrics_view
 
 api = NinjaAPI(
     title="Stward Task API",
     version="1.0.0",
     description="API de gestión de proyectos Kanban — Stward Task",
+    renderer=TimedJSONRenderer(),
 )
 
 api.add_router("/auth", auth_router)
@@ -31,4 +34,5 @@ def health_check(request):
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", api.urls),
+    path("metrics", metrics_view, name="metrics"),
 ]
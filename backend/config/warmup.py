@@ -0,0 +1,93 @@
+"""
+Boot-time warmup, so a new worker's first request costs what any other does.
+
+gunicorn.conf.py calls ``warm_up()`` from ``post_worker_init``, after the app
+is loaded and before the worker accepts its first connection — on Cloud Run,
+a new instance answers its first request warm. Each step does what would
+otherwise happen lazily inside the first request:
+
+- ``urls``: import the URLconf — every Ninja router, operation and schema is
+  built then — and populate the resolver's lookup tables.
+- ``translations``: load the ``LANGUAGE_CODE`` message catalogs.
+- ``database``: open a connection on every alias and hand it back, which with
+  the psycopg pool (``DB_POOL_MODE=django``) opens the pool itself.
+- ``cache``: connect to Redis.
+
+What the web workers rarely touch stays deferred until first use: Celery
+(``config.celery_app`` and ``apps.projects.tasks``), the email templates and
+google-auth. A failing step is logged and skipped — warmup never keeps a
+worker from starting.
+
+Settings:
+    WARMUP_ENABLED: bool (default True)
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _urls():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    resolver.url_patterns  # noqa: B018 — imports the URLconf
+    resolver.reverse_dict  # noqa: B018 — populates the lookups
+
+
+def _translations():
+    from django.utils import translation
+
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("")
+
+
+def _database():
+    from django.db import connections
+
+    for alias in connections:
+        connection = connections[alias]
+        connection.ensure_connection()
+        connection.close()  # back to the pool, or closed when there is none
+
+
+def _cache():
+    from django.core.cache import cache
+
+    cache.get("warmup")
+
+
+STEPS = {
+    "urls": _urls,
+    "translations": _translations,
+    "database": _database,
+    "cache": _cache,
+}
+
+
+def warm_up() -> dict[str, float | None]:
+    """Run every step; returns its duration in seconds, None where it failed."""
+    if not getattr(settings, "WARMUP_ENABLED", True):
+        return {}
+    timings: dict[str, float | None] = {}
+    for name, step in STEPS.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            logger.warning("Warmup step %s failed: %s", name, exc)
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - started
+    logger.info(
+        "Worker warmed up in %.0f ms (%s)",
+        sum(t for t in timings.values() if t) * 1000,
+        ", ".join(
+            f"{name} {'failed' if t is None else f'{t * 1000:.0f} ms'}"
+            for name, t in timings.items()
+        ),
+    )
+    return timings
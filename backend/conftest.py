@@ -1,6 +1,7 @@
 import json as json_lib
 
 import pytest
+from django.core.cache.backends.base import BaseCache
 from django.test import Client
 
 
@@ -51,3 +52,61 @@ class APIClient:
 def api_client():
     """API test client that prefixes /api and handles JSON."""
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    """
+    Swap the shared Redis cache for a per-test in-process one standing in for
+    it (``SHARED_CACHE`` on), so tests need no Redis and never see each other's
+    cached values or versions.
+    """
+    from django.core.cache import cache
+
+    from apps.projects import caching
+
+    settings.SHARED_CACHE = True
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tests",
+        }
+    }
+    cache.clear()
+    caching.reset_stats()
+    yield cache
+    cache.clear()
+
+
+class UnreachableCache(BaseCache):
+    """A cache backend whose server is down."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+    def _fail(self, *args, **kwargs):
+        raise ConnectionError("Error 111 connecting to redis:6379. Connection refused.")
+
+    add = get = set = delete = incr = touch = has_key = _fail
+
+    def clear(self):  # the local_cache fixture's teardown
+        pass
+
+
+@pytest.fixture
+def unreachable_cache(settings):
+    """Every cache call fails, as when Redis is down."""
+    settings.CACHES = {"default": {"BACKEND": "conftest.UnreachableCache"}}
+
+
+@pytest.fixture(autouse=True)
+def primary_reads(settings):
+    """
+    Read from the primary only: a configured replica is a test mirror of it on
+    its own connection, which cannot see the data a test creates inside its
+    transaction.
+    """
+    from config import dbrouting
+
+    settings.REPLICA_READS_ENABLED = False
+    dbrouting.reset()
@@ -0,0 +1,129 @@
+"""
+Gunicorn settings for production (docker-compose.prod.yml); environment
+variables override the defaults, command-line flags override both.
+
+``GUNICORN_WORKER_CLASS`` picks the stack: ``sync`` (default) serves
+``config.wsgi:application``, one request at a time per worker;
+``uvicorn_worker.UvicornWorker`` serves ``config.asgi:application``, where the
+async endpoints wait on the database without holding the worker and sync ones
+run in a thread each.
+
+Worker recycling — each worker must stay well inside its share of the
+container's 512 MB so the OOM killer never takes one out mid-request:
+
+- ``max_requests`` / ``max_requests_jitter``: restart after N requests, the
+  jitter keeping workers from restarting together.
+- After every request the worker checks its resident memory; over
+  ``GUNICORN_MAX_WORKER_RSS_MB`` (lowered by up to 10% per worker, again to
+  spread restarts) it finishes the response and exits gracefully, and the
+  master forks a fresh one. Uvicorn workers never call ``post_request``, so
+  there a background thread checks every ``GUNICORN_RSS_CHECK_INTERVAL``
+  seconds and, over the limit, sends the worker SIGTERM: it stops accepting,
+  drains its in-flight requests and exits.
+
+Each worker runs ``config.warmup.warm_up()`` once its app is loaded, before it
+accepts connections, so no client waits on a cold worker's first request.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set, each worker writes its metrics to files
+in that directory (see config/metrics.py). The master empties it at startup so
+counters do not carry over from a previous run, and drops a worker's live
+gauges when it exits.
+"""
+
+import glob
+import os
+import random
+import resource
+import signal
+import threading
+import time
+
+from prometheus_client import multiprocess
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+accesslog = "-"
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+# No preload_app: each worker opens its own DB pool after the fork
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+# 512 MB container / 4 workers, minus headroom for the master and a request's own peak
+max_worker_rss_mb = int(os.environ.get("GUNICORN_MAX_WORKER_RSS_MB", "110"))
+rss_check_interval = float(os.environ.get("GUNICORN_RSS_CHECK_INTERVAL", "5"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def worker_rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:  # not Linux: peak RSS is the best available figure
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def on_starting(server):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def post_fork(server, worker):
+    worker.max_rss = int(max_worker_rss_mb * 1024 * 1024 * random.uniform(0.9, 1.0))  # noqa: S311
+
+
+def over_rss_limit(worker, when: str) -> bool:
+    """Whether the worker has outgrown its limit; logs and counts the recycle if so."""
+    limit = getattr(worker, "max_rss", 0)
+    rss = worker_rss_bytes()
+    if not limit or rss <= limit:
+        return False
+    worker.log.warning(
+        "Worker %s at %.0f MB RSS (limit %.0f MB) %s; recycling",
+        worker.pid,
+        rss / 2**20,
+        limit / 2**20,
+        when,
+    )
+
+    from config.metrics import WORKER_RECYCLES
+
+    WORKER_RECYCLES.labels("memory").inc()
+    return True
+
+
+def post_request(worker, req, environ, resp):
+    if worker.alive and over_rss_limit(worker, f"after {req.path}"):
+        worker.alive = False
+
+
+def watch_rss(worker, interval: float) -> None:
+    """Uvicorn workers: poll the RSS and ask for a graceful shutdown once over the limit."""
+    while True:
+        time.sleep(interval)
+        if over_rss_limit(worker, "under ASGI"):
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+
+
+def post_worker_init(worker):
+    # The app is loaded; warm it before the worker accepts its first connection
+    from config.warmup import warm_up
+
+    warm_up()
+    if "uvicorn" not in worker.cfg.worker_class_str.lower():
+        return
+    threading.Thread(
+        target=watch_rss, args=(worker, rss_check_interval), name="rss-watchdog", daemon=True
+    ).start()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -80,7 +80,11 @@ export default function WorkspaceClient() {
         {workspaceView === "dashboard" ? (
           <WorkspaceDashboard boards={boards} allTasks={allTasks} isLoading={isLoading} />
         ) : (
-          <WorkspaceGantt boards={boards} isLoading={isLoading} />
+          <WorkspaceGantt
+            workspaceId={id}
+            boards={workspace?.boards ?? []}
+            isLoading={!workspace && isLoading}
+          />
         )}
       </ErrorBoundary>
     </div>
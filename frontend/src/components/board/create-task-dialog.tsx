@@ -2,6 +2,7 @@
 
 import { useState } from "react";
 import { useForm, Controller } from "react-hook-form";
+import { Search } from "lucide-react";
 import { zodResolver } from "@hookform/resolvers/zod";
 import {
   Dialog,
@@ -22,7 +23,7 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { useCreateTask } from "@/lib/hooks/use-tasks";
-import { useUsers } from "@/lib/hooks/use-users";
+import { useUserSearch, useUsers } from "@/lib/hooks/use-users";
 import { taskSchema, type TaskFormData } from "@/lib/schemas";
 import { Avatar, AvatarFallback } from "@/components/ui/avatar";
 import { Checkbox } from "@/components/ui/checkbox";
@@ -42,6 +43,13 @@ export function CreateTaskDialog({ columnId, boardId }: Props) {
   const createMutation = useCreateTask(boardId);
   const usersQuery = useUsers();
 
+  // Collaborator search
+  const [collaboratorSearch, setCollaboratorSearch] = useState("");
+  const collaboratorResults = useUserSearch(collaboratorSearch);
+  const collaboratorOptions = collaboratorSearch.trim()
+    ? collaboratorResults.data
+    : usersQuery.data;
+
   const form = useForm<TaskFormData>({
     resolver: zodResolver(taskSchema),
     defaultValues: {
@@ -72,6 +80,7 @@ export function CreateTaskDialog({ columnId, boardId }: Props) {
       {
         onSuccess: () => {
           form.reset();
+          setCollaboratorSearch("");
           setOpen(false);
         },
       }
@@ -140,6 +149,15 @@ export function CreateTaskDialog({ columnId, boardId }: Props) {
             </div>
             <div className="flex flex-col gap-2">
               <Label>Colaboradores</Label>
+              <div className="relative">
+                <Search className="absolute left-2 top-1/2 -translate-y-1/2 h-3.5 w-3.5 text-muted-foreground pointer-events-none" />
+                <Input
+                  placeholder="Buscar colaborador..."
+                  value={collaboratorSearch}
+                  onChange={(e) => setCollaboratorSearch(e.target.value)}
+                  className="h-8 pl-7 text-xs"
+                />
+              </div>
               <Controller
                 control={form.control}
                 name="assignee_ids"
@@ -147,7 +165,7 @@ export function CreateTaskDialog({ columnId, boardId }: Props) {
                   <div className="border rounded-md p-2 bg-muted/20">
                     <ScrollArea className="h-[100px]">
                       <div className="space-y-2 pr-4">
-                        {usersQuery.data?.map((member) => (
+                        {collaboratorOptions?.map((member) => (
                           <div key={member.id} className="flex items-center gap-2">
                             <Checkbox
                               id={`create-member-${member.id}`}
@@ -34,7 +34,7 @@ import {
 } from "@/components/ui/select";
 import { useUpdateTask, useDeleteTask } from "@/lib/hooks/use-tasks";
 import { useBoard, boardKeys } from "@/lib/hooks/use-board";
-import { useUsers } from "@/lib/hooks/use-users";
+import { useUserSearch, useUsers } from "@/lib/hooks/use-users";
 import { useCurrentUser } from "@/lib/hooks/use-auth";
 import * as api from "@/lib/api";
 import { taskSchema, type TaskFormData } from "@/lib/schemas";
@@ -96,6 +96,10 @@ export function EditTaskDialog({ task, boardId, open, onOpenChange }: Props) {
 
   // Collaborator search
   const [collaboratorSearch, setCollaboratorSearch] = useState("");
+  const collaboratorResults = useUserSearch(collaboratorSearch);
+  const collaboratorOptions = collaboratorSearch.trim()
+    ? collaboratorResults.data
+    : usersQuery.data;
 
   // Subtask creation state
   const [newSubtaskTitle, setNewSubtaskTitle] = useState("");
@@ -366,14 +370,7 @@ export function EditTaskDialog({ task, boardId, open, onOpenChange }: Props) {
                     <div className="border rounded-md p-2 bg-muted/20">
                       <ScrollArea className="h-[120px]">
                         <div className="space-y-2 pr-4">
-                          {usersQuery.data
-                            ?.filter((member) => {
-                              const q = collaboratorSearch.toLowerCase();
-                              if (!q) return true;
-                              const name = `${member.first_name} ${member.last_name}`.toLowerCase();
-                              return name.includes(q) || member.email.toLowerCase().includes(q);
-                            })
-                            .map((member) => (
+                          {collaboratorOptions?.map((member) => (
                             <div key={member.id} className="flex items-center gap-2">
                               <Checkbox
                                 id={`member-${member.id}`}
@@ -4,7 +4,8 @@ import React, { useMemo, useState, useRef, useEffect } from "react";
 import { ChevronDown, ChevronRight, Calendar, Users, ZoomIn, ZoomOut, Maximize } from "lucide-react";
 import type { Board, Task, Column } from "@/lib/types";
 import { STATUS_BG } from "@/lib/status-colors";
-import { isOverdue } from "@/lib/task-utils";
+import { isOverdue, toISODate } from "@/lib/task-utils";
+import { useBoardTimeline } from "@/lib/hooks/use-board";
 import { PriorityBadge } from "./priority-badge";
 import { Card } from "@/components/ui/card";
 import { ScrollArea, ScrollBar } from "@/components/ui/scroll-area";
@@ -38,15 +39,6 @@ export function GanttView({ board }: Props) {
         return () => resizeObserver.disconnect();
     }, []);
 
-    const groups = useMemo(() => {
-        return board.columns.map((col) => ({
-            id: col.id,
-            name: col.name,
-            color: STATUS_BG[col.status],
-            tasks: (col.tasks || []).filter((t) => !t.parent_id),
-        }));
-    }, [board.columns]);
-
     const toggleGroup = (id: string) => {
         setExpandedGroups((prev) => ({ ...prev, [id]: !prev[id] }));
     };
@@ -77,9 +69,26 @@ export function GanttView({ board }: Props) {
         }
 
         const totalDays = months.reduce((acc, m) => acc + m.days, 0);
-        return { months, totalDays, startDate: start.getTime() };
+        return { months, totalDays, startDate: start.getTime(), endDate: end.getTime() };
     }, []);
 
+    // Only the tasks overlapping the visible window are fetched
+    const timeline = useBoardTimeline(
+        board.id,
+        toISODate(timelineRange.startDate),
+        toISODate(timelineRange.endDate)
+    );
+
+    const groups = useMemo(() => {
+        const tasks = (timeline.data?.tasks ?? []).filter((t) => !t.parent_id);
+        return board.columns.map((col) => ({
+            id: col.id,
+            name: col.name,
+            color: STATUS_BG[col.status],
+            tasks: tasks.filter((t) => t.column_id === col.id),
+        }));
+    }, [board.columns, timeline.data]);
+
     const LIST_WIDTH = 350;
 
     const DAY_WIDTH = useMemo(() => {
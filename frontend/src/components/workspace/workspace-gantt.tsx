@@ -2,14 +2,16 @@
 
 import React, { useMemo, useState, useRef, useEffect } from "react";
 import { ChevronDown, ChevronRight, Calendar, Maximize, GanttChart } from "lucide-react";
-import type { Board } from "@/lib/types";
-import { isOverdue } from "@/lib/task-utils";
+import type { BoardSummary } from "@/lib/types";
+import { isOverdue, toISODate } from "@/lib/task-utils";
+import { useWorkspaceTimeline } from "@/lib/hooks/use-workspaces";
 import { PriorityBadge } from "@/components/board/priority-badge";
 import { ScrollArea, ScrollBar } from "@/components/ui/scroll-area";
 import { Button } from "@/components/ui/button";
 
 interface Props {
-  boards: Board[];
+  workspaceId: string;
+  boards: Pick<BoardSummary, "id" | "name">[];
   isLoading: boolean;
 }
 
@@ -17,7 +19,7 @@ type ZoomLevel = "days" | "weeks" | "months" | "fit";
 
 const BOARD_COLORS = ["#0073ea","#00c875","#e2445c","#fdab3d","#9d50dd","#579bfc","#037f4c","#bb3354"];
 
-export function WorkspaceGantt({ boards, isLoading }: Props) {
+export function WorkspaceGantt({ workspaceId, boards, isLoading }: Props) {
   const [zoom, setZoom] = useState<ZoomLevel>("fit");
   const containerRef = useRef<HTMLDivElement>(null);
   const [containerWidth, setContainerWidth] = useState(0);
@@ -31,15 +33,6 @@ export function WorkspaceGantt({ boards, isLoading }: Props) {
     return () => ro.disconnect();
   }, []);
 
-  const groups = useMemo(() =>
-    boards.map((b, i) => ({
-      id: b.id,
-      name: b.name,
-      color: BOARD_COLORS[i % BOARD_COLORS.length],
-      tasks: b.columns.flatMap((col) => (col.tasks ?? []).filter((t) => !t.parent_id)),
-    })),
-  [boards]);
-
   const [expandedGroups, setExpandedGroups] = useState<Record<string, boolean>>(() =>
     Object.fromEntries(boards.map((b) => [b.id, true]))
   );
@@ -72,9 +65,31 @@ export function WorkspaceGantt({ boards, isLoading }: Props) {
       curr = new Date(curr.getFullYear(), curr.getMonth() + 1, 1);
       safety++;
     }
-    return { months, totalDays: months.reduce((a, m) => a + m.days, 0), startDate: start.getTime() };
+    return {
+      months,
+      totalDays: months.reduce((a, m) => a + m.days, 0),
+      startDate: start.getTime(),
+      endDate: end.getTime(),
+    };
   }, []);
 
+  // Only the tasks overlapping the visible window are fetched
+  const timeline = useWorkspaceTimeline(
+    workspaceId,
+    toISODate(timelineRange.startDate),
+    toISODate(timelineRange.endDate)
+  );
+
+  const groups = useMemo(() => {
+    const tasks = (timeline.data?.tasks ?? []).filter((t) => !t.parent_id);
+    return boards.map((b, i) => ({
+      id: b.id,
+      name: b.name,
+      color: BOARD_COLORS[i % BOARD_COLORS.length],
+      tasks: tasks.filter((t) => t.board_id === b.id),
+    }));
+  }, [boards, timeline.data]);
+
   const LIST_WIDTH = 350;
 
   const DAY_WIDTH = useMemo(() => {
@@ -107,7 +122,7 @@ export function WorkspaceGantt({ boards, isLoading }: Props) {
     return ((today.getTime() - timelineRange.startDate) / 86400000) * DAY_WIDTH;
   }, [timelineRange.startDate, DAY_WIDTH]);
 
-  if (isLoading) {
+  if (isLoading || timeline.isLoading) {
     return (
       <div className="flex-1 p-6 space-y-3">
         {[1,2,3].map((i) => <div key={i} className="h-10 bg-muted rounded animate-pulse" />)}
@@ -5,10 +5,13 @@ import {
   Board,
   BoardSummary,
   Column,
+  DueBucket,
+  MyTasksPage,
   Notification,
   PaginatedResponse,
   Task,
   TaskComment,
+  Timeline,
   TokenPair,
   User,
   Workspace,
@@ -269,8 +272,20 @@ export function getWorkspaceMembers(workspaceId: string) {
   return fetcher<User[]>(`/workspaces/${workspaceId}/members`);
 }
 
+export function getWorkspaceTimeline(workspaceId: string, from: string, to: string) {
+  const qs = new URLSearchParams({ from, to });
+  return fetcher<Timeline>(`/workspaces/${workspaceId}/timeline?${qs}`);
+}
+
 export function getAllUsers() {
-  return fetcher<User[]>("/users");
+  // "no-cache" lets the browser revalidate with the ETag (304) instead of re-downloading
+  return fetcher<User[]>("/users", { cache: "no-cache" });
+}
+
+/** Picker search: prefix + fuzzy match on name and email, limited server-side. */
+export function searchUsers(q: string, limit = 20) {
+  const qs = new URLSearchParams({ q, limit: String(limit) });
+  return fetcher<User[]>(`/users?${qs}`);
 }
 
 // ─── Boards ──────────────────────────────────────
@@ -282,6 +297,21 @@ export function getBoard(id: string) {
   return fetcher<Board>(`/boards/${id}`);
 }
 
+/** Gantt window: only tasks overlapping [from, to] (YYYY-MM-DD), minimal fields. */
+export function getBoardTimeline(id: string, from: string, to: string) {
+  const qs = new URLSearchParams({ from, to });
+  return fetcher<Timeline>(`/boards/${id}/timeline?${qs}`);
+}
+
+/** The caller's tasks across all workspaces, soonest due first (keyset-paged). */
+export function getMyTasks(params: { due?: DueBucket; cursor?: string; limit?: number } = {}) {
+  const qs = new URLSearchParams();
+  if (params.due) qs.set("due", params.due);
+  if (params.cursor) qs.set("cursor", params.cursor);
+  if (params.limit) qs.set("limit", String(params.limit));
+  return fetcher<MyTasksPage>(`/me/tasks?${qs}`);
+}
+
 export function createBoard(data: {
   name: string;
   description?: string;
@@ -10,6 +10,8 @@ import type { BoardSummary, PaginatedResponse, Workspace } from "@/lib/types";
 export const boardKeys = {
   all: ["boards"] as const,
   detail: (id: string) => ["boards", id] as const,
+  timeline: (id: string, from: string, to: string) =>
+    ["boards", id, "timeline", from, to] as const,
 };
 
 export function useBoard(id: string) {
@@ -21,6 +23,15 @@ export function useBoard(id: string) {
   });
 }
 
+export function useBoardTimeline(id: string, from: string, to: string) {
+  return useQuery({
+    queryKey: boardKeys.timeline(id, from, to),
+    queryFn: () => api.getBoardTimeline(id, from, to),
+    enabled: !!id && (typeof window === "undefined" || isAuthenticated()),
+    refetchInterval: 30_000,
+  });
+}
+
 export function useCreateBoard() {
   const queryClient = useQueryClient();
 
@@ -1,8 +1,11 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import { keepPreviousData, useQuery } from "@tanstack/react-query";
 import * as api from "@/lib/api";
 
+const SEARCH_DEBOUNCE_MS = 250;
+
 export function useUsers() {
   return useQuery({
     queryKey: ["users"],
@@ -10,3 +13,24 @@ export function useUsers() {
     staleTime: 5 * 60 * 1000, // 5 min — users don't change often
   });
 }
+
+function useDebouncedValue<T>(value: T, delay: number): T {
+  const [debounced, setDebounced] = useState(value);
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay);
+    return () => clearTimeout(timer);
+  }, [value, delay]);
+  return debounced;
+}
+
+/** Picker search against the server, once typing pauses (one request per term, not per key). */
+export function useUserSearch(q: string) {
+  const term = useDebouncedValue(q.trim(), SEARCH_DEBOUNCE_MS);
+  return useQuery({
+    queryKey: ["users", "search", term],
+    queryFn: () => api.searchUsers(term),
+    enabled: term.length > 0,
+    staleTime: 60 * 1000,
+    placeholderData: keepPreviousData,
+  });
+}
@@ -10,8 +10,19 @@ export const workspaceKeys = {
   all: ["workspaces"] as const,
   detail: (id: string) => ["workspaces", id] as const,
   members: (id: string) => ["workspaces", id, "members"] as const,
+  timeline: (id: string, from: string, to: string) =>
+    ["workspaces", id, "timeline", from, to] as const,
 };
 
+export function useWorkspaceTimeline(workspaceId: string, from: string, to: string) {
+  return useQuery({
+    queryKey: workspaceKeys.timeline(workspaceId, from, to),
+    queryFn: () => api.getWorkspaceTimeline(workspaceId, from, to),
+    enabled: !!workspaceId && typeof window !== "undefined" && isAuthenticated(),
+    refetchInterval: 30_000,
+  });
+}
+
 export function useWorkspaceMembers(workspaceId: string | undefined) {
   return useQuery({
     queryKey: workspaceKeys.members(workspaceId || ""),
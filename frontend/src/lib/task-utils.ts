@@ -1,7 +1,15 @@
 import type { Task } from "./types";
 
+/** Fecha local en formato YYYY-MM-DD (el que usa la API) */
+export function toISODate(date: Date | number): string {
+  const d = new Date(date);
+  const mm = String(d.getMonth() + 1).padStart(2, "0");
+  const dd = String(d.getDate()).padStart(2, "0");
+  return `${d.getFullYear()}-${mm}-${dd}`;
+}
+
 /** Tarea actualmente vencida: deadline pasó y no está completada */
-export function isOverdue(task: Task): boolean {
+export function isOverdue(task: Pick<Task, "end_date" | "progress">): boolean {
   if (!task.end_date || task.progress >= 100) return false;
   const today = new Date();
   today.setHours(0, 0, 0, 0);
@@ -97,6 +97,47 @@ export interface Board {
   updated_at: string;
 }
 
+// ─── Timeline (Gantt window) ───
+
+export interface TimelineTask {
+  id: string;
+  title: string;
+  board_id: string;
+  column_id: string;
+  parent_id: string | null;
+  priority: Priority;
+  progress: number;
+  start_date: string;
+  end_date: string | null;
+}
+
+export interface TimelineDependency {
+  task_id: string;
+  depends_on_id: string;
+}
+
+export interface Timeline {
+  start: string;
+  end: string;
+  tasks: TimelineTask[];
+  dependencies: TimelineDependency[];
+}
+
+// ─── My work (GET /me/tasks) ───
+
+export type DueBucket = "overdue" | "today" | "week";
+
+export interface MyTask extends Task {
+  board_id: string;
+  board_name: string;
+}
+
+export interface MyTasksPage {
+  items: MyTask[];
+  next_cursor: string | null;
+  counts: Record<DueBucket, number> | null;
+}
+
 export interface BoardSummary {
   id: string;
   name: string;
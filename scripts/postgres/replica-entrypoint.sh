@@ -0,0 +1,21 @@
+#!/bin/sh
+# Entrypoint of the local `db-replica` service (docker-compose.yml): on first
+# start, clone the `db` service with pg_basebackup (-R writes standby.signal and
+# primary_conninfo), then run the stock entrypoint, which finds an existing
+# data directory and starts PostgreSQL as a hot standby streaming from `db`.
+
+set -eu
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    mkdir -p "$PGDATA"
+    chown postgres "$PGDATA"
+    chmod 700 "$PGDATA"
+    export PGPASSWORD="$POSTGRES_PASSWORD"
+    until su-exec postgres pg_basebackup -h db -U "$POSTGRES_USER" -D "$PGDATA" -R -X stream -c fast; do
+        echo "Waiting for the primary..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+fi
+
+exec docker-entrypoint.sh postgres